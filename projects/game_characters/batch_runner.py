@@ -0,0 +1,168 @@
+"""
+Parallel Battle Batch Runner
+============================
+
+Balances the game by running a whole matchup grid:
+
+    hero class x enemy template x equipment loadout
+
+Each matchup is split into chunks of fights. Chunks are spread over a
+process pool and results stream back as they finish. Every chunk gets
+its own RNG stream derived from (seed, matchup, chunk), so a run is
+reproducible no matter how many processes are used or in what order
+chunks complete.
+
+Requires numpy (via simulation.py): pip install numpy
+
+Run: python projects/game_characters/batch_runner.py
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from main import Archer, Armor, Character, Enemy, Mage, Warrior, Weapon
+from simulation import CombatSimulator
+
+EnemyTemplate = Tuple[str, int, int, int, int]  # name, health, attack, defense, xp_reward
+Loadout = Tuple[str, Optional[Tuple[str, int, int]], Optional[Tuple[str, int, int]]]  # name, weapon, armor
+
+
+class Matchup:
+    """One cell of the grid: a hero class with a loadout against an enemy template."""
+
+    def __init__(self, hero_class: Type[Character], enemy: EnemyTemplate, loadout: Loadout):
+        self.hero_class = hero_class
+        self.enemy = enemy
+        self.loadout = loadout
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.hero_class.__name__, self.enemy[0], self.loadout[0]
+
+    def build(self) -> Tuple[Character, Enemy]:
+        """Fresh hero (equipped) and enemy for this matchup."""
+        hero = self.hero_class("Hero")
+        _, weapon, armor = self.loadout
+        if weapon:
+            hero.equipped_weapon = Weapon(*weapon)
+        if armor:
+            hero.equipped_armor = Armor(*armor)
+        return hero, Enemy(*self.enemy)
+
+
+class MatchupStats:
+    """Aggregated results for one matchup."""
+
+    def __init__(self, matchup: Matchup):
+        self.matchup = matchup
+        self.fights = 0
+        self.wins = 0
+        self.total_turns = 0
+        self.total_xp = 0
+
+    def add(self, fights: int, wins: int, turns: int, xp: int):
+        self.fights += fights
+        self.wins += wins
+        self.total_turns += turns
+        self.total_xp += xp
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def average_turns(self) -> float:
+        return self.total_turns / self.fights if self.fights else 0.0
+
+    @property
+    def average_xp(self) -> float:
+        return self.total_xp / self.fights if self.fights else 0.0
+
+
+def build_grid(hero_classes: Sequence[Type[Character]], enemies: Sequence[EnemyTemplate],
+               loadouts: Sequence[Loadout]) -> List[Matchup]:
+    """Every combination of hero class, enemy template and loadout."""
+    return [Matchup(*combo) for combo in product(hero_classes, enemies, loadouts)]
+
+
+def _run_chunk(matchup_index: int, chunk_index: int, matchup: Matchup, fights: int, seed: int):
+    """Worker: simulate one chunk and return only the totals."""
+    stream = np.random.SeedSequence(seed, spawn_key=(matchup_index, chunk_index))
+    simulator = CombatSimulator(seed=stream)
+    hero, enemy = matchup.build()
+    result = simulator.run_matchup(hero, enemy, fights)
+    return (matchup_index, fights, int(result.hero_won.sum()), int(result.turns.sum()),
+            int(result.xp_gained.sum()))
+
+
+class BatchRunner:
+    """Runs a matchup grid across worker processes."""
+
+    def __init__(self, processes: int = 1, chunk_size: int = 50_000, seed: int = 0):
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def _chunks(self, grid: List[Matchup], fights_per_matchup: int):
+        for matchup_index, matchup in enumerate(grid):
+            for chunk_index, start in enumerate(range(0, fights_per_matchup, self.chunk_size)):
+                fights = min(self.chunk_size, fights_per_matchup - start)
+                yield matchup_index, chunk_index, matchup, fights, self.seed
+
+    def stream(self, grid: List[Matchup], fights_per_matchup: int) -> Iterator[tuple]:
+        """Yield (matchup_index, fights, wins, turns, xp) per chunk as chunks finish."""
+        chunks = self._chunks(grid, fights_per_matchup)
+        if self.processes <= 1:
+            for chunk in chunks:
+                yield _run_chunk(*chunk)
+            return
+
+        with ProcessPoolExecutor(self.processes) as pool:
+            futures = [pool.submit(_run_chunk, *chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, grid: List[Matchup], fights_per_matchup: int) -> Dict[Tuple[str, str, str], MatchupStats]:
+        """Run the whole grid and aggregate per matchup."""
+        stats = [MatchupStats(matchup) for matchup in grid]
+        for matchup_index, fights, wins, turns, xp in self.stream(grid, fights_per_matchup):
+            stats[matchup_index].add(fights, wins, turns, xp)
+        return {s.matchup.key: s for s in stats}
+
+
+DEFAULT_ENEMIES: List[EnemyTemplate] = [
+    ("Goblin Scout", 50, 15, 5, 50),
+    ("Orc Warrior", 100, 25, 10, 100),
+    ("Troll", 220, 35, 15, 250),
+]
+DEFAULT_LOADOUTS: List[Loadout] = [
+    ("Unarmed", None, None),
+    ("Iron", ("Iron Sword", 15, 50), ("Leather Armor", 10, 40)),
+    ("Steel", ("Steel Sword", 25, 120), ("Plate Mail", 20, 100)),
+]
+
+
+def print_table(results: Dict[Tuple[str, str, str], MatchupStats]):
+    """Win-rate table, one row per matchup."""
+    print(f"  {'Hero':<8} {'Enemy':<13} {'Loadout':<8} {'Win %':>7} {'Turns':>6} {'XP':>7}")
+    for (hero, enemy, loadout), stats in results.items():
+        print(f"  {hero:<8} {enemy:<13} {loadout:<8} {stats.win_rate:7.1%} "
+              f"{stats.average_turns:6.1f} {stats.average_xp:7.1f}")
+
+
+def demo_batch_runner():
+    """Balance table for the default grid."""
+    print("="*70)
+    print("PARALLEL BATTLE BATCH RUNNER DEMO")
+    print("="*70)
+
+    grid = build_grid((Warrior, Mage, Archer), DEFAULT_ENEMIES, DEFAULT_LOADOUTS)
+    results = BatchRunner(processes=2, chunk_size=10_000, seed=2024).run(grid, fights_per_matchup=20_000)
+    print_table(results)
+
+
+if __name__ == "__main__":
+    demo_batch_runner()
@@ -0,0 +1,469 @@
+"""
+RPG Game Characters System - Benchmarks
+========================================
+
+Rough timings for the performance-sensitive parts of the game project.
+Numbers depend on the machine; compare runs on the same box.
+
+Run: python projects/game_characters/benchmarks.py
+"""
+
+import asyncio
+import itertools
+import io
+import json
+import os
+import pickle
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from batch_runner import DEFAULT_ENEMIES, DEFAULT_LOADOUTS, BatchRunner, build_grid
+from encounter import Encounter
+from entities import EntityStore
+from loot import roll_many
+from main import (Archer, Armor, Battle, Enemy, EventLog, GoldDrop, Inventory, ItemType,
+                  LootTable, Mage, NullSink, Potion, PrintSink, Warrior, Weapon, item_registry)
+from rewards import grant_rewards
+from savegame import SaveReader, SaveWriter
+from session_server import load_test
+from simulation import CombatSimulator
+from world_map import WorldMap
+
+HERO_CLASSES = (Warrior, Mage, Archer)
+
+
+def _timed(label: str, func, *args):
+    """Run func quietly and print how long it took."""
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<45} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def _goblin() -> Enemy:
+    return Enemy("Goblin Scout", 50, 15, 5, 50)
+
+
+def benchmark_simulation(battles: int = 20_000, simulated: int = 1_000_000):
+    """Battle.fight() one at a time vs. the vectorized simulator."""
+    print(f"\nCombat simulation (Battle.fight x {battles:,} vs simulator x {simulated:,})")
+
+    rng = random.Random(1)
+
+    def fight_all():
+        for i in range(battles):
+            Battle(rng.choice(HERO_CLASSES)("Hero"), _goblin()).fight()
+
+    _, elapsed = _timed("Battle.fight (stdout discarded)", fight_all)
+    print(f"  {'fights/s':<45} {battles / elapsed:8.0f}")
+
+    templates = [cls("Hero") for cls in HERO_CLASSES]
+    heroes = [templates[i % 3] for i in range(simulated)]
+    enemies = [_goblin()] * simulated
+    simulator = CombatSimulator(seed=1)
+    result, elapsed = _timed("CombatSimulator.run", simulator.run, heroes, enemies)
+    print(f"  {'fights/s':<45} {simulated / elapsed:8.0f}")
+    print(f"  {'hero win rate':<45} {result.win_rate:8.1%}")
+
+
+def benchmark_event_sinks(battles: int = 20_000):
+    """Battle.fight() printing its events vs. recording them vs. silent mode."""
+    print(f"\nCombat event sinks (Battle.fight x {battles:,})")
+
+    for label, make_sink in (("PrintSink (stdout discarded)", PrintSink),
+                             ("EventLog (recorded)", EventLog),
+                             ("NullSink (silent)", NullSink)):
+        rng = random.Random(1)
+
+        def fight_all():
+            for i in range(battles):  # same seeds, so every sink sees the same fights
+                Battle(rng.choice(HERO_CLASSES)("Hero"), _goblin(), events=make_sink(), seed=i).fight()
+
+        _, elapsed = _timed(label, fight_all)
+        print(f"  {'fights/s':<45} {battles / elapsed:8.0f}")
+
+
+def _allocated(build):
+    """Return build() and the bytes it left allocated."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def benchmark_entities(entities: int = 100_000, ticks: int = 100):
+    """Character objects vs. the entity store: memory and world-tick time."""
+    print(f"\nEntity storage ({entities:,} characters, {ticks} ticks)")
+
+    def make_characters():
+        return [HERO_CLASSES[i % 3](f"Hero {i}") for i in range(entities)]
+
+    characters, size = _allocated(make_characters)
+    print(f"  {'Character objects (MB)':<45} {size / 2**20:8.1f}")
+
+    def build_store():
+        store = EntityStore(capacity=entities)
+        for i in range(entities):
+            store.spawn(f"Hero {i}", 100, 30, 8, regen=1)
+        return store
+
+    store, size = _allocated(build_store)
+    print(f"  {'EntityStore incl. names (MB)':<45} {size / 2**20:8.1f}")
+    print(f"  {'EntityStore stat columns only (MB)':<45} {store.memory_bytes / 2**20:8.1f}")
+
+    def tick_objects():
+        for _ in range(ticks):
+            for character in characters:
+                if character.health > 0:
+                    character.health = min(character.health + 1, character.max_health)
+
+    def tick_store():
+        for _ in range(ticks):
+            store.tick()
+
+    _, loop = _timed("Python loop over Character objects", tick_objects)
+    _, vectorized = _timed("EntityStore.tick", tick_store)
+    print(f"  {'ms per tick (loop / store)':<45} {loop / ticks * 1000:8.2f} / {vectorized / ticks * 1000:.2f}")
+
+
+class _ListInventory:
+    """The old list-backed Inventory, kept here as a baseline."""
+
+    def __init__(self, max_slots: int):
+        self.max_slots = max_slots
+        self.items = []
+
+    def add_item(self, item) -> bool:
+        if len(self.items) >= self.max_slots:
+            return False
+        self.items.append(item)
+        return True
+
+    def remove_item(self, item) -> bool:
+        if item in self.items:
+            self.items.remove(item)
+            return True
+        return False
+
+    def has_item(self, item_name: str) -> bool:
+        return any(item.name == item_name for item in self.items)
+
+    def get_item(self, item_name: str):
+        for item in self.items:
+            if item.name == item_name:
+                return item
+        return None
+
+
+def benchmark_inventory(items: int = 5_000, lookups: int = 5_000):
+    """Stash-sized inventories: list scans vs. the indexed Inventory."""
+    print(f"\nInventory ({items:,} items, {lookups:,} lookups and removals)")
+
+    rng = random.Random(1)
+    kinds = [lambda i: Weapon(f"Sword {i % 1000}", 10, 50), lambda i: Armor(f"Mail {i % 1000}", 5, 40),
+             lambda i: Potion(f"Potion {i % 50}", 50, 25)]
+    stash = [rng.choice(kinds)(i) for i in range(items)]
+    names = [rng.choice(stash).name for _ in range(lookups)]
+    doomed = rng.sample(stash, lookups)
+
+    for label, make in (("list scans", _ListInventory), ("indexed Inventory", Inventory)):
+        def run():
+            inventory = make(max_slots=items)
+            for item in stash:
+                inventory.add_item(item)
+            for name in names:
+                inventory.has_item(name)
+                inventory.get_item(name)
+            for item in doomed:
+                inventory.remove_item(item)
+
+        _timed(label, run)
+
+
+class _DictWeapon:
+    """The old Weapon layout (every field in the instance __dict__), kept as a baseline."""
+
+    def __init__(self, name: str, damage: int, value: int):
+        self.name = name
+        self.item_type = ItemType.WEAPON
+        self.value = value
+        self.damage = damage
+        self.durability = 100
+        self.enchantment = 0
+
+
+def benchmark_item_templates(items: int = 1_000_000):
+    """Per-instance item fields vs. shared flyweight templates."""
+    print(f"\nItem templates ({items:,} item instances)")
+
+    template = Weapon("Iron Sword", 15, 50).template
+    for label, make in (("per-instance fields", lambda: _DictWeapon("Iron Sword", 15, 50)),
+                        ("Weapon(...) with shared template", lambda: Weapon("Iron Sword", 15, 50)),
+                        ("Weapon.from_template", lambda: Weapon.from_template(template))):
+        _, size = _allocated(lambda: [make() for _ in range(items)])
+        print(f"  {label + ' (MB)':<45} {size / 2**20:8.1f}")
+
+
+class _UncachedWarrior(Warrior):
+    """Warrior that recomputes attack_power/defense on every access, as before the cache."""
+
+    @property
+    def attack_power(self) -> int:
+        weapon_damage = self.equipped_weapon.damage if self.equipped_weapon else 0
+        return self.base_attack + weapon_damage + sum(buff.attack for buff in self.buffs)
+
+    @property
+    def defense(self) -> int:
+        armor_def = self.equipped_armor.defense if self.equipped_armor else 0
+        return self.base_defense + armor_def + sum(buff.defense for buff in self.buffs)
+
+
+def benchmark_stat_cache(turns: int = 200_000):
+    """Combat turns reading recomputed vs. cached attack_power/defense."""
+    print(f"\nDerived stat cache ({turns:,} combat turns)")
+
+    for label, hero_class in (("recomputed on every access", _UncachedWarrior),
+                              ("cached, invalidated on change", Warrior)):
+        hero, enemy = hero_class("Hero"), Enemy("Training Dummy", 10**9, 30, 10, 0)
+        hero.events = enemy.events = NullSink()
+        hero.equip_weapon(Weapon("Iron Sword", 15, 50))
+        hero.equip_armor(Armor("Leather Armor", 10, 40))
+
+        def fight_turns():
+            for turn in range(turns):
+                hero.tick_buffs()
+                if turn % 4 == 0:
+                    hero.special_ability(enemy)  # Shield Block: a buff that expires next turn
+                else:
+                    hero.attack(enemy)
+                enemy.attack(hero)
+                hero.health = hero.max_health
+
+        _timed(label, fight_turns)
+
+
+def benchmark_encounters(encounters: int = 2_000):
+    """Headless party-vs-group encounters at two sizes."""
+    for size, count in ((5, encounters), (50, encounters // 10)):
+        print(f"\nEncounters ({size}v{size} x {count:,})")
+
+        def run_all():
+            actions = 0
+            for i in range(count):
+                party = [HERO_CLASSES[j % 3](f"Hero {j}") for j in range(size)]
+                enemies = [Enemy(f"Orc {j}", 100, 25, 10, 100, speed=9 + j % 4) for j in range(size)]
+                actions += Encounter(party, enemies, events=NullSink(), seed=i).run().actions
+            return actions
+
+        actions, elapsed = _timed("Encounter.run (NullSink)", run_all)
+        print(f"  {'encounters/s':<45} {count / elapsed:8.0f}")
+        print(f"  {'actions/s':<45} {actions / elapsed:8.0f}")
+
+
+def benchmark_world_map(entities: int = 100_000, heroes: int = 1_000, ticks: int = 3,
+                        size: float = 5_000.0, aggro: float = 25.0):
+    """Moving every entity and answering aggro queries, grid vs. all pairs."""
+    print(f"\nWorld map ({entities:,} moving enemies, {heroes:,} aggro queries per tick)")
+
+    rng = random.Random(1)
+    enemies = [_goblin() for _ in range(entities)]
+    spots = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(entities)]
+    world = WorldMap(cell_size=aggro)
+    for enemy, (x, y) in zip(enemies, spots):
+        world.insert(enemy, x, y)
+    party = [Warrior(f"Hero {i}") for i in range(heroes)]
+    for hero in party:
+        world.insert(hero, rng.uniform(0, size), rng.uniform(0, size))
+
+    def tick():
+        for i, enemy in enumerate(enemies):
+            x, y = spots[i]
+            spots[i] = x, y = (x + rng.uniform(-2, 2)) % size, (y + rng.uniform(-2, 2)) % size
+            world.move(enemy, x, y)
+        return sum(len(world.enemies_in_aggro_range(hero, aggro)) for hero in party)
+
+    _, elapsed = _timed(f"grid: move all + query ({ticks} ticks)", lambda: [tick() for _ in range(ticks)])
+    print(f"  {'ms per tick':<45} {elapsed / ticks * 1000:8.1f}")
+
+    sample = party[:10]
+    r2 = aggro * aggro
+
+    def all_pairs():
+        for hero in sample:
+            hx, hy = world.position(hero)
+            [e for e, (x, y) in zip(enemies, spots) if (x - hx) ** 2 + (y - hy) ** 2 <= r2]
+
+    _, elapsed = _timed(f"all pairs: {len(sample)} queries", all_pairs)
+    print(f"  {'all-pairs ms per tick (extrapolated)':<45} {elapsed / len(sample) * heroes * 1000:8.1f}")
+
+
+def benchmark_session_server(sessions: int = 10_000, connections: int = 100):
+    """Simultaneous battles through the asyncio server and a local stand-in client."""
+    print(f"\nSession server ({sessions:,} simultaneous sessions over {connections} connections)")
+
+    stats, elapsed = _timed("load test", lambda: asyncio.run(load_test(sessions, connections)))
+    print(f"  {'turns/s (client and server on one loop)':<45} {stats['turns'] / elapsed:8.0f}")
+    print(f"  {'turn latency p50 / p99 / max (ms)':<45} {stats['p50_ms']:8.0f} / "
+          f"{stats['p99_ms']:.0f} / {stats['max_ms']:.0f}")
+    print(f"  {'turn timeouts':<45} {stats['timeouts']:8}")
+
+
+def _item_json(item):
+    return None if item is None else [item.item_type.value, item.name, item.value, item.template.power,
+                                      item.durability, item.enchantment]
+
+
+def _character_json(character) -> dict:
+    return {"class": type(character).__name__, "name": character.name, "health": character.health,
+            "max_health": character.max_health, "attack": character.base_attack,
+            "defense": character.base_defense, "level": character.level, "xp": character.experience,
+            "gold": character.inventory.gold, "weapon": _item_json(character.equipped_weapon),
+            "armor": _item_json(character.equipped_armor),
+            "items": [_item_json(item) for item in character.inventory.items]}
+
+
+def _character_from_json(data: dict):
+    character = {"Warrior": Warrior, "Mage": Mage, "Archer": Archer}[data["class"]](data["name"])
+    character.health, character.max_health = data["health"], data["max_health"]
+    character.base_attack, character.base_defense = data["attack"], data["defense"]
+    character.level, character.experience = data["level"], data["xp"]
+    character.inventory.gold = data["gold"]
+    kinds = {"Weapon": Weapon, "Armor": Armor, "Potion": Potion}
+    make = lambda row: kinds[row[0]](row[1], row[3], row[2], row[4], row[5])
+    if data["weapon"]:
+        character.equipped_weapon = make(data["weapon"])
+    if data["armor"]:
+        character.equipped_armor = make(data["armor"])
+    for row in data["items"]:
+        character.inventory.add_item(make(row))
+    return character
+
+
+def benchmark_savegame(characters: int = 100_000, changed: float = 0.01):
+    """Binary saves vs. pickle and JSON, plus a delta save."""
+    print(f"\nSave games ({characters:,} characters with gear and potions)")
+
+    party = {}
+    with redirect_stdout(io.StringIO()):
+        for i in range(characters):
+            hero = HERO_CLASSES[i % 3](f"Player {i}")
+            hero.equip_weapon(Weapon(("Iron Sword", "Steel Sword")[i % 2], 15 + 10 * (i % 2), 50))
+            hero.equip_armor(Armor("Leather Armor", 10, 40))
+            for _ in range(3):
+                hero.inventory.add_item(Potion("Health Potion", 50, 25))
+            party[f"player-{i}"] = hero
+
+    writer = SaveWriter()
+    formats = (
+        ("binary", lambda: writer.save(party), lambda data: SaveReader().load(data)),
+        ("pickle", lambda: pickle.dumps(party, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ("JSON", lambda: json.dumps({key: _character_json(c) for key, c in party.items()}),
+         lambda data: {key: _character_from_json(c) for key, c in json.loads(data).items()}),
+    )
+    for label, dump, load in formats:
+        data, _ = _timed(f"{label} save", dump)
+        _timed(f"{label} load", load, data)
+        print(f"  {label + ' size (MB)':<45} {len(data) / 2**20:8.1f}")
+
+    with redirect_stdout(io.StringIO()):
+        for i in range(0, characters, int(1 / changed)):
+            party[f"player-{i}"].gain_experience(150)
+    delta, _ = _timed(f"binary delta save ({changed:.0%} changed)", writer.save, party, True)
+    print(f"  {'delta size (KB)':<45} {len(delta) / 1024:8.1f}")
+
+
+def _level_up_one_at_a_time(character, xp: int):
+    """gain_experience as it was before XP_TABLE: one level_up() per threshold crossed."""
+    character.experience += xp
+    while character.experience >= character.level * 100:
+        character.level_up()
+
+
+def benchmark_rewards(characters: int = 100_000, xp: int = 2_500):
+    """Raid-wide XP and gold grants: per character vs. one vectorized pass."""
+    print(f"\nRewards ({characters:,} characters, {xp:,} XP + gold each)")
+    chest = LootTable([(None, 50), (item_registry.template(ItemType.POTION, "Health Potion", 25, 50), 50)],
+                      guaranteed=[GoldDrop(10, 30)])
+
+    def party():
+        return [HERO_CLASSES[i % 3](f"Player {i}") for i in range(characters)]
+
+    def one_at_a_time(heroes):
+        for hero in heroes:
+            _level_up_one_at_a_time(hero, xp)
+            hero.inventory.gold += 100
+
+    def per_character(heroes):
+        for hero in heroes:
+            hero.gain_experience(xp)
+            hero.inventory.gold += 100
+
+    for label, grant in (("one level_up() per level", one_at_a_time),
+                         ("gain_experience() per character", per_character),
+                         ("grant_rewards()", lambda heroes: grant_rewards(heroes, xp, gold=100)),
+                         ("grant_rewards() + a loot roll each",
+                          lambda heroes: grant_rewards(heroes, xp, gold=100, loot=chest, rng=random.Random(0)))):
+        with redirect_stdout(io.StringIO()):
+            heroes = party()
+        _timed(label, grant, heroes)
+
+    store = EntityStore(characters)
+    with redirect_stdout(io.StringIO()):
+        ids = store.add_many(party())
+    _timed("EntityStore.grant_experience()", store.grant_experience, ids, xp)
+
+
+def benchmark_loot(entries: int = 300, picks: int = 1_000_000, draws: int = 10_000_000):
+    """Weighted picks from a large loot table: random.choices vs. the alias table."""
+    print(f"\nLoot tables ({entries} entries; {picks:,} single picks, {draws:,} batch draws)")
+
+    rng = random.Random(1)
+    drops = [item_registry.template(ItemType.MISC, f"Trinket {i}", i) for i in range(entries - 1)]
+    drops.append(GoldDrop(10, 50))
+    weights = [rng.randint(1, 1000) for _ in drops]
+    table = LootTable(zip(drops, weights))
+    cum_weights = list(itertools.accumulate(weights))
+
+    _timed("random.choices(weights=...)", lambda: [rng.choices(drops, weights)[0] for _ in range(picks)])
+    _timed("random.choices(cum_weights=...)",
+           lambda: [rng.choices(drops, cum_weights=cum_weights)[0] for _ in range(picks)])
+    _, elapsed = _timed("LootTable.pick (alias)", lambda: [table.pick(rng) for _ in range(picks)])
+    print(f"  {'alias picks/s':<45} {picks / elapsed:8.0f}")
+
+    _, elapsed = _timed(f"roll_many x {draws:,}", roll_many, table, draws)
+    print(f"  {'batch draws/s':<45} {draws / elapsed:8.0f}")
+
+
+def benchmark_batch_runner(fights_per_matchup: int = 200_000, chunk_size: int = 25_000):
+    """Matchup grid throughput as worker processes are added."""
+    grid = build_grid(HERO_CLASSES, DEFAULT_ENEMIES, DEFAULT_LOADOUTS)
+    total = len(grid) * fights_per_matchup
+    print(f"\nBatch runner ({len(grid)} matchups x {fights_per_matchup:,} fights, {os.cpu_count()} CPUs)")
+
+    baseline = None
+    for processes in sorted({1, 2, os.cpu_count() or 1}):
+        runner = BatchRunner(processes=processes, chunk_size=chunk_size, seed=1)
+        _, elapsed = _timed(f"{processes} process(es)", runner.run, grid, fights_per_matchup)
+        baseline = baseline or elapsed
+        print(f"  {'fights/s (speed-up)':<45} {total / elapsed:8.0f} ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_simulation()
+    benchmark_event_sinks()
+    benchmark_entities()
+    benchmark_inventory()
+    benchmark_item_templates()
+    benchmark_stat_cache()
+    benchmark_encounters()
+    benchmark_world_map()
+    benchmark_session_server()
+    benchmark_savegame()
+    benchmark_rewards()
+    benchmark_loot()
+    benchmark_batch_runner()
@@ -0,0 +1,152 @@
+"""
+Multi-Combatant Encounters
+==========================
+
+Party-vs-group fights for any number of units on each side:
+
+- Turn order comes from a priority queue keyed on each unit's next
+  action time; a unit with speed s acts every ACTION_COST // s ticks (at least 1),
+  so fast units act more often, not just first
+- Each side keeps a roster of living units with O(1) removal, so
+  picking a random living target costs the same at 5 or 500 units
+- Units choose attack or special ability like in Battle.fight()
+  (heroes 50/50, enemies special 30% of the time)
+- Seeded like Battle; run with a NullSink to resolve encounters
+  headlessly
+
+Run: python projects/game_characters/encounter.py
+"""
+
+import heapq
+import random
+from typing import Dict, List, Optional, Sequence
+
+from main import Archer, Character, Enemy, EventSink, Mage, Warrior, lend, split_seed
+
+ACTION_COST = 1000
+
+
+class _Roster:
+    """Living units of one side: O(1) random pick and O(1) removal."""
+
+    def __init__(self, units: Sequence[Character]):
+        self.units = [unit for unit in units if unit.is_alive()]
+        self._index: Dict[int, int] = {id(unit): i for i, unit in enumerate(self.units)}
+
+    def __len__(self):
+        return len(self.units)
+
+    def remove(self, unit: Character):
+        i = self._index.pop(id(unit), None)
+        if i is None:
+            return
+        last = self.units.pop()
+        if last is not unit:  # move the last unit into the freed spot
+            self.units[i] = last
+            self._index[id(last)] = i
+
+    def pick(self, rng: random.Random) -> Character:
+        return self.units[int(rng.random() * len(self.units))]
+
+
+class EncounterResult:
+    """How an encounter ended."""
+
+    def __init__(self, winner: Optional[str], actions: int, survivors: List[Character]):
+        self.winner = winner  # "party", "enemies", or None if stopped at max_actions
+        self.actions = actions
+        self.survivors = survivors
+
+    @property
+    def party_won(self) -> bool:
+        return self.winner == "party"
+
+
+class Encounter:
+    """A fight between a party of heroes and a group of enemies."""
+
+    def __init__(self, party: Sequence[Character], enemies: Sequence[Enemy],
+                 events: Optional[EventSink] = None, seed: Optional[int] = None):
+        self.party = list(party)
+        self.enemies = list(enemies)
+        self.events = events
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(split_seed(self.seed, "combat"))
+        self._choices = random.Random(split_seed(self.seed, "choices"))
+
+    def run(self, max_actions: int = 100_000) -> EncounterResult:
+        """Fight until one side is wiped out (or max_actions is reached)."""
+        units = self.party + self.enemies
+        with lend(units, self.rng, self.events):
+            return self._run(max_actions)
+
+    def _run(self, max_actions: int) -> EncounterResult:
+        events = self.events if self.events is not None else Character.events
+        events.emit("encounter_start", party=len(self.party), enemies=len(self.enemies))
+
+        heroes, foes = _Roster(self.party), _Roster(self.enemies)
+        opponents = {id(unit): foes for unit in self.party}
+        opponents.update((id(unit), heroes) for unit in self.enemies)
+        party_ids = {id(unit) for unit in self.party}
+
+        # (next action time, tie-breaker, delay, unit); the tie-breaker keeps
+        # the order stable and stops the heap from ever comparing Characters
+        queue = []
+        for order, unit in enumerate(self.party + self.enemies):
+            if unit.is_alive():
+                delay = max(1, ACTION_COST // max(1, unit.speed))  # units faster than ACTION_COST act every tick
+                queue.append((self._choices.randrange(delay), order, delay, unit))
+        heapq.heapify(queue)
+
+        choices = self._choices
+        actions = 0
+        while heroes and foes and actions < max_actions:
+            time, order, delay, unit = queue[0]
+            if not unit.is_alive():
+                heapq.heappop(queue)  # fell since its last action
+                continue
+            heapq.heapreplace(queue, (time + delay, order, delay, unit))
+
+            events.emit("turn_of", name=unit.name)
+            unit.tick_buffs()
+            targets = opponents[id(unit)]
+            target = targets.pick(self.rng)
+            if choices.random() < (0.5 if id(unit) in party_ids else 0.3):
+                unit.special_ability(target)
+            else:
+                unit.attack(target)
+            if not target.is_alive():
+                targets.remove(target)
+            actions += 1
+
+        if heroes and not foes:
+            winner, survivors = "party", heroes.units
+            xp = sum(enemy.xp_reward for enemy in self.enemies) // len(survivors)
+            for hero in survivors:
+                hero.gain_experience(xp)
+        elif foes and not heroes:
+            winner, survivors = "enemies", foes.units
+        else:  # stopped at max_actions, or nobody was left standing on either side
+            winner, survivors = None, heroes.units + foes.units
+
+        result = {"party": "🎉 PARTY VICTORY", "enemies": "💀 PARTY DEFEATED"}.get(winner, "⏸  STOPPED")
+        events.emit("encounter_end", result=result, actions=actions, survivors=len(survivors))
+        return EncounterResult(winner, actions, list(survivors))
+
+
+def demo_encounter():
+    """Three heroes against a goblin warband."""
+    print("="*70)
+    print("MULTI-COMBATANT ENCOUNTER DEMO")
+    print("="*70)
+
+    party = [Warrior("Conan the Brave"), Mage("Gandalf the Wise"), Archer("Legolas the Swift")]
+    goblins = [Enemy(f"Goblin {i + 1}", 50, 15, 5, 50, speed=12) for i in range(4)]
+    goblins.append(Enemy("Goblin Chief", 120, 25, 8, 150, speed=9))
+
+    result = Encounter(party, goblins, seed=7).run()
+    print(f"Winner: {result.winner}, survivors: {[unit.name for unit in result.survivors]}")
+
+
+if __name__ == "__main__":
+    demo_encounter()
@@ -0,0 +1,265 @@
+"""
+Compact Entity Storage
+======================
+
+Keeps a whole shard of live characters in an entity-component store:
+
+- Stats (health, attack, defense, level, experience, ...) live in typed
+  NumPy arrays indexed by entity id, not in one object per character
+- EntityView gives a Character-compatible window onto one entity
+  (attack_power, defense, heal(), take_damage(), attack(), level_up(), ...)
+- A world tick (regeneration, buff expiry, death checks) is one
+  vectorized pass over every entity
+- Ids of despawned entities are reused
+- XP rewards for many entities at once, levelling up through XP_TABLE
+
+Equipment, inventories and class abilities stay on full Character
+objects; the store covers the stats every entity has.
+
+Requires numpy: pip install numpy
+
+Run: python projects/game_characters/entities.py
+"""
+
+from typing import Iterable, List
+
+import numpy as np
+
+from main import Character, Enemy, Mage, Warrior
+from rewards import levels_for_experience
+
+# column name -> dtype
+COLUMNS = {
+    "health": np.int32,
+    "max_health": np.int32,
+    "base_attack": np.int32,
+    "base_defense": np.int32,
+    "level": np.uint32,
+    "experience": np.int64,
+    "regen": np.int16,          # health regained per tick
+    "buff_attack": np.int16,
+    "buff_defense": np.int16,
+    "buff_ticks": np.int16,     # ticks left on the current buff
+    "alive": np.bool_,          # as of the last death check
+    "in_use": np.bool_,
+}
+
+
+class EntityStore:
+    """Column-oriented storage for many characters."""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.count = 0  # high-water mark; ids are < count
+        self.names: List[str] = []
+        self._free: List[int] = []
+        for column, dtype in COLUMNS.items():
+            setattr(self, column, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count - len(self._free)
+
+    def _grow(self):
+        self.capacity *= 2
+        for column in COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, column, new)
+
+    # --- Spawning -----------------------------------------------------
+
+    def spawn(self, name: str, health: int, attack_power: int, defense: int,
+              level: int = 1, experience: int = 0, regen: int = 0) -> int:
+        """Add an entity and return its id."""
+        if self._free:
+            entity = self._free.pop()
+            self.names[entity] = name
+        else:
+            if self.count == self.capacity:
+                self._grow()
+            entity = self.count
+            self.count += 1
+            self.names.append(name)
+
+        self.health[entity] = self.max_health[entity] = health
+        self.base_attack[entity] = attack_power
+        self.base_defense[entity] = defense
+        self.level[entity] = level
+        self.experience[entity] = experience
+        self.regen[entity] = regen
+        self.buff_attack[entity] = self.buff_defense[entity] = self.buff_ticks[entity] = 0
+        self.alive[entity] = health > 0
+        self.in_use[entity] = True
+        return entity
+
+    def add(self, character: Character, regen: int = 0) -> int:
+        """Copy a Character's stats (with equipment bonuses folded in) into the store."""
+        entity = self.spawn(character.name, character.max_health, character.attack_power,
+                            character.defense, character.level, character.experience, regen)
+        self.health[entity] = character.health
+        self.alive[entity] = character.is_alive()
+        return entity
+
+    def add_many(self, characters: Iterable[Character], regen: int = 0) -> List[int]:
+        return [self.add(character, regen) for character in characters]
+
+    def despawn(self, entity: int):
+        """Remove an entity; its id may be handed out again."""
+        if self.in_use[entity]:
+            self.in_use[entity] = self.alive[entity] = False
+            self._free.append(entity)
+
+    def view(self, entity: int) -> "EntityView":
+        if not (0 <= entity < self.count and self.in_use[entity]):
+            raise KeyError(entity)
+        return EntityView(self, entity)
+
+    # --- World --------------------------------------------------------
+
+    def apply_buff(self, entity: int, attack: int = 0, defense: int = 0, ticks: int = 3):
+        """Temporary stat bonus that expires after ``ticks`` world ticks."""
+        self.buff_attack[entity] = attack
+        self.buff_defense[entity] = defense
+        self.buff_ticks[entity] = ticks
+
+    def tick(self) -> np.ndarray:
+        """
+        Advance the world one tick and return the ids that died since the last tick.
+
+        Living entities regenerate up to max health, buffs count down and
+        are cleared when they run out, then everyone is checked for death.
+        """
+        n = self.count
+        health, alive = self.health[:n], self.alive[:n]
+
+        living = alive & (health > 0)
+        np.minimum(health + self.regen[:n] * living, self.max_health[:n], out=health)
+
+        ticks = self.buff_ticks[:n]
+        buffed = ticks > 0
+        ticks -= buffed
+        expired = buffed & (ticks == 0)
+        self.buff_attack[:n][expired] = 0
+        self.buff_defense[:n][expired] = 0
+
+        now_alive = self.in_use[:n] & (health > 0)
+        died = np.flatnonzero(alive & ~now_alive)
+        alive[:] = now_alive
+        return died
+
+    def grant_experience(self, entities: np.ndarray, xp) -> np.ndarray:
+        """
+        Give XP (one value, or one per entity) and apply any level-ups.
+
+        Level-ups follow Character.level_up: +20 max health (healed to full),
+        +5 attack and +3 defense per level. Returns levels gained per entity.
+        """
+        entities = np.asarray(entities)
+        experience = self.experience[entities] + np.asarray(xp, dtype=np.int64)
+        self.experience[entities] = experience
+        new_level = levels_for_experience(experience)
+        gained = np.maximum(new_level - self.level[entities], 0).astype(np.int32)
+
+        levelled = entities[gained > 0]
+        gained_some = gained[gained > 0]
+        self.level[levelled] += gained_some.astype(np.uint32)
+        self.max_health[levelled] += 20 * gained_some
+        self.health[levelled] = self.max_health[levelled]
+        self.base_attack[levelled] += 5 * gained_some
+        self.base_defense[levelled] += 3 * gained_some
+        return gained
+
+    def living(self) -> np.ndarray:
+        """Ids of entities alive as of the last tick."""
+        return np.flatnonzero(self.alive[:self.count])
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the stat columns (names not included)."""
+        return sum(getattr(self, column).nbytes for column in COLUMNS)
+
+
+def _column(name: str) -> property:
+    def get(self):
+        return int(getattr(self._store, name)[self.id])
+
+    def set(self, value):
+        getattr(self._store, name)[self.id] = value
+
+    return property(get, set)
+
+
+class EntityView:
+    """
+    One entity seen as a Character.
+
+    Reads and writes go straight to the store's arrays, so views are
+    cheap to create and never go stale. The combat methods are the
+    Character ones, run against these properties.
+    """
+
+    def __init__(self, store: EntityStore, entity: int):
+        self._store = store
+        self.id = entity
+
+    health = _column("health")
+    max_health = _column("max_health")
+    base_attack = _column("base_attack")
+    base_defense = _column("base_defense")
+    level = _column("level")
+    experience = _column("experience")
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self.id]
+
+    @property
+    def events(self):
+        return Character.events
+
+    @property
+    def attack_power(self) -> int:
+        return self.base_attack + int(self._store.buff_attack[self.id])
+
+    @property
+    def defense(self) -> int:
+        return self.base_defense + int(self._store.buff_defense[self.id])
+
+    is_alive = Character.is_alive
+    heal = Character.heal
+    take_damage = Character.take_damage
+    attack = Character.attack
+    gain_experience = Character.gain_experience
+    level_up = Character.level_up
+
+    def __repr__(self):
+        return f"EntityView({self.id}, {self.name!r}, HP {self.health}/{self.max_health})"
+
+
+def demo_entities():
+    """A small world ticking along."""
+    print("="*70)
+    print("COMPACT ENTITY STORAGE DEMO")
+    print("="*70)
+
+    store = EntityStore()
+    conan = store.view(store.add(Warrior("Conan the Brave"), regen=5))
+    gandalf = store.view(store.add(Mage("Gandalf the Wise"), regen=2))
+    goblin = store.view(store.add(Enemy("Goblin Scout", 50, 15, 5, 50)))
+
+    goblin.attack(conan)
+    store.apply_buff(conan.id, attack=10, ticks=2)
+    conan.attack(goblin)
+    gandalf.attack(goblin)
+
+    for tick in range(1, 4):
+        died = store.tick()
+        print(f"\nTick {tick}: {len(store.living())} alive, died: {[store.names[i] for i in died]}")
+        print(f"  {conan!r}, ATK {conan.attack_power}")
+
+    print(f"\n{len(store)} entities in {store.memory_bytes:,} bytes of stat columns")
+
+
+if __name__ == "__main__":
+    demo_entities()
@@ -7,13 +7,22 @@ A comprehensive RPG game system demonstrating:
 - Polymorphism (different attack styles)
 - Composition (inventory, equipment)
 - Encapsulation (stats management)
+- Combat events sent to a pluggable sink (print, record or discard)
+- Seeded per-battle randomness, so any fight can be replayed exactly
+- Flyweight item templates shared by every copy of an item
+- Precomputed XP table; big XP grants jump several levels at once
+- Weighted enemy loot tables with O(1) (alias method) rolls
 
 Run: python projects/game_characters/main.py
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from bisect import bisect_right
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from enum import Enum
+import hashlib
 import random
 
 
@@ -25,13 +34,203 @@ class ItemType(Enum):
     MISC = "Miscellaneous"
 
 
+_RULE = "=" * 60
+
+# Text for each combat event kind; fields are plain names and numbers
+EVENT_TEMPLATES: Dict[str, str] = {
+    "heal": "{name} healed {healed} HP! ({old_health} → {health})",
+    "damage": "{name} took {damage} damage! HP: {health}/{max_health}",
+    "defeated": "💀 {name} has been defeated!",
+    "attack": "\n⚔️  {name} attacks {target}!",
+    "equip_weapon": "{name} equipped {item} (+{damage} attack)",
+    "equip_armor": "{name} equipped {item} (+{defense} defense)",
+    "level_up": "\n⭐ {name} leveled up to Level {level}!\n   HP: {max_health}, ATK: {attack}, DEF: {defense}",
+    "shield_block": "\n🛡️  {name} activates Shield Block!\nDefense increased to {defense} for next attack!",
+    "berserker_rage": "\n💢 {name} enters Berserker Rage!\n{name} sacrifices 10 HP for a devastating blow!",
+    "no_mana": "{name} doesn't have enough mana!",
+    "fireball": "\n🔥 {name} casts Fireball! (Mana: {mana}/{max_mana})",
+    "no_arrows": "{name} doesn't have enough arrows!",
+    "rapid_fire": "\n🏹 {name} uses Rapid Fire! (Arrows: {arrows})",
+    "arrow": "  Arrow {number}:",
+    "out_of_arrows": "{name} is out of arrows!",
+    "aim": "\n🎯 {name} aims for a Critical Shot!",
+    "critical_hit": "💥 CRITICAL HIT!",
+    "missed": "❌ Missed!",
+    "enemy_special": "\n👹 {name} uses a special attack!",
+    "battle_start": f"\n{_RULE}\n⚔️  BATTLE START: {{hero}} vs {{enemy}}\n{_RULE}",
+    "turn": "\n--- Turn {turn} ---",
+    "turn_of": "\n{name}'s turn:",
+    "victory": f"\n{_RULE}\n🎉 VICTORY! {{hero}} defeated {{enemy}}!",
+    "xp_gained": "Gained {xp} XP!",
+    "loot": "Found {gold} gold!",
+    "loot_item": "Found {item}!",
+    "inventory_full": "No room for {item}, left behind.",
+    "defeat": f"\n{_RULE}\n💀 DEFEAT! {{hero}} was defeated by {{enemy}}...",
+    "battle_end": f"{_RULE}\n",
+    "encounter_start": f"\n{_RULE}\n⚔️  ENCOUNTER: {{party}} hero(es) vs {{enemies}} enemies\n{_RULE}",
+    "encounter_end": f"\n{_RULE}\n{{result}} after {{actions}} actions, {{survivors}} survivor(s)\n{_RULE}\n",
+}
+
+
+def render_event(kind: str, fields: Dict) -> str:
+    """Turn one combat event into the line(s) the game prints for it."""
+    return EVENT_TEMPLATES[kind].format(**fields)
+
+
+class EventSink(ABC):
+    """Receives combat events as a kind plus keyword fields."""
+
+    @abstractmethod
+    def emit(self, kind: str, **fields):
+        """Handle one event."""
+        pass
+
+
+class PrintSink(EventSink):
+    """Prints every event as it happens (the default)."""
+
+    def emit(self, kind: str, **fields):
+        print(render_event(kind, fields))
+
+
+class NullSink(EventSink):
+    """Silent mode: drops events without formatting anything."""
+
+    def emit(self, kind: str, **fields):
+        pass
+
+
+class EventLog(EventSink):
+    """Records events so a fight can be rendered or inspected afterwards."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Dict]] = []
+
+    def emit(self, kind: str, **fields):
+        self.events.append((kind, fields))
+
+    def __len__(self):
+        return len(self.events)
+
+    def render(self) -> Iterator[str]:
+        """Text for each recorded event, as PrintSink would have shown it."""
+        return (render_event(kind, fields) for kind, fields in self.events)
+
+
+def split_seed(seed: int, *key) -> int:
+    """
+    Derive an independent 64-bit seed from a parent seed and a key.
+
+    split_seed(run_seed, worker, fight) gives every worker (and every
+    fight) its own stream that does not depend on scheduling order.
+    """
+    digest = hashlib.blake2b(repr((seed,) + key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ItemTemplate(NamedTuple):
+    """The immutable data shared by every copy of an item."""
+    item_type: ItemType
+    name: str
+    value: int
+    power: int = 0  # damage, defense or heal amount, depending on the type
+
+
+class ItemRegistry:
+    """Hands out one shared ItemTemplate per distinct item (flyweight)."""
+
+    def __init__(self):
+        self._templates: Dict[ItemTemplate, ItemTemplate] = {}
+
+    def __len__(self):
+        return len(self._templates)
+
+    def template(self, item_type: ItemType, name: str, value: int, power: int = 0) -> ItemTemplate:
+        """The shared template for these stats, created on first use."""
+        key = ItemTemplate(item_type, name, value, power)
+        return self._templates.setdefault(key, key)
+
+
+item_registry = ItemRegistry()
+
+
 class Item:
-    """Base class for all items."""
+    """
+    Base class for all items.
+
+    Name, type, value and stats live in a shared ItemTemplate; an item
+    instance holds only its own state (durability, enchantment).
+    Assigning name, value or the stat (damage, defense, heal_amount) is
+    copy-on-write: this copy switches to a template with the new field,
+    and every other copy keeps the shared one.
+    """
+
+    __slots__ = ("template", "durability", "_enchantment", "_holder")
+    max_stack = 1  # copies that share one inventory slot
+
+    def __init__(self, name: str, item_type: ItemType, value: int, power: int = 0,
+                 durability: int = 100, enchantment: int = 0):
+        self.template = item_registry.template(item_type, name, value, power)
+        self.durability = durability
+        self._enchantment = enchantment
+        self._holder = None  # the Inventory or Character holding this item, told about changes
+
+    @classmethod
+    def from_template(cls, template: ItemTemplate, durability: int = 100, enchantment: int = 0) -> "Item":
+        """New copy of an existing template, skipping the registry lookup."""
+        item = cls.__new__(cls)
+        item.template = template
+        item.durability = durability
+        item._enchantment = enchantment
+        item._holder = None
+        return item
 
-    def __init__(self, name: str, item_type: ItemType, value: int):
-        self.name = name
-        self.item_type = item_type
-        self.value = value
+    @property
+    def enchantment(self) -> int:
+        return self._enchantment
+
+    @enchantment.setter
+    def enchantment(self, enchantment: int):
+        self._enchantment = enchantment
+        if self._holder is not None:
+            self._holder._item_changed(self, self.template)
+
+    def _retemplate(self, **changes):
+        """Copy-on-write: point this copy at the template with ``changes`` applied."""
+        old = self.template
+        self.template = item_registry.template(*old._replace(**changes))
+        if self._holder is not None:
+            self._holder._item_changed(self, old)
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    @name.setter
+    def name(self, name: str):
+        self._retemplate(name=name)
+
+    @property
+    def item_type(self) -> ItemType:
+        return self.template.item_type
+
+    @property
+    def value(self) -> int:
+        return self.template.value
+
+    @value.setter
+    def value(self, value: int):
+        self._retemplate(value=value)
+
+    @property
+    def power(self) -> int:
+        """Template stat plus this copy's enchantment."""
+        return self.template.power + self._enchantment
+
+    @power.setter
+    def power(self, power: int):
+        """Set the total stat; the enchantment stays, the template part makes up the rest."""
+        self._retemplate(power=power - self._enchantment)
 
     def __str__(self):
         return f"{self.name} ({self.item_type.value}) - Value: {self.value} gold"
@@ -40,9 +239,12 @@ class Item:
 class Weapon(Item):
     """Weapon that increases attack power."""
 
-    def __init__(self, name: str, damage: int, value: int):
-        super().__init__(name, ItemType.WEAPON, value)
-        self.damage = damage
+    __slots__ = ()
+
+    def __init__(self, name: str, damage: int, value: int, durability: int = 100, enchantment: int = 0):
+        super().__init__(name, ItemType.WEAPON, value, damage, durability, enchantment)
+
+    damage = Item.power
 
     def __str__(self):
         return f"{self.name} (Weapon) - Damage: +{self.damage}, Value: {self.value}g"
@@ -51,9 +253,12 @@ class Weapon(Item):
 class Armor(Item):
     """Armor that increases defense."""
 
-    def __init__(self, name: str, defense: int, value: int):
-        super().__init__(name, ItemType.ARMOR, value)
-        self.defense = defense
+    __slots__ = ()
+
+    def __init__(self, name: str, defense: int, value: int, durability: int = 100, enchantment: int = 0):
+        super().__init__(name, ItemType.ARMOR, value, defense, durability, enchantment)
+
+    defense = Item.power
 
     def __str__(self):
         return f"{self.name} (Armor) - Defense: +{self.defense}, Value: {self.value}g"
@@ -62,9 +267,13 @@ class Armor(Item):
 class Potion(Item):
     """Potion that restores health/mana."""
 
-    def __init__(self, name: str, heal_amount: int, value: int):
-        super().__init__(name, ItemType.POTION, value)
-        self.heal_amount = heal_amount
+    __slots__ = ()
+    max_stack = 20
+
+    def __init__(self, name: str, heal_amount: int, value: int, durability: int = 100, enchantment: int = 0):
+        super().__init__(name, ItemType.POTION, value, heal_amount, durability, enchantment)
+
+    heal_amount = Item.power
 
     def use(self, character: 'Character'):
         """Use potion on character."""
@@ -75,53 +284,297 @@ class Potion(Item):
         return f"{self.name} (Potion) - Heals: {self.heal_amount} HP, Value: {self.value}g"
 
 
+class InventoryItems(Sequence):
+    """
+    Live view of an inventory's items, stack by stack.
+
+    It reads the inventory's indexes, so it never goes stale. append()
+    and remove() go through Inventory.add_item()/remove_item(), so code
+    written against a plain list of items keeps working. Indexing walks
+    the items; iterate instead where you can.
+    """
+
+    __slots__ = ("_inventory",)
+
+    def __init__(self, inventory: "Inventory"):
+        self._inventory = inventory
+
+    def __len__(self):
+        return len(self._inventory)
+
+    def __iter__(self) -> Iterator[Item]:
+        for stack in self._inventory._stacks.values():
+            yield from stack.values()
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __contains__(self, item) -> bool:
+        return isinstance(item, Item) and item in self._inventory
+
+    def append(self, item: Item) -> bool:
+        """Add item; False if it is already held or there is no free slot."""
+        return self._inventory.add_item(item)
+
+    def remove(self, item: Item):
+        """Remove item; ValueError if it isn't held, like list.remove()."""
+        if not self._inventory.remove_item(item):
+            raise ValueError(f"{item.name} is not in the inventory")
+
+    def __repr__(self):
+        return f"InventoryItems({list(self)!r})"
+
+
 class Inventory:
-    """Manages character's inventory."""
+    """
+    Manages character's inventory.
+
+    Items are indexed by name and by type, so lookups and removals cost
+    the same for a stash of thousands of items as for a backpack.
+    Copies of the same item (the same ItemTemplate) stack: up to
+    ``max_stack`` of them share one slot. Items that only share a name
+    (say, two "Iron Sword"s with different damage) go in separate stacks.
+    """
 
     def __init__(self, max_slots: int = 20):
         self.max_slots = max_slots
-        self.items: List[Item] = []
         self.gold = 0
+        # key -> {id(item): item}; dicts keep insertion order and remove in O(1)
+        self._stacks: Dict[ItemTemplate, Dict[int, Item]] = {}
+        self._by_name: Dict[str, Dict[int, Item]] = {}
+        self._by_type: Dict[ItemType, Dict[int, Item]] = {}
+        self._count = 0
+        self.used_slots = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, item: Item) -> bool:
+        return id(item) in self._stacks.get(item.template, ())
+
+    @property
+    def items(self) -> InventoryItems:
+        """Every item, stack by stack (a live view, see InventoryItems)."""
+        return InventoryItems(self)
 
     def add_item(self, item: Item) -> bool:
         """Add item to inventory."""
-        if len(self.items) >= self.max_slots:
+        stack = self._stacks.get(item.template)
+        if stack is not None and id(item) in stack:
+            return False
+        held = len(stack) if stack else 0
+        if held % item.max_stack == 0 and self.used_slots >= self.max_slots:
             return False
 
-        self.items.append(item)
+        self._file(item)
+        item._holder = self
         return True
 
     def remove_item(self, item: Item) -> bool:
         """Remove item from inventory."""
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
+        if not self._unfile(item, item.template):
+            return False
+        if item._holder is self:
+            item._holder = None
+        return True
+
+    def _file(self, item: Item):
+        template = item.template
+        stack = self._stacks.setdefault(template, {})
+        self.used_slots += len(stack) % item.max_stack == 0
+        stack[id(item)] = item
+        self._by_name.setdefault(template.name, {})[id(item)] = item
+        self._by_type.setdefault(template.item_type, {})[id(item)] = item
+        self._count += 1
+
+    def _unfile(self, item: Item, template: ItemTemplate) -> bool:
+        stack = self._stacks.get(template)
+        if not stack or stack.pop(id(item), None) is None:
+            return False
+
+        if not stack:
+            del self._stacks[template]
+        named = self._by_name[template.name]
+        del named[id(item)]
+        if not named:
+            del self._by_name[template.name]
+        del self._by_type[template.item_type][id(item)]
+        self._count -= 1
+        self.used_slots -= len(stack) % item.max_stack == 0
+        return True
+
+    def _item_changed(self, item: Item, old_template: ItemTemplate):
+        """
+        Move a held item to its new stack after a copy-on-write change.
+
+        The item stays carried even if its new stack needs a slot past
+        max_slots; add_item() refuses new items until slots free up.
+        """
+        if old_template is not item.template and self._unfile(item, old_template):
+            self._file(item)
 
     def has_item(self, item_name: str) -> bool:
         """Check if item exists."""
-        return any(item.name == item_name for item in self.items)
+        return item_name in self._by_name
 
     def get_item(self, item_name: str) -> Optional[Item]:
         """Get item by name."""
-        for item in self.items:
-            if item.name == item_name:
-                return item
-        return None
+        stack = self._by_name.get(item_name)
+        return next(iter(stack.values())) if stack else None
+
+    def count(self, item_name: str) -> int:
+        """How many items with this name are carried (over all their stacks)."""
+        return len(self._by_name.get(item_name, ()))
+
+    def items_of_type(self, item_type: ItemType) -> List[Item]:
+        """Every item of one type."""
+        return list(self._by_type.get(item_type, {}).values())
 
     def display(self):
         """Display inventory contents."""
-        print(f"\n--- Inventory ({len(self.items)}/{self.max_slots}) ---")
+        print(f"\n--- Inventory ({self.used_slots}/{self.max_slots}) ---")
         print(f"Gold: {self.gold}")
-        if not self.items:
+        if not self._stacks:
             print("  (Empty)")
         else:
-            for item in self.items:
-                print(f"  - {item}")
+            for stack in self._stacks.values():
+                item = next(iter(stack.values()))
+                count = f" x{len(stack)}" if len(stack) > 1 else ""
+                print(f"  - {item}{count}")
+
+
+ITEM_CLASSES = {ItemType.WEAPON: Weapon, ItemType.ARMOR: Armor, ItemType.POTION: Potion,
+                ItemType.MISC: Item}
+
+
+class GoldDrop(NamedTuple):
+    """Some gold: between low and high coins, inclusive."""
+    low: int
+    high: int
+
+
+class Loot(NamedTuple):
+    """What one roll of a loot table dropped."""
+    gold: int
+    items: List[Item]
+
+
+def _alias_table(weights: List[float]) -> Tuple[List[float], List[int]]:
+    """
+    Vose's alias method: split the weights into len(weights) equal columns,
+    each holding at most two entries (itself with ``probability[i]``,
+    otherwise ``alias[i]``).
+    """
+    n, total = len(weights), sum(weights)
+    scaled = [weight * n / total for weight in weights]
+    probability, alias = [1.0] * n, list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less], alias[less] = scaled[less], more
+        scaled[more] -= 1.0 - scaled[less]
+        (small if scaled[more] < 1.0 else large).append(more)
+    # Whatever is left is 1.0 up to rounding and keeps probability 1.0
+    return probability, alias
+
+
+class LootTable:
+    """
+    Weighted drops for an enemy type.
+
+    Each entry is (drop, weight); a drop is an ItemTemplate, a GoldDrop,
+    another LootTable (rolled in turn) or None for nothing. A roll makes
+    ``rolls`` weighted picks and adds every ``guaranteed`` drop. The
+    weights are compiled into an alias table once, so a pick costs one
+    random number and O(1) work however many entries the table has.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[object, float]], rolls: int = 1,
+                 guaranteed: Iterable[object] = ()):
+        entries = list(entries)
+        self.drops = [drop for drop, _ in entries]
+        self.weights = [float(weight) for _, weight in entries]
+        if not entries or min(self.weights) < 0 or sum(self.weights) <= 0:
+            raise ValueError("a loot table needs non-negative weights with a positive total")
+        self.rolls = rolls
+        self.guaranteed = list(guaranteed)
+        self.probability, self.alias = _alias_table(self.weights)
+
+    def __len__(self):
+        return len(self.drops)
+
+    def pick(self, rng=random):
+        """One weighted pick from the table's own entries."""
+        u = rng.random() * len(self.drops)
+        column = int(u)
+        if u - column < self.probability[column]:
+            return self.drops[column]
+        return self.drops[self.alias[column]]
+
+    def roll(self, rng=random) -> Loot:
+        """Roll the table: gold and new items, nested tables included."""
+        items: List[Item] = []
+        return Loot(self._roll(rng, items), items)
+
+    def _roll(self, rng, items: List[Item]) -> int:
+        gold = 0
+        drops = self.guaranteed + [self.pick(rng) for _ in range(self.rolls)]
+        for drop in drops:
+            if isinstance(drop, ItemTemplate):
+                items.append(ITEM_CLASSES[drop.item_type].from_template(drop))
+            elif isinstance(drop, GoldDrop):
+                gold += rng.randint(drop.low, drop.high)
+            elif isinstance(drop, LootTable):
+                gold += drop._roll(rng, items)
+        return gold
+
+
+XP_TABLE_LEVELS = 100
+XP_PER_LEVEL = 100
+# XP_TABLE[n] = total experience needed to reach level n + 1: leaving level L takes L * 100
+XP_TABLE: List[int] = [level * XP_PER_LEVEL for level in range(XP_TABLE_LEVELS)]
+
+
+def level_for_experience(experience: int) -> int:
+    """
+    The level a character with this much total experience has reached.
+
+    There is no level cap: past the end of XP_TABLE every further level
+    takes another XP_PER_LEVEL.
+    """
+    if experience < XP_TABLE[-1]:
+        return bisect_right(XP_TABLE, experience)
+    return len(XP_TABLE) + (experience - XP_TABLE[-1]) // XP_PER_LEVEL
+
+
+class Buff:
+    """Temporary stat bonus that lasts a number of its owner's turns."""
+
+    def __init__(self, name: str, attack: int = 0, defense: int = 0, turns: int = 1):
+        self.name = name
+        self.attack = attack
+        self.defense = defense
+        self.turns = turns
 
 
 class Character(ABC):
-    """Abstract base class for all characters."""
+    """
+    Abstract base class for all characters.
+
+    attack_power and defense are derived from base stats, equipment and
+    active buffs. They are cached and only recomputed after the inputs
+    change: equipping, levelling up, a buff being added or expiring, or
+    an equipped item's stat or enchantment changing. Code that changes
+    base_attack/base_defense directly must call invalidate_stats().
+
+    Buffs count down on their owner's combat turns and are cleared when
+    the battle ends (see lend() and Battle.finish()).
+    """
+
+    events: EventSink = PrintSink()  # shared default; assign per instance to redirect
+    speed = 10  # initiative in multi-combatant encounters: higher acts more often
+    rng = random  # module-level RNG outside battles; a Battle lends its own stream
 
     def __init__(self, name: str, health: int, attack_power: int, defense: int):
         self.name = name
@@ -132,20 +585,86 @@ class Character(ABC):
         self.level = 1
         self.experience = 0
         self.inventory = Inventory()
-        self.equipped_weapon: Optional[Weapon] = None
-        self.equipped_armor: Optional[Armor] = None
+        self.buffs: List[Buff] = []
+        self._stats: Optional[Tuple[int, int]] = None  # cached (attack_power, defense)
+        self._equipped_weapon: Optional[Weapon] = None
+        self._equipped_armor: Optional[Armor] = None
+
+    @property
+    def equipped_weapon(self) -> Optional[Weapon]:
+        return self._equipped_weapon
+
+    @equipped_weapon.setter
+    def equipped_weapon(self, weapon: Optional[Weapon]):
+        self._hold(self._equipped_weapon, weapon)
+        self._equipped_weapon = weapon
+        self._stats = None
+
+    @property
+    def equipped_armor(self) -> Optional[Armor]:
+        return self._equipped_armor
+
+    @equipped_armor.setter
+    def equipped_armor(self, armor: Optional[Armor]):
+        self._hold(self._equipped_armor, armor)
+        self._equipped_armor = armor
+        self._stats = None
+
+    def _hold(self, old: Optional[Item], new: Optional[Item]):
+        """Swap which equipped item reports its changes to this character."""
+        if old is not None and old._holder is self:
+            old._holder = None
+        if new is not None:
+            new._holder = self
+
+    def _item_changed(self, item: Item, old_template: ItemTemplate):
+        if item is self._equipped_weapon or item is self._equipped_armor:
+            self._stats = None
+
+    def invalidate_stats(self):
+        """Drop the cached attack_power/defense; they are recomputed on next use."""
+        self._stats = None
+
+    def _derive_stats(self) -> Tuple[int, int]:
+        attack = self.base_attack + (self._equipped_weapon.damage if self._equipped_weapon else 0)
+        defense = self.base_defense + (self._equipped_armor.defense if self._equipped_armor else 0)
+        for buff in self.buffs:
+            attack += buff.attack
+            defense += buff.defense
+        self._stats = (attack, defense)
+        return self._stats
 
     @property
     def attack_power(self) -> int:
-        """Total attack power including weapon."""
-        weapon_damage = self.equipped_weapon.damage if self.equipped_weapon else 0
-        return self.base_attack + weapon_damage
+        """Total attack power including weapon and buffs."""
+        return (self._stats or self._derive_stats())[0]
 
     @property
     def defense(self) -> int:
-        """Total defense including armor."""
-        armor_def = self.equipped_armor.defense if self.equipped_armor else 0
-        return self.base_defense + armor_def
+        """Total defense including armor and buffs."""
+        return (self._stats or self._derive_stats())[1]
+
+    def add_buff(self, buff: Buff):
+        """Apply a temporary bonus until it runs out of turns."""
+        self.buffs.append(buff)
+        self._stats = None
+
+    def tick_buffs(self):
+        """Count down buffs at the start of this character's turn; drop expired ones."""
+        if not self.buffs:
+            return
+        for buff in self.buffs:
+            buff.turns -= 1
+        active = [buff for buff in self.buffs if buff.turns > 0]
+        if len(active) != len(self.buffs):
+            self.buffs = active
+            self._stats = None
+
+    def clear_buffs(self):
+        """Drop every buff, e.g. once the battle that granted them is over."""
+        if self.buffs:
+            self.buffs = []
+            self._stats = None
 
     def is_alive(self) -> bool:
         """Check if character is alive."""
@@ -156,21 +675,22 @@ class Character(ABC):
         old_health = self.health
         self.health = min(self.health + amount, self.max_health)
         healed = self.health - old_health
-        print(f"{self.name} healed {healed} HP! ({old_health} → {self.health})")
+        self.events.emit("heal", name=self.name, healed=healed, old_health=old_health, health=self.health)
 
     def take_damage(self, amount: int):
         """Take damage reduced by defense."""
         damage = max(1, amount - self.defense)  # Minimum 1 damage
         self.health = max(0, self.health - damage)
-        print(f"{self.name} took {damage} damage! HP: {self.health}/{self.max_health}")
+        self.events.emit("damage", name=self.name, damage=damage, health=self.health,
+                         max_health=self.max_health)
 
         if not self.is_alive():
-            print(f"💀 {self.name} has been defeated!")
+            self.events.emit("defeated", name=self.name)
 
     def attack(self, target: 'Character'):
         """Basic attack."""
         damage = self.attack_power
-        print(f"\n⚔️  {self.name} attacks {target.name}!")
+        self.events.emit("attack", name=self.name, target=target.name)
         target.take_damage(damage)
 
     @abstractmethod
@@ -183,41 +703,40 @@ class Character(ABC):
         if self.equipped_weapon:
             self.inventory.add_item(self.equipped_weapon)
 
-        if weapon in self.inventory.items:
-            self.inventory.remove_item(weapon)
+        self.inventory.remove_item(weapon)
 
         self.equipped_weapon = weapon
-        print(f"{self.name} equipped {weapon.name} (+{weapon.damage} attack)")
+        self.events.emit("equip_weapon", name=self.name, item=weapon.name, damage=weapon.damage)
 
     def equip_armor(self, armor: Armor):
         """Equip armor."""
         if self.equipped_armor:
             self.inventory.add_item(self.equipped_armor)
 
-        if armor in self.inventory.items:
-            self.inventory.remove_item(armor)
+        self.inventory.remove_item(armor)
 
         self.equipped_armor = armor
-        print(f"{self.name} equipped {armor.name} (+{armor.defense} defense)")
+        self.events.emit("equip_armor", name=self.name, item=armor.name, defense=armor.defense)
 
     def gain_experience(self, xp: int):
-        """Gain experience and level up if threshold reached."""
+        """Gain experience and level up as many times as the XP table allows."""
         self.experience += xp
-        xp_needed = self.level * 100
+        new_level = level_for_experience(self.experience)
 
-        if self.experience >= xp_needed:
-            self.level_up()
+        if new_level > self.level:
+            self.level_up(new_level - self.level)
 
-    def level_up(self):
-        """Level up character."""
-        self.level += 1
-        self.max_health += 20
+    def level_up(self, levels: int = 1):
+        """Level up character (by several levels at once if given)."""
+        self.level += levels
+        self.max_health += 20 * levels
         self.health = self.max_health
-        self.base_attack += 5
-        self.base_defense += 3
+        self.base_attack += 5 * levels
+        self.base_defense += 3 * levels
+        self._stats = None
 
-        print(f"\n⭐ {self.name} leveled up to Level {self.level}!")
-        print(f"   HP: {self.max_health}, ATK: {self.base_attack}, DEF: {self.base_defense}")
+        self.events.emit("level_up", name=self.name, level=self.level, max_health=self.max_health,
+                         attack=self.base_attack, defense=self.base_defense)
 
     def display_stats(self):
         """Display character stats."""
@@ -238,22 +757,22 @@ class Character(ABC):
 class Warrior(Character):
     """Warrior class - high health, medium attack."""
 
+    speed = 8
+
     def __init__(self, name: str):
         super().__init__(name, health=150, attack_power=25, defense=15)
         self.rage = 0
 
     def special_ability(self, target: 'Character'):
-        """Shield Block - reduce incoming damage for next attack."""
-        print(f"\n🛡️  {self.name} activates Shield Block!")
-        self.base_defense += 20
-        print(f"Defense increased to {self.defense} for next attack!")
+        """Shield Block - reduce incoming damage until the warrior's next turn."""
+        self.add_buff(Buff("Shield Block", defense=20, turns=1))
+        self.events.emit("shield_block", name=self.name, defense=self.defense)
 
     def berserker_rage(self, target: 'Character'):
         """Powerful attack that costs health."""
-        print(f"\n💢 {self.name} enters Berserker Rage!")
+        self.events.emit("berserker_rage", name=self.name)
         damage = self.attack_power * 2
         self.health -= 10  # Cost
-        print(f"{self.name} sacrifices 10 HP for a devastating blow!")
         target.take_damage(damage)
 
 
@@ -269,11 +788,11 @@ class Mage(Character):
         """Cast Fireball - powerful magic attack."""
         mana_cost = 30
         if self.mana < mana_cost:
-            print(f"{self.name} doesn't have enough mana!")
+            self.events.emit("no_mana", name=self.name)
             return
 
         self.mana -= mana_cost
-        print(f"\n🔥 {self.name} casts Fireball! (Mana: {self.mana}/{self.max_mana})")
+        self.events.emit("fireball", name=self.name, mana=self.mana, max_mana=self.max_mana)
         damage = self.attack_power + 20
         target.take_damage(damage)
 
@@ -281,7 +800,7 @@ class Mage(Character):
         """Cast healing spell."""
         mana_cost = 25
         if self.mana < mana_cost:
-            print(f"{self.name} doesn't have enough mana!")
+            self.events.emit("no_mana", name=self.name)
             return
 
         self.mana -= mana_cost
@@ -292,6 +811,8 @@ class Mage(Character):
 class Archer(Character):
     """Archer class - medium health, medium attack, high speed."""
 
+    speed = 14
+
     def __init__(self, name: str):
         super().__init__(name, health=100, attack_power=30, defense=8)
         self.arrows = 20
@@ -299,102 +820,207 @@ class Archer(Character):
     def special_ability(self, target: 'Character'):
         """Rapid Fire - multiple quick attacks."""
         if self.arrows < 3:
-            print(f"{self.name} doesn't have enough arrows!")
+            self.events.emit("no_arrows", name=self.name)
             return
 
         self.arrows -= 3
-        print(f"\n🏹 {self.name} uses Rapid Fire! (Arrows: {self.arrows})")
+        self.events.emit("rapid_fire", name=self.name, arrows=self.arrows)
 
         for i in range(3):
             if target.is_alive():
                 damage = self.attack_power // 2
-                print(f"  Arrow {i+1}:")
+                self.events.emit("arrow", number=i + 1)
                 target.take_damage(damage)
 
     def critical_shot(self, target: 'Character'):
         """Chance for critical hit."""
         if self.arrows < 1:
-            print(f"{self.name} is out of arrows!")
+            self.events.emit("out_of_arrows", name=self.name)
             return
 
         self.arrows -= 1
-        print(f"\n🎯 {self.name} aims for a Critical Shot!")
+        self.events.emit("aim", name=self.name)
 
-        if random.random() < 0.6:  # 60% chance
+        if self.rng.random() < 0.6:  # 60% chance
             damage = self.attack_power * 2
-            print("💥 CRITICAL HIT!")
+            self.events.emit("critical_hit")
             target.take_damage(damage)
         else:
-            print("❌ Missed!")
+            self.events.emit("missed")
 
 
 class Enemy(Character):
     """Enemy character."""
 
-    def __init__(self, name: str, health: int, attack: int, defense: int, xp_reward: int):
+    def __init__(self, name: str, health: int, attack: int, defense: int, xp_reward: int,
+                 speed: int = 10, loot_table: Optional[LootTable] = None):
         super().__init__(name, health, attack, defense)
         self.xp_reward = xp_reward
+        self.speed = speed
+        self.loot_table = loot_table
+
+    def drop_loot(self) -> Loot:
+        """Roll the enemy's loot table; without one it drops 10-50 gold."""
+        if self.loot_table is None:
+            return Loot(self.rng.randint(10, 50), [])
+        return self.loot_table.roll(self.rng)
 
     def special_ability(self, target: 'Character'):
         """Enemy special attack."""
-        print(f"\n👹 {self.name} uses a special attack!")
+        self.events.emit("enemy_special", name=self.name)
         damage = self.attack_power * 1.5
         target.take_damage(int(damage))
 
 
-class Battle:
-    """Manages combat between characters."""
+@contextmanager
+def lend(combatants: Iterable[Character], rng: random.Random, events: Optional[EventSink] = None):
+    """
+    Make combatants use a fight's RNG (and event sink, if given) for the
+    duration of the with-block, then restore their own and clear the
+    buffs gained in the fight.
+    """
+    lent = {"rng": rng}
+    if events is not None:
+        lent["events"] = events
+
+    combatants = list(combatants)
+    own = [{attr: vars(c).get(attr) for attr in lent} for c in combatants]
+    for combatant in combatants:
+        for attr, value in lent.items():
+            setattr(combatant, attr, value)
+    try:
+        yield
+    finally:
+        for combatant, saved in zip(combatants, own):
+            combatant.clear_buffs()
+            for attr, value in saved.items():
+                if value is None:
+                    delattr(combatant, attr)  # back to the class default
+                else:
+                    setattr(combatant, attr, value)
 
-    def __init__(self, hero: Character, enemy: Enemy):
+
+class Battle:
+    """
+    Manages combat between characters.
+
+    Each battle owns its random streams, derived from ``seed`` (a random
+    one is picked when omitted): one for the turn choices and one lent
+    to both combatants for everything else (critical shots, loot). The
+    choices made are recorded in ``actions`` (a potion name marks a hero
+    turn spent drinking it), so
+
+        Battle(hero, enemy, seed=old.seed, actions=old.actions).fight()
+
+    replays ``old`` exactly, starting from the same hero and enemy stats.
+    Scripted ``actions`` (True = special ability, hero and enemy turns
+    interleaved) replace the rolled choices until they run out, after
+    which the turns are rolled from the seed; a game server can instead
+    drive the turn steps (start, hero_turn, enemy_turn, finish) itself.
+    """
+
+    def __init__(self, hero: Character, enemy: Enemy, events: Optional[EventSink] = None,
+                 seed: Optional[int] = None, actions: Optional[Iterable[bool]] = None):
         self.hero = hero
         self.enemy = enemy
         self.turn = 1
+        # When set, both combatants report to this sink for the whole fight
+        self.events = events
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(split_seed(self.seed, "combat"))
+        self._choices = random.Random(split_seed(self.seed, "choices"))
+        self._script = iter(actions) if actions is not None else None
+        self.actions: List[bool] = []
 
     def execute_turn(self, attacker: Character, defender: Character, use_special: bool = False):
         """Execute one turn of combat."""
+        attacker.tick_buffs()
         if use_special:
             attacker.special_ability(defender)
         else:
             attacker.attack(defender)
 
+    def _choose_action(self, chance: float):
+        """Next turn choice: scripted while the script lasts, then rolled (special with ``chance``)."""
+        action = next(self._script, None) if self._script is not None else None
+        if action is None:
+            self._script = None
+            action = self._choices.random() < chance
+        self.actions.append(action)
+        return action
+
     def fight(self):
         """Execute full battle."""
-        print(f"\n{'='*60}")
-        print(f"⚔️  BATTLE START: {self.hero.name} vs {self.enemy.name}")
-        print(f"{'='*60}")
-
-        while self.hero.is_alive() and self.enemy.is_alive():
-            print(f"\n--- Turn {self.turn} ---")
-
-            # Hero's turn
-            print(f"\n{self.hero.name}'s turn:")
-            action = random.choice(['attack', 'special'])
-            self.execute_turn(self.hero, self.enemy, action == 'special')
-
-            if not self.enemy.is_alive():
-                break
-
-            # Enemy's turn
-            print(f"\n{self.enemy.name}'s turn:")
-            self.execute_turn(self.enemy, self.hero, random.random() < 0.3)
-
-            self.turn += 1
-
-        # Battle result
-        print(f"\n{'='*60}")
-        if self.hero.is_alive():
-            print(f"🎉 VICTORY! {self.hero.name} defeated {self.enemy.name}!")
-            self.hero.gain_experience(self.enemy.xp_reward)
-            print(f"Gained {self.enemy.xp_reward} XP!")
-
-            # Loot
-            loot_gold = random.randint(10, 50)
-            self.hero.inventory.gold += loot_gold
-            print(f"Found {loot_gold} gold!")
+        with lend((self.hero, self.enemy), self.rng, self.events):
+            self.start()
+            while not self.is_over():
+                self.hero_turn()
+                if not self.enemy.is_alive():
+                    break
+                self.enemy_turn()
+            self.finish()
+
+    # --- Turn steps (fight() runs these; a game server can drive them) ---
+
+    def start(self):
+        self.hero.events.emit("battle_start", hero=self.hero.name, enemy=self.enemy.name)
+
+    def is_over(self) -> bool:
+        return not (self.hero.is_alive() and self.enemy.is_alive())
+
+    def hero_turn(self, action=None):
+        """
+        The hero acts: True = special ability, False = attack, or the name
+        of a potion to drink. None picks the scripted or rolled choice.
+        """
+        hero = self.hero
+        if isinstance(action, str):
+            potion = hero.inventory.get_item(action)
+            if not isinstance(potion, Potion):
+                raise ValueError(f"{hero.name} has no {action} to use")
+
+        hero.events.emit("turn", turn=self.turn)
+        hero.events.emit("turn_of", name=hero.name)
+        if action is None:
+            action = self._choose_action(0.5)
+        else:
+            self.actions.append(action)
+
+        if isinstance(action, str):
+            hero.tick_buffs()
+            potion = hero.inventory.get_item(action)
+            potion.use(hero)
+            hero.inventory.remove_item(potion)
+        else:
+            self.execute_turn(hero, self.enemy, action)
+
+    def enemy_turn(self):
+        self.hero.events.emit("turn_of", name=self.enemy.name)
+        self.execute_turn(self.enemy, self.hero, self._choose_action(0.3))
+        self.turn += 1
+
+    def finish(self):
+        """Announce the result; a victorious hero gets XP and loot. Buffs end with the battle."""
+        hero, enemy, events = self.hero, self.enemy, self.hero.events
+        hero.clear_buffs()
+        enemy.clear_buffs()
+        if hero.is_alive():
+            events.emit("victory", hero=hero.name, enemy=enemy.name)
+            hero.gain_experience(enemy.xp_reward)
+            events.emit("xp_gained", xp=enemy.xp_reward)
+
+            loot = enemy.drop_loot()
+            hero.inventory.gold += loot.gold
+            events.emit("loot", gold=loot.gold)
+            for item in loot.items:
+                if hero.inventory.add_item(item):
+                    events.emit("loot_item", item=item.name)
+                else:
+                    events.emit("inventory_full", item=item.name)
         else:
-            print(f"💀 DEFEAT! {self.hero.name} was defeated by {self.enemy.name}...")
+            events.emit("defeat", hero=hero.name, enemy=enemy.name)
 
-        print(f"{'='*60}\n")
+        events.emit("battle_end")
 
 
 def demo_game_system():
@@ -0,0 +1,268 @@
+"""
+Combat Profiling Harness
+========================
+
+Shows where a fight's time and memory go, so the cost of the combat loop
+can be compared release to release:
+
+- Runs a number of seeded headless battles (the same fights every run)
+  with any event sink: NullSink, EventLog, or PrintSink into /dev/null
+- cProfile pass: calls, own time and total time per function
+- tracemalloc pass: peak traced memory, and blocks/bytes per function
+  still held when the battles end (event logs, buffs, loot, caches);
+  tracemalloc only sees live blocks, so short-lived temporaries show up
+  in the peak, not per function
+- Stack pass: own time per full call stack, written in the collapsed
+  format ("main;Battle.fight;Character.attack 1234") read by
+  flamegraph.pl, speedscope and inferno
+- Each pass runs the battles again, so one pass's overhead never skews
+  another's numbers
+
+Run: python projects/game_characters/profiling.py [battles] [stacks.txt]
+"""
+
+import ast
+import cProfile
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import redirect_stdout
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from main import (Archer, Battle, Enemy, EventLog, EventSink, Mage, NullSink, Potion, PrintSink,
+                  Warrior, Weapon, split_seed)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HERO_CLASSES = (Warrior, Mage, Archer)
+
+
+class FunctionTime(NamedTuple):
+    name: str
+    calls: int
+    own_seconds: float    # time in the function itself
+    total_seconds: float  # including everything it called
+
+
+class FunctionMemory(NamedTuple):
+    name: str
+    blocks: int
+    bytes: int
+
+
+def _battles(count: int, seed: int, events: Callable[[], EventSink]) -> List[Battle]:
+    """The same ``count`` fights for a given seed: each hero class, armed, with potions, vs. an orc."""
+    battles = []
+    for i in range(count):
+        hero = HERO_CLASSES[i % 3](f"Hero {i}")
+        hero.equip_weapon(Weapon("Iron Sword", 15, 50))
+        for _ in range(2):
+            hero.inventory.add_item(Potion("Health Potion", 50, 25))
+        enemy = Enemy("Orc Warrior", 100, 25, 10, 100)
+        battles.append(Battle(hero, enemy, events=events(), seed=split_seed(seed, i)))
+    return battles
+
+
+def _fight_all(battles: List[Battle]):
+    for battle in battles:
+        battle.fight()
+
+
+@lru_cache(maxsize=None)
+def _in_project(filename: str) -> bool:
+    return os.path.isfile(filename) and os.path.dirname(os.path.abspath(filename)) == HERE
+
+
+def _name(filename: str, qualname: str) -> str:
+    """Short label: project functions as Class.method, everything else as module:function."""
+    if _in_project(filename):
+        return qualname
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return f"{module}:{qualname}" if module else qualname
+
+
+class _FunctionIndex:
+    """Maps (file, line) to the qualified name of the innermost function around it."""
+
+    def __init__(self):
+        self._files: Dict[str, List[Tuple[int, int, str]]] = {}
+
+    def _spans(self, filename: str) -> List[Tuple[int, int, str]]:
+        spans = self._files.get(filename)
+        if spans is None:
+            spans = []
+            try:
+                with open(filename, encoding="utf-8") as f:
+                    tree = ast.parse(f.read())
+            except (OSError, SyntaxError, UnicodeDecodeError):
+                tree = None
+
+            def visit(node, prefix):
+                for child in ast.iter_child_nodes(node):
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        qualname = prefix + child.name
+                        if not isinstance(child, ast.ClassDef):
+                            # code objects of decorated functions start at the first decorator
+                            start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                            spans.append((start, child.end_lineno, qualname))
+                        visit(child, qualname + ".")
+
+            if tree is not None:
+                visit(tree, "")
+            self._files[filename] = spans
+        return spans
+
+    def name(self, filename: str, lineno: int) -> str:
+        inside = [(start, qualname) for start, end, qualname in self._spans(filename)
+                  if start <= lineno <= end]
+        qualname = max(inside)[1] if inside else "<module>"
+        return _name(filename, qualname)
+
+
+class _StackRecorder:
+    """sys.setprofile hook adding up own time per call stack."""
+
+    def __init__(self):
+        self.stack: List[str] = []
+        self.times: Counter = Counter()  # stack tuple -> nanoseconds
+        self._last = 0
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if self.stack:
+            self.times[tuple(self.stack)] += now - self._last
+        if event == "call":
+            code = frame.f_code
+            self.stack.append(_name(code.co_filename, getattr(code, "co_qualname", code.co_name)))
+        elif event == "c_call":
+            self.stack.append(f"builtins:{getattr(arg, '__qualname__', arg.__name__)}")
+        elif event in ("return", "c_return", "c_exception") and self.stack:
+            self.stack.pop()
+        self._last = time.perf_counter_ns()
+
+
+class ProfileReport:
+    """Everything one profile() run measured."""
+
+    def __init__(self, battles: int, seconds: float, functions: List[FunctionTime],
+                 memory: List[FunctionMemory], peak_bytes: int, stacks: Counter):
+        self.battles = battles
+        self.seconds = seconds        # unprofiled wall time for all battles
+        self.functions = functions    # by own time, largest first
+        self.memory = memory          # by bytes, largest first
+        self.peak_bytes = peak_bytes
+        self.stacks = stacks          # stack tuple -> own nanoseconds
+
+    def collapsed_stacks(self) -> List[str]:
+        """Flame graph input: "frame;frame;frame microseconds" per line."""
+        return [f"{';'.join(stack)} {ns // 1000}" for stack, ns in sorted(self.stacks.items())
+                if ns >= 1000]
+
+    def write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+    def print_summary(self, top: int = 15):
+        print(f"\n{self.battles:,} battles in {self.seconds:.3f}s "
+              f"({self.battles / self.seconds:,.0f} battles/s unprofiled)")
+
+        total_own = sum(f.own_seconds for f in self.functions) or 1.0
+        print(f"\n{'function':<42} {'calls':>9} {'own s':>8} {'own %':>6} {'total s':>8}")
+        for f in self.functions[:top]:
+            print(f"{f.name[:42]:<42} {f.calls:>9,} {f.own_seconds:>8.3f} "
+                  f"{f.own_seconds / total_own:>6.1%} {f.total_seconds:>8.3f}")
+
+        print(f"\nPeak traced memory: {self.peak_bytes / 1024:,.1f} KB; held at the end by:")
+        print(f"{'function':<42} {'blocks':>9} {'KB':>8}")
+        for m in self.memory[:top]:
+            print(f"{m.name[:42]:<42} {m.blocks:>9,} {m.bytes / 1024:>8.1f}")
+
+
+def profile(battles: int = 1_000, events: Callable[[], EventSink] = NullSink, seed: int = 0,
+            frames: int = 10) -> ProfileReport:
+    """
+    Profile ``battles`` seeded fights with a fresh sink from ``events`` per battle.
+
+    PrintSink output goes to /dev/null, so printing is measured without
+    flooding the terminal. ``frames`` is the tracemalloc traceback depth
+    used to find the project function behind an allocation.
+    """
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        fights = _battles(battles, seed, events)
+        start = time.perf_counter()
+        _fight_all(fights)
+        seconds = time.perf_counter() - start
+
+        profiler = cProfile.Profile()
+        fights = _battles(battles, seed, events)
+        profiler.runcall(_fight_all, fights)
+
+        fights = _battles(battles, seed, events)
+        tracemalloc.start(frames)
+        try:
+            _fight_all(fights)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        recorder = _StackRecorder()
+        fights = _battles(battles, seed, events)
+        sys.setprofile(recorder)
+        try:
+            _fight_all(fights)
+        finally:
+            sys.setprofile(None)
+
+    index = _FunctionIndex()
+    functions = []
+    for (filename, lineno, funcname), (_, calls, own, total, _) in pstats.Stats(profiler).stats.items():
+        if funcname == "<method 'disable' of '_lsprof.Profiler' objects>":
+            continue
+        if filename == "~" or not os.path.isfile(filename):  # builtins, generated code
+            name = funcname
+        else:
+            # cProfile keys carry the bare function name; the def line gives Class.method
+            name = index.name(filename, lineno)
+            if funcname.startswith("<"):  # comprehensions: named after the enclosing function
+                name += f".{funcname}"
+        functions.append(FunctionTime(name, calls, own, total))
+    functions.sort(key=lambda f: f.own_seconds, reverse=True)
+
+    held: Dict[str, List[int]] = {}
+    for trace in snapshot.traces:
+        # Charge each block to the innermost project frame that led to it
+        frame = next((f for f in reversed(trace.traceback) if _in_project(f.filename)),
+                     trace.traceback[-1])
+        totals = held.setdefault(index.name(frame.filename, frame.lineno), [0, 0])
+        totals[0] += 1
+        totals[1] += trace.size
+    memory = sorted((FunctionMemory(name, blocks, size) for name, (blocks, size) in held.items()),
+                    key=lambda m: m.bytes, reverse=True)
+
+    return ProfileReport(battles, seconds, functions, memory, peak, recorder.times)
+
+
+def demo_profiling(battles: int = 1_000, stacks_path: Optional[str] = None):
+    """Where a fight's time goes with each event sink."""
+    print("="*70)
+    print("COMBAT PROFILING DEMO")
+    print("="*70)
+
+    for label, events in (("NullSink", NullSink), ("EventLog", EventLog), ("PrintSink", PrintSink)):
+        print(f"\n--- {label} ---")
+        report = profile(battles, events)
+        report.print_summary(top=8)
+
+    if stacks_path:
+        report.write_collapsed(stacks_path)
+        print(f"\nCollapsed stacks ({label}) written to {stacks_path}; "
+              f"render with: flamegraph.pl {stacks_path} > combat.svg")
+
+
+if __name__ == "__main__":
+    demo_profiling(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+                   sys.argv[2] if len(sys.argv) > 2 else None)
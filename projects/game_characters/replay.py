@@ -0,0 +1,87 @@
+"""
+Combat Event Replay
+===================
+
+Renders recorded combat events back to the text the game would have
+printed:
+
+- Record a fight with an EventLog sink instead of printing it
+- Save the log as JSON lines (one event per line) and load it back
+- Render a saved log to text at any time, e.g. for a fight report
+- Re-run a fight from its seed and action log; with the same starting
+  characters it produces exactly the same events
+
+Run: python projects/game_characters/replay.py [events.jsonl]
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import Iterable, Iterator, Optional, Tuple
+
+from main import Battle, Character, Enemy, EventLog, EventSink, Warrior, render_event
+
+
+def save_log(log: EventLog, path: str):
+    """Write one JSON object per event: {"kind": ..., **fields}."""
+    with open(path, "w", encoding="utf-8") as f:
+        for kind, fields in log.events:
+            f.write(json.dumps({"kind": kind, **fields}, ensure_ascii=False) + "\n")
+
+
+def load_log(path: str) -> EventLog:
+    """Read a log written by save_log()."""
+    log = EventLog()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                fields = json.loads(line)
+                log.emit(fields.pop("kind"), **fields)
+    return log
+
+
+def render(events: Iterable[Tuple[str, dict]]) -> Iterator[str]:
+    """Text for each (kind, fields) event."""
+    for kind, fields in events:
+        yield render_event(kind, fields)
+
+
+def replay_fight(hero: Character, enemy: Enemy, seed: int, actions: list,
+                 events: Optional[EventSink] = None) -> Battle:
+    """Fight again with the recorded seed and turn choices."""
+    battle = Battle(hero, enemy, events=events, seed=seed, actions=actions)
+    battle.fight()
+    return battle
+
+
+def demo_replay():
+    """Fight silently into a log, save it, then replay it as text."""
+    print("="*70)
+    print("COMBAT EVENT REPLAY DEMO")
+    print("="*70)
+
+    log = EventLog()
+    battle = Battle(Warrior("Conan the Brave"), Enemy("Goblin Scout", 50, 15, 5, 50), events=log)
+    battle.fight()
+    print(f"Recorded {len(log)} events without printing (seed {battle.seed}, "
+          f"{len(battle.actions)} turn choices)")
+
+    again = EventLog()
+    replay_fight(Warrior("Conan the Brave"), Enemy("Goblin Scout", 50, 15, 5, 50),
+                 battle.seed, battle.actions, events=again)
+    print(f"Replayed from seed and actions: identical = {again.events == log.events}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "battle.jsonl")
+        save_log(log, path)
+        for text in render(load_log(path).events):
+            print(text)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for text in render(load_log(sys.argv[1]).events):
+            print(text)
+    else:
+        demo_replay()
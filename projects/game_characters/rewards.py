@@ -0,0 +1,99 @@
+"""
+Bulk Rewards
+============
+
+Hands out XP, gold and loot to a whole raid or server at once:
+
+- XP, levels and gold of every character are gathered into NumPy
+  arrays, the new levels come from one searchsorted() over XP_TABLE
+  (continued past its end, since levels are uncapped), and the results
+  are written back in a single pass
+- Only characters that actually level up go through level_up(), once,
+  with the number of levels gained
+- An optional LootTable is rolled once per character; its gold joins
+  the gold grant and its items go into the character's inventory
+  (left behind, with an inventory_full event, when there is no room)
+- For characters held in an EntityStore, EntityStore.grant_experience()
+  does the same without touching any Python objects
+
+Requires numpy: pip install numpy
+
+Run: python projects/game_characters/rewards.py
+"""
+
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+from main import (XP_PER_LEVEL, XP_TABLE, Archer, Character, GoldDrop, ItemType, LootTable, Mage,
+                  Warrior, item_registry)
+
+_XP_TABLE = np.array(XP_TABLE, dtype=np.int64)
+
+
+def levels_for_experience(experience: np.ndarray) -> np.ndarray:
+    """main.level_for_experience for a whole array: XP_TABLE, then XP_PER_LEVEL a level (no cap)."""
+    past_table = len(XP_TABLE) + (experience - XP_TABLE[-1]) // XP_PER_LEVEL
+    return np.where(experience < XP_TABLE[-1],
+                    np.searchsorted(_XP_TABLE, experience, side="right"), past_table)
+
+
+def grant_rewards(characters: Sequence[Character], xp=0, gold=0, loot: Optional[LootTable] = None,
+                  rng=None) -> np.ndarray:
+    """
+    Give every character XP and gold (each a single value or one per
+    character), plus one roll of ``loot`` if given, made with ``rng`` or
+    else the character's own RNG. Returns the number of levels each
+    character gained.
+    """
+    count = len(characters)
+    experience = np.fromiter((c.experience for c in characters), dtype=np.int64, count=count)
+    levels = np.fromiter((c.level for c in characters), dtype=np.int64, count=count)
+    experience += np.asarray(xp, dtype=np.int64)
+    gained = np.maximum(levels_for_experience(experience) - levels, 0)
+    gold = np.broadcast_to(np.asarray(gold, dtype=np.int64), (count,))
+
+    for character, total, levels_gained, coins in zip(characters, experience.tolist(),
+                                                      gained.tolist(), gold.tolist()):
+        character.experience = total
+        character.inventory.gold += coins
+        if loot is not None:
+            _grant_loot(character, loot, rng if rng is not None else character.rng)
+        if levels_gained:
+            character.level_up(levels_gained)
+    return gained
+
+
+def _grant_loot(character: Character, loot: LootTable, rng):
+    """One roll of the table into the character's purse and inventory, as Battle.finish does."""
+    rolled = loot.roll(rng)
+    character.inventory.gold += rolled.gold
+    for item in rolled.items:
+        if character.inventory.add_item(item):
+            character.events.emit("loot_item", item=item.name)
+        else:
+            character.events.emit("inventory_full", item=item.name)
+
+
+def demo_rewards():
+    """Raid rewards for a small party."""
+    print("="*70)
+    print("BULK REWARDS DEMO")
+    print("="*70)
+
+    potion = item_registry.template(ItemType.POTION, "Health Potion", 25, 50)
+    gem = item_registry.template(ItemType.MISC, "Ruby", 200)
+    raid_chest = LootTable([(potion, 70), (gem, 30)], rolls=2, guaranteed=[GoldDrop(10, 30)])
+
+    party = [Warrior("Conan the Brave"), Mage("Gandalf the Wise"), Archer("Legolas the Swift")]
+    gained = grant_rewards(party, xp=[250, 1_000, 5_000], gold=120, loot=raid_chest, rng=random.Random(1))
+    print()
+    for character, levels in zip(party, gained):
+        items = ", ".join(item.name for item in character.inventory.items)
+        print(f"  {character.name:<18} +{levels} level(s) -> level {character.level}, "
+              f"XP {character.experience}, gold {character.inventory.gold}, items: {items}")
+
+
+if __name__ == "__main__":
+    demo_rewards()
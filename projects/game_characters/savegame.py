@@ -0,0 +1,273 @@
+"""
+Binary Save Games
+=================
+
+Saves characters (stats, class state, buffs, equipment and inventory)
+in a compact binary format built with struct:
+
+- Item templates are written once in a table and every item refers to
+  its template by index, so a thousand "Iron Sword"s cost one name
+- A SaveWriter remembers what it has saved: a delta save holds only
+  characters whose record changed since the last snapshot (plus
+  removals) and only templates the reader hasn't seen yet
+- A SaveReader loads a full save and then applies deltas in order;
+  loaded items share templates with the running game's item_registry
+- An Enemy's loot_table is not saved: loot tables are game data shared
+  by every enemy of a kind, not per-character state, so a loaded Enemy
+  has none (and drops 10-50 gold) until the game assigns it again
+
+File layout (little-endian):
+
+    header     b"RPGS", version u8, kind u8 (0 = full, 1 = delta)
+    templates  first index u32, count u32, then per template:
+               type u8, value i32, power i32, name
+    characters count u32, then per character: key, record length u32, record
+    removed    count u32, then keys
+
+Strings are a u16 byte length followed by UTF-8.
+
+Run: python projects/game_characters/savegame.py
+"""
+
+import hashlib
+import struct
+from typing import Dict, List, Mapping, Tuple
+
+from main import (ITEM_CLASSES, Archer, Buff, Character, Enemy, Item, ItemTemplate, ItemType, Mage,
+                  Potion, Warrior, Weapon, item_registry)
+
+MAGIC = b"RPGS"
+VERSION = 2  # 2: level u32 and experience i64
+FULL, DELTA = 0, 1
+
+_CLASS_CODES = {Warrior: 0, Mage: 1, Archer: 2, Enemy: 3}
+_CLASSES = {code: cls for cls, code in _CLASS_CODES.items()}
+_TYPE_CODES = {item_type: i for i, item_type in enumerate(ItemType)}
+_TYPES = list(ItemType)
+
+_HEADER = struct.Struct("<4sBB")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_TEMPLATE = struct.Struct("<Bii")
+# class, health, max_health, base_attack, base_defense, level, experience, gold, max_slots,
+# two class-specific fields (rage | mana, max_mana | arrows | xp_reward, speed)
+_STATS = struct.Struct("<BiiiiIqiHii")
+_ITEM = struct.Struct("<Iii")  # template index, durability, enchantment
+_BUFF = struct.Struct("<iiH")
+_COUNTS = struct.Struct("<HIB")  # has weapon/armor bits, inventory items, buffs
+
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return _U16.pack(len(data)) + data
+
+
+def _unpack_str(data: bytes, pos: int) -> Tuple[str, int]:
+    (length,) = _U16.unpack_from(data, pos)
+    pos += 2
+    return data[pos:pos + length].decode("utf-8"), pos + length
+
+
+def _class_fields(character: Character) -> Tuple[int, int]:
+    if isinstance(character, Mage):
+        return character.mana, character.max_mana
+    if isinstance(character, Archer):
+        return character.arrows, 0
+    if isinstance(character, Warrior):
+        return character.rage, 0
+    if isinstance(character, Enemy):
+        return character.xp_reward, character.speed
+    return 0, 0
+
+
+class SaveWriter:
+    """Writes full and delta saves, remembering what earlier saves contained."""
+
+    def __init__(self):
+        self._template_ids: Dict[ItemTemplate, int] = {}
+        self._written_templates = 0  # templates already in an earlier file
+        self._digests: Dict[str, bytes] = {}
+
+    def _template_id(self, template: ItemTemplate) -> int:
+        index = self._template_ids.get(template)
+        if index is None:
+            index = self._template_ids[template] = len(self._template_ids)
+        return index
+
+    def _item(self, item: Item) -> bytes:
+        return _ITEM.pack(self._template_id(item.template), item.durability, item.enchantment)
+
+    def encode_character(self, character: Character) -> bytes:
+        """The binary record for one character."""
+        extra_a, extra_b = _class_fields(character)
+        inventory = character.inventory
+        parts = [
+            _STATS.pack(_CLASS_CODES[type(character)], character.health, character.max_health,
+                        character.base_attack, character.base_defense, character.level,
+                        character.experience, inventory.gold, inventory.max_slots, extra_a, extra_b),
+            _pack_str(character.name),
+        ]
+        weapon, armor = character.equipped_weapon, character.equipped_armor
+        items = inventory.items
+        parts.append(_COUNTS.pack((weapon is not None) | (armor is not None) << 1, len(items),
+                                  len(character.buffs)))
+        if weapon is not None:
+            parts.append(self._item(weapon))
+        if armor is not None:
+            parts.append(self._item(armor))
+        parts.extend(self._item(item) for item in items)
+        for buff in character.buffs:
+            parts.append(_BUFF.pack(buff.attack, buff.defense, buff.turns))
+            parts.append(_pack_str(buff.name))
+        return b"".join(parts)
+
+    def save(self, characters: Mapping[str, Character], delta: bool = False) -> bytes:
+        """
+        Save characters keyed by a stable id (e.g. the player id).
+
+        A delta holds only characters that are new or whose record changed
+        since the previous save, plus the keys of characters that are gone.
+        """
+        records = []
+        digests: Dict[str, bytes] = {}
+        for key, character in characters.items():
+            record = self.encode_character(character)
+            digest = hashlib.blake2b(record, digest_size=16).digest()
+            digests[key] = digest
+            if not delta or self._digests.get(key) != digest:
+                records.append(_pack_str(key) + _U32.pack(len(record)) + record)
+        removed = [key for key in self._digests if key not in digests] if delta else []
+
+        first = self._written_templates if delta else 0
+        templates = list(self._template_ids)[first:]
+        parts = [_HEADER.pack(MAGIC, VERSION, DELTA if delta else FULL),
+                 _U32.pack(first), _U32.pack(len(templates))]
+        for template in templates:
+            parts.append(_TEMPLATE.pack(_TYPE_CODES[template.item_type], template.value, template.power))
+            parts.append(_pack_str(template.name))
+        parts.append(_U32.pack(len(records)))
+        parts.extend(records)
+        parts.append(_U32.pack(len(removed)))
+        parts.extend(_pack_str(key) for key in removed)
+
+        self._digests = digests
+        self._written_templates = len(self._template_ids)
+        return b"".join(parts)
+
+
+class SaveReader:
+    """Loads a full save, then deltas on top of it."""
+
+    def __init__(self):
+        self.templates: List[ItemTemplate] = []
+        self.characters: Dict[str, Character] = {}
+
+    def _item(self, data: bytes, pos: int) -> Tuple[Item, int]:
+        template_id, durability, enchantment = _ITEM.unpack_from(data, pos)
+        template = self.templates[template_id]
+        item = ITEM_CLASSES[template.item_type].from_template(template, durability, enchantment)
+        return item, pos + _ITEM.size
+
+    def decode_character(self, data: bytes, pos: int = 0) -> Tuple[Character, int]:
+        (code, health, max_health, base_attack, base_defense, level, experience, gold, max_slots,
+         extra_a, extra_b) = _STATS.unpack_from(data, pos)
+        name, pos = _unpack_str(data, pos + _STATS.size)
+
+        cls = _CLASSES[code]
+        if cls is Enemy:
+            # loot_table isn't in the save (see the module docstring)
+            character = Enemy(name, max_health, base_attack, base_defense, extra_a, extra_b)
+        else:
+            character = cls(name)
+            if cls is Mage:
+                character.mana, character.max_mana = extra_a, extra_b
+            elif cls is Archer:
+                character.arrows = extra_a
+            else:
+                character.rage = extra_a
+        character.health, character.max_health = health, max_health
+        character.base_attack, character.base_defense = base_attack, base_defense
+        character.level, character.experience = level, experience
+        character.inventory.gold, character.inventory.max_slots = gold, max_slots
+
+        equipped, item_count, buff_count = _COUNTS.unpack_from(data, pos)
+        pos += _COUNTS.size
+        if equipped & 1:
+            character.equipped_weapon, pos = self._item(data, pos)
+        if equipped & 2:
+            character.equipped_armor, pos = self._item(data, pos)
+        for _ in range(item_count):
+            item, pos = self._item(data, pos)
+            character.inventory.add_item(item)
+        for _ in range(buff_count):
+            attack, defense, turns = _BUFF.unpack_from(data, pos)
+            buff_name, pos = _unpack_str(data, pos + _BUFF.size)
+            character.buffs.append(Buff(buff_name, attack, defense, turns))
+        character.invalidate_stats()
+        return character, pos
+
+    def load(self, data: bytes) -> Dict[str, Character]:
+        """Apply a full or delta save and return the current characters."""
+        magic, version, kind = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a save file this version can read")
+        pos = _HEADER.size
+
+        first, count = _U32.unpack_from(data, pos)[0], _U32.unpack_from(data, pos + 4)[0]
+        pos += 8
+        if kind == FULL:
+            self.templates, self.characters = [], {}
+        if first != len(self.templates):
+            raise ValueError("delta does not follow the last save loaded")
+        for _ in range(count):
+            type_code, value, power = _TEMPLATE.unpack_from(data, pos)
+            name, pos = _unpack_str(data, pos + _TEMPLATE.size)
+            self.templates.append(item_registry.template(_TYPES[type_code], name, value, power))
+
+        (count,) = _U32.unpack_from(data, pos)
+        pos += 4
+        for _ in range(count):
+            key, pos = _unpack_str(data, pos)
+            pos += 4  # record length, for readers that skip records
+            self.characters[key], pos = self.decode_character(data, pos)
+
+        (count,) = _U32.unpack_from(data, pos)
+        pos += 4
+        for _ in range(count):
+            key, pos = _unpack_str(data, pos)
+            self.characters.pop(key, None)
+        return self.characters
+
+
+def demo_savegame():
+    """Save a party, change one hero, then save and load a delta."""
+    print("="*70)
+    print("BINARY SAVE GAME DEMO")
+    print("="*70)
+
+    conan, gandalf = Warrior("Conan the Brave"), Mage("Gandalf the Wise")
+    conan.equip_weapon(Weapon("Iron Sword", 15, 50))
+    for hero in (conan, gandalf):
+        for _ in range(3):
+            hero.inventory.add_item(Potion("Health Potion", 50, 25))
+    party = {"player-1": conan, "player-2": gandalf}
+
+    writer, reader = SaveWriter(), SaveReader()
+    full = writer.save(party)
+    print(f"\nFull save: {len(full)} bytes")
+
+    conan.gain_experience(120)
+    delta = writer.save(party, delta=True)
+    print(f"Delta after Conan levelled up: {len(delta)} bytes")
+
+    reader.load(full)
+    loaded = reader.load(delta)
+    for key, hero in loaded.items():
+        print(f"  {key}: {hero.name} level {hero.level}, HP {hero.health}/{hero.max_health}, "
+              f"ATK {hero.attack_power}, {len(hero.inventory)} items")
+    print(f"Potions share one template: "
+          f"{loaded['player-1'].inventory.get_item('Health Potion').template is conan.inventory.items[0].template}")
+
+
+if __name__ == "__main__":
+    demo_savegame()
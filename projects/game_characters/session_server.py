@@ -0,0 +1,315 @@
+"""
+Asyncio Game Session Server
+===========================
+
+Hosts many battles at once in a single process:
+
+- Clients connect over a local TCP socket and talk newline-delimited
+  JSON; one connection can carry any number of sessions
+- Each session is one Battle, advanced by its own coroutine: the server
+  sends the state, waits for the player's action (attack, special or a
+  potion name) and then plays the enemy's turn
+- A player who doesn't answer within the turn timeout attacks by default
+- Battles run silently (NullSink) unless an event sink factory is given
+
+Messages (client -> server):
+    {"op": "start", "session": 1, "hero": "Warrior", "name": "Conan",
+     "enemy": ["Goblin Scout", 50, 15, 5, 50], "potions": 2, "seed": 7}
+    {"op": "act", "session": 1, "action": "attack" | "special" | "<potion name>"}
+
+Messages (server -> client):
+    {"session": 1, "type": "turn", "turn": 3, "hero_health": 90, "enemy_health": 20}
+    {"session": 1, "type": "end", "victory": true, "turns": 4, "timeouts": 0}
+    {"session": 1, "type": "error", "message": "..."}
+    (a start with wrong-typed fields or the id of a running session gets
+    an error and starts nothing)
+    (a line that isn't a JSON object gets an error with "session": null;
+    the connection stays open)
+
+Run: python projects/game_characters/session_server.py
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from main import Archer, Battle, Enemy, EventLog, EventSink, Mage, NullSink, Potion, Warrior, lend
+
+HERO_CLASSES = {"Warrior": Warrior, "Mage": Mage, "Archer": Archer}
+POTION = ("Health Potion", 50, 25)
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_start(message: dict):
+    """Reject start fields of the wrong type before they reach the Battle."""
+    enemy = message["enemy"]
+    if not (isinstance(enemy, list) and len(enemy) in (5, 6) and isinstance(enemy[0], str)
+            and all(_is_int(stat) for stat in enemy[1:])):
+        raise TypeError("enemy must be [name, health, attack, defense, xp_reward(, speed)] with integer stats")
+    if not isinstance(message.get("name", "Hero"), str):
+        raise TypeError("name must be a string")
+    potions = message.get("potions", 0)
+    if not _is_int(potions) or potions < 0:
+        raise ValueError("potions must be a non-negative integer")
+    seed = message.get("seed")
+    if seed is not None and not _is_int(seed):
+        raise TypeError("seed must be an integer")
+
+
+def _expire(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class GameSession:
+    """One player's battle, driven by messages from the client."""
+
+    def __init__(self, session_id, battle: Battle, send: Callable[[dict], None], turn_timeout: float):
+        self.session_id = session_id
+        self.battle = battle
+        self.send = send
+        self.turn_timeout = turn_timeout
+        self.timeouts = 0
+        self._pending: deque = deque()  # actions that arrived before they were asked for
+        self._waiter: Optional[asyncio.Future] = None
+
+    def deliver(self, message: dict):
+        """Hand over an action message from the client."""
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(message)
+        else:
+            self._pending.append(message)
+
+    def _reply(self, kind: str, **fields):
+        self.send({"session": self.session_id, "type": kind, **fields})
+
+    async def _next_action(self):
+        """The player's next valid action, or an attack once the turn times out."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.turn_timeout
+        while True:
+            if self._pending:
+                message = self._pending.popleft()
+            else:
+                # A plain future and timer: cheaper than wait_for, which wraps
+                # every wait in a new task
+                self._waiter = waiter = loop.create_future()
+                timer = loop.call_at(deadline, _expire, waiter)
+                try:
+                    message = await waiter
+                finally:
+                    timer.cancel()
+                    self._waiter = None
+                if message is None:
+                    self.timeouts += 1
+                    return False
+
+            action = message.get("action")
+            if action in ("attack", "special"):
+                return action == "special"
+            if isinstance(action, str) and isinstance(self.battle.hero.inventory.get_item(action), Potion):
+                return action
+            self._reply("error", message=f"unknown action {action!r}")
+
+    async def run(self):
+        battle = self.battle
+        with lend((battle.hero, battle.enemy), battle.rng, battle.events):
+            battle.start()
+            while not battle.is_over():
+                self._reply("turn", turn=battle.turn, hero_health=battle.hero.health,
+                            enemy_health=battle.enemy.health)
+                battle.hero_turn(await self._next_action())
+                if battle.enemy.is_alive():
+                    battle.enemy_turn()
+            battle.finish()
+        self._reply("end", victory=battle.hero.is_alive(), turns=battle.turn, timeouts=self.timeouts)
+
+
+class SessionServer:
+    """Accepts connections and runs a GameSession per started battle."""
+
+    def __init__(self, turn_timeout: float = 30.0, events: Callable[[], EventSink] = NullSink):
+        self.turn_timeout = turn_timeout
+        self.events = events
+        self.active_sessions = 0
+        self.completed_sessions = 0
+        self.turn_timeouts = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Start listening; returns the bound address (port 0 picks a free one)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _new_session(self, message: dict, send) -> GameSession:
+        """Build a session from a start message; raises TypeError/ValueError on bad fields."""
+        _check_start(message)
+        hero = HERO_CLASSES[message.get("hero", "Warrior")](message.get("name", "Hero"))
+        for _ in range(message.get("potions", 0)):
+            hero.inventory.add_item(Potion(*POTION))
+        enemy = Enemy(*message["enemy"])
+        battle = Battle(hero, enemy, events=self.events(), seed=message.get("seed"))
+        return GameSession(message["session"], battle, send, self.turn_timeout)
+
+    async def _run_session(self, session: GameSession, sessions: Dict):
+        self.active_sessions += 1
+        try:
+            await session.run()
+        except Exception as exc:  # the client would otherwise wait forever for an end
+            session._reply("error", message=f"session failed: {exc!r}")
+        finally:
+            self.active_sessions -= 1
+            self.completed_sessions += 1
+            self.turn_timeouts += session.timeouts
+            sessions.pop(session.session_id, None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sessions: Dict[object, GameSession] = {}
+        tasks: List[asyncio.Task] = []
+
+        def send(message: dict):
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode() + b"\n")
+
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError as exc:  # JSONDecodeError, or bytes that aren't UTF-8
+                    send({"session": None, "type": "error", "message": f"bad message: {exc}"})
+                    await writer.drain()
+                    continue
+                session_id = message.get("session") if isinstance(message, dict) else None
+                if not isinstance(message, dict) or isinstance(session_id, (list, dict)):
+                    send({"session": None, "type": "error",
+                          "message": "bad message: expected an object with a scalar session id"})
+                elif message.get("op") == "start" and session_id in sessions:
+                    send({"session": session_id, "type": "error", "message": "session already running"})
+                elif message.get("op") == "start":
+                    try:
+                        session = self._new_session(message, send)
+                    except (KeyError, TypeError, ValueError) as exc:
+                        send({"session": session_id, "type": "error", "message": f"bad start: {exc}"})
+                    else:
+                        sessions[session_id] = session
+                        tasks.append(asyncio.create_task(self._run_session(session, sessions)))
+                elif message.get("op") == "act" and session_id in sessions:
+                    sessions[session_id].deliver(message)
+                else:
+                    send({"session": session_id, "type": "error", "message": "unknown session or op"})
+                await writer.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+# --- Stand-in client ------------------------------------------------------
+
+async def run_client(host: str, port: int, sessions: range, potions: int = 1,
+                     answer: bool = True) -> List[float]:
+    """
+    Play ``sessions`` over one connection, answering every turn at once.
+
+    Returns the latency of each turn: time from sending an action (or the
+    start message) to receiving the server's next message for that session.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at: Dict[int, float] = {}
+    potions_left = dict.fromkeys(sessions, potions)
+    latencies: List[float] = []
+
+    for session_id in sessions:
+        sent_at[session_id] = time.perf_counter()
+        writer.write(json.dumps({"op": "start", "session": session_id, "hero": "Warrior",
+                                 "name": f"Player {session_id}", "enemy": ["Orc Warrior", 100, 25, 10, 100],
+                                 "potions": potions, "seed": session_id}).encode() + b"\n")
+    await writer.drain()
+
+    remaining = len(sessions)
+    while remaining:
+        message = json.loads(await reader.readline())
+        session_id = message["session"]
+        latencies.append(time.perf_counter() - sent_at[session_id])
+        if message["type"] == "end":
+            remaining -= 1
+        elif message["type"] in ("turn", "error") and answer:
+            if message["type"] == "turn" and potions_left[session_id] and message["hero_health"] < 60:
+                potions_left[session_id] -= 1
+                action = POTION[0]
+            else:
+                action = ("attack", "special")[(session_id + message.get("turn", 0)) % 2]
+            sent_at[session_id] = time.perf_counter()
+            writer.write(json.dumps({"op": "act", "session": session_id, "action": action}).encode() + b"\n")
+            await writer.drain()
+
+    writer.close()
+    await writer.wait_closed()
+    return latencies
+
+
+async def load_test(sessions: int = 10_000, connections: int = 100, turn_timeout: float = 30.0) -> dict:
+    """Run ``sessions`` simultaneous battles through a local server and time every turn."""
+    server = SessionServer(turn_timeout=turn_timeout)
+    host, port = await server.start()
+    per_connection = -(-sessions // connections)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_client(host, port, range(i, min(i + per_connection, sessions)))
+        for i in range(0, sessions, per_connection)))
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies = sorted(latency for client in results for latency in client)
+    return {
+        "sessions": server.completed_sessions,
+        "turns": len(latencies),
+        "seconds": elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "timeouts": server.turn_timeouts,
+    }
+
+
+def demo_session_server():
+    """Two players, one of whom walks away from the keyboard."""
+    print("="*70)
+    print("ASYNCIO GAME SESSION SERVER DEMO")
+    print("="*70)
+
+    async def demo():
+        logs = []
+
+        def recording_sink():
+            logs.append(EventLog())
+            return logs[-1]
+
+        server = SessionServer(turn_timeout=0.05, events=recording_sink)
+        host, port = await server.start()
+        print(f"Listening on {host}:{port}")
+
+        await asyncio.gather(run_client(host, port, range(1, 2)),
+                             run_client(host, port, range(2, 3), answer=False))
+        await server.close()
+
+        for log in logs:
+            print("\n".join(log.render()))
+        print(f"Completed sessions: {server.completed_sessions}, "
+              f"turns decided by timeout: {server.turn_timeouts}")
+
+    asyncio.run(demo())
+
+
+if __name__ == "__main__":
+    demo_session_server()
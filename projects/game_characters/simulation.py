@@ -0,0 +1,183 @@
+"""
+Vectorized Combat Simulation
+============================
+
+Runs many hero-vs-enemy fights at once for balancing. Instead of
+calling Battle.fight() per matchup, every fight's stats live in NumPy
+arrays and all fights advance one turn together:
+
+- Same rules as Battle.fight(): the hero attacks or uses its special
+  ability 50/50, the enemy uses its special 30% of the time, damage is
+  max(1, attack - defense), and a fight ends as soon as one side drops
+- Class specials are applied with masks (Warrior Shield Block for the
+  enemy's next attack, Mage Fireball with mana, Archer Rapid Fire with
+  arrows, Enemy special)
+- No printing and no Character objects are touched: stats are copied in
+
+Requires numpy: pip install numpy
+
+Run: python projects/game_characters/simulation.py
+"""
+
+from typing import List
+
+import numpy as np
+
+from main import Archer, Character, Enemy, Mage, Warrior
+
+WARRIOR, MAGE, ARCHER, ENEMY = 0, 1, 2, 3
+_CLASS_CODES = {Warrior: WARRIOR, Mage: MAGE, Archer: ARCHER, Enemy: ENEMY}
+
+
+class SimulationResult:
+    """Outcome of a batch of fights, one entry per fight."""
+
+    def __init__(self, hero_won: np.ndarray, turns: np.ndarray, hero_health: np.ndarray,
+                 xp_gained: np.ndarray):
+        self.hero_won = hero_won
+        self.turns = turns
+        self.hero_health = hero_health
+        self.xp_gained = xp_gained
+
+    def __len__(self):
+        return len(self.hero_won)
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.hero_won.mean()) if len(self) else 0.0
+
+    @property
+    def average_turns(self) -> float:
+        return float(self.turns.mean()) if len(self) else 0.0
+
+
+def _class_code(character: Character) -> int:
+    for cls, code in _CLASS_CODES.items():
+        if type(character) is cls:
+            return code
+    raise ValueError(f"No simulation rules for {type(character).__name__}")
+
+
+def _hit(health: np.ndarray, rows: np.ndarray, damage: np.ndarray, defense: np.ndarray):
+    """take_damage() for the given rows: minimum 1 damage, health floors at 0."""
+    health[rows] = np.maximum(0, health[rows] - np.maximum(1, damage - defense[rows]))
+
+
+class CombatSimulator:
+    """Lock-step, headless equivalent of Battle.fight() for many pairs."""
+
+    def __init__(self, seed=None):
+        # seed: None, an int or a numpy SeedSequence
+        self.rng = np.random.default_rng(seed)
+
+    def run_stats(self, hero_class: np.ndarray, hero_health: np.ndarray, hero_attack: np.ndarray,
+                  hero_defense: np.ndarray, mana: np.ndarray, arrows: np.ndarray,
+                  enemy_health: np.ndarray, enemy_attack: np.ndarray, enemy_defense: np.ndarray,
+                  xp_reward: np.ndarray, max_turns: int = 10_000) -> SimulationResult:
+        """Simulate fights given one array entry per fight (arrays are copied)."""
+        hero_health, hero_defense = hero_health.astype(np.int64), hero_defense.astype(np.int64)
+        mana, arrows = mana.astype(np.int64), arrows.astype(np.int64)
+        enemy_health = enemy_health.astype(np.int64)
+        hero_attack, enemy_attack = hero_attack.astype(np.int64), enemy_attack.astype(np.int64)
+        enemy_defense = enemy_defense.astype(np.int64)
+
+        fights = len(hero_class)
+        turns = np.ones(fights, dtype=np.int64)
+        shield = np.zeros(fights, dtype=np.int64)  # Shield Block bonus, lasts until the hero's next turn
+        active = np.arange(fights)
+
+        for _ in range(max_turns):
+            if active.size == 0:
+                break
+
+            # Hero's turn
+            special = self.rng.random(active.size) < 0.5
+            cls = hero_class[active]
+
+            attackers = active[~special]
+            _hit(enemy_health, attackers, hero_attack[attackers], enemy_defense)
+
+            shield[active] = 0
+            warriors = active[special & (cls == WARRIOR)]
+            shield[warriors] = 20
+
+            mages = active[special & (cls == MAGE)]
+            mages = mages[mana[mages] >= 30]
+            mana[mages] -= 30
+            _hit(enemy_health, mages, hero_attack[mages] + 20, enemy_defense)
+
+            archers = active[special & (cls == ARCHER)]
+            archers = archers[arrows[archers] >= 3]
+            arrows[archers] -= 3
+            # three arrows of attack // 2; arrows stop once the target drops,
+            # which is the same as subtracting three hits and flooring at 0
+            arrow_damage = np.maximum(1, hero_attack[archers] // 2 - enemy_defense[archers])
+            enemy_health[archers] = np.maximum(0, enemy_health[archers] - 3 * arrow_damage)
+
+            brutes = active[special & (cls == ENEMY)]
+            _hit(enemy_health, brutes, (hero_attack[brutes] * 1.5).astype(np.int64), enemy_defense)
+
+            active = active[enemy_health[active] > 0]
+
+            # Enemy's turn
+            enemy_special = self.rng.random(active.size) < 0.3
+            damage = np.where(enemy_special, (enemy_attack[active] * 1.5).astype(np.int64), enemy_attack[active])
+            _hit(hero_health, active, damage, hero_defense + shield)
+
+            turns[active] += 1  # Battle.fight counts the turn even if the hero just fell
+            active = active[hero_health[active] > 0]
+
+        hero_won = hero_health > 0
+        hero_won &= enemy_health == 0
+        return SimulationResult(hero_won, turns, hero_health, np.where(hero_won, xp_reward, 0))
+
+    def run(self, heroes: List[Character], enemies: List[Enemy], max_turns: int = 10_000) -> SimulationResult:
+        """Simulate heroes[i] vs enemies[i] without modifying the objects."""
+        if len(heroes) != len(enemies):
+            raise ValueError("heroes and enemies must pair up one-to-one")
+
+        return self.run_stats(
+            hero_class=np.array([_class_code(h) for h in heroes], dtype=np.int8),
+            hero_health=np.array([h.health for h in heroes]),
+            hero_attack=np.array([h.attack_power for h in heroes]),
+            hero_defense=np.array([h.defense for h in heroes]),
+            mana=np.array([getattr(h, "mana", 0) for h in heroes]),
+            arrows=np.array([getattr(h, "arrows", 0) for h in heroes]),
+            enemy_health=np.array([e.health for e in enemies]),
+            enemy_attack=np.array([e.attack_power for e in enemies]),
+            enemy_defense=np.array([e.defense for e in enemies]),
+            xp_reward=np.array([e.xp_reward for e in enemies]),
+            max_turns=max_turns,
+        )
+
+    def run_matchup(self, hero: Character, enemy: Enemy, fights: int, max_turns: int = 10_000) -> SimulationResult:
+        """Simulate the same hero/enemy pairing ``fights`` times."""
+        def full(value):
+            return np.full(fights, value, dtype=np.int64)
+
+        return self.run_stats(
+            hero_class=np.full(fights, _class_code(hero), dtype=np.int8),
+            hero_health=full(hero.health), hero_attack=full(hero.attack_power),
+            hero_defense=full(hero.defense), mana=full(getattr(hero, "mana", 0)),
+            arrows=full(getattr(hero, "arrows", 0)), enemy_health=full(enemy.health),
+            enemy_attack=full(enemy.attack_power), enemy_defense=full(enemy.defense),
+            xp_reward=full(enemy.xp_reward), max_turns=max_turns,
+        )
+
+
+def demo_simulation():
+    """Win rates for each hero class against an orc."""
+    print("="*70)
+    print("VECTORIZED COMBAT SIMULATION DEMO")
+    print("="*70)
+
+    simulator = CombatSimulator(seed=42)
+    fights = 10_000
+    for hero_class in (Warrior, Mage, Archer):
+        result = simulator.run_matchup(hero_class("Hero"), Enemy("Orc Warrior", 100, 25, 10, 100), fights)
+        print(f"  {hero_class.__name__:<8} vs Orc Warrior: win rate {result.win_rate:6.1%}, "
+              f"average {result.average_turns:.1f} turns")
+
+
+if __name__ == "__main__":
+    demo_simulation()
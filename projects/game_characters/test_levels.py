@@ -0,0 +1,40 @@
+"""
+Tests for characters far past the end of the XP table.
+
+Run: cd projects/game_characters && python -m unittest test_levels
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from entities import EntityStore
+from main import Warrior, level_for_experience
+from savegame import SaveReader, SaveWriter
+
+XP = 10**7
+
+
+class HighLevelTest(unittest.TestCase):
+    """Levels above 65535 must survive saving and the entity store."""
+
+    def test_save_and_load(self):
+        hero = Warrior("Conan")
+        with redirect_stdout(io.StringIO()):
+            hero.gain_experience(XP)
+        self.assertGreater(hero.level, 2**16)
+
+        loaded = SaveReader().load(SaveWriter().save({"hero": hero}))["hero"]
+        self.assertEqual((loaded.level, loaded.experience), (hero.level, hero.experience))
+
+    def test_entity_store_grant_experience(self):
+        store = EntityStore()
+        entity = store.spawn("Conan", 150, 15, 10)
+        gained = store.grant_experience([entity], XP)
+        self.assertEqual(int(store.level[entity]), level_for_experience(XP))
+        self.assertEqual(int(gained[0]), level_for_experience(XP) - 1)
+        self.assertEqual(int(store.experience[entity]), XP)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+World Map Spatial Index
+=======================
+
+Answers "which enemies are within aggro range of this hero?" without
+looping over every pair of characters:
+
+- A uniform grid of square cells; each cell holds the characters in it
+- move() only touches the grid when a character crosses into another
+  cell, so most moves are a dict update
+- Radius queries scan only the cells the circle overlaps, then check
+  exact distances
+- Pick a cell size near the usual query radius
+
+Run: python projects/game_characters/world_map.py
+"""
+
+import math
+from typing import Dict, Hashable, Iterator, List, Optional, Set, Tuple, Type
+
+from main import Archer, Character, Enemy, Mage, Warrior
+
+Cell = Tuple[int, int]
+
+
+class SpatialGrid:
+    """Uniform-grid index of positioned entities (any hashable, e.g. Characters)."""
+
+    def __init__(self, cell_size: float = 10.0):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[Hashable]] = {}
+        self._positions: Dict[Hashable, Tuple[float, float, Cell]] = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, entity: Hashable) -> bool:
+        return entity in self._positions
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, entity: Hashable, x: float, y: float):
+        """Place an entity (moves it if it is already on the map)."""
+        if entity in self._positions:
+            self.move(entity, x, y)
+            return
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, set()).add(entity)
+        self._positions[entity] = (x, y, cell)
+
+    def move(self, entity: Hashable, x: float, y: float):
+        """Update an entity's position."""
+        _, _, old = self._positions[entity]
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        if cell != old:
+            members = self._cells[old]
+            members.discard(entity)
+            if not members:
+                del self._cells[old]
+            self._cells.setdefault(cell, set()).add(entity)
+        self._positions[entity] = (x, y, cell)
+
+    def remove(self, entity: Hashable) -> bool:
+        """Take an entity off the map."""
+        placed = self._positions.pop(entity, None)
+        if placed is None:
+            return False
+        members = self._cells[placed[2]]
+        members.discard(entity)
+        if not members:
+            del self._cells[placed[2]]
+        return True
+
+    def position(self, entity: Hashable) -> Optional[Tuple[float, float]]:
+        placed = self._positions.get(entity)
+        return placed[:2] if placed else None
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Hashable]:
+        """Entities within ``radius`` of (x, y)."""
+        size, cells, positions = self.cell_size, self._cells, self._positions
+        r2 = radius * radius
+        found = []
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for entity in cells.get((cx, cy), ()):
+                    ex, ey, _ = positions[entity]
+                    if (ex - x) ** 2 + (ey - y) ** 2 <= r2:
+                        found.append(entity)
+        return found
+
+    def entities(self) -> Iterator[Tuple[Hashable, float, float]]:
+        for entity, (x, y, _) in self._positions.items():
+            yield entity, x, y
+
+
+class WorldMap(SpatialGrid):
+    """A SpatialGrid of Characters with game-level queries."""
+
+    def within(self, character: Character, radius: float,
+               kind: Type[Character] = Character) -> List[Character]:
+        """Other characters of a given type within radius of a character."""
+        x, y, _ = self._positions[character]
+        return [other for other in self.query_radius(x, y, radius)
+                if other is not character and isinstance(other, kind)]
+
+    def enemies_in_aggro_range(self, hero: Character, radius: float) -> List[Enemy]:
+        return self.within(hero, radius, Enemy)
+
+    def nearest_enemy(self, hero: Character, radius: float) -> Optional[Enemy]:
+        """Closest enemy within radius, if any."""
+        x, y, _ = self._positions[hero]
+        enemies = self.enemies_in_aggro_range(hero, radius)
+        return min(enemies, key=lambda e: math.dist((x, y), self._positions[e][:2]), default=None)
+
+
+def demo_world_map():
+    """Heroes scanning for nearby enemies."""
+    print("="*70)
+    print("WORLD MAP SPATIAL INDEX DEMO")
+    print("="*70)
+
+    world = WorldMap(cell_size=20)
+    conan, gandalf, legolas = Warrior("Conan the Brave"), Mage("Gandalf the Wise"), Archer("Legolas the Swift")
+    world.insert(conan, 10, 10)
+    world.insert(gandalf, 80, 15)
+    world.insert(legolas, 150, 150)
+
+    goblins = [Enemy(f"Goblin {i + 1}", 50, 15, 5, 50) for i in range(6)]
+    for goblin, (x, y) in zip(goblins, [(20, 12), (35, 30), (75, 20), (90, 40), (140, 160), (300, 300)]):
+        world.insert(goblin, x, y)
+
+    for hero in (conan, gandalf, legolas):
+        near = world.enemies_in_aggro_range(hero, radius=25)
+        print(f"  {hero.name:<18} aggro: {[e.name for e in near]}")
+
+    world.move(goblins[5], 155, 145)
+    nearest = world.nearest_enemy(legolas, radius=25)
+    print(f"\nGoblin 6 moves next to Legolas; nearest enemy: {nearest.name}")
+    world.remove(goblins[0])
+    print(f"Goblin 1 removed; Conan's aggro: {[e.name for e in world.enemies_in_aggro_range(conan, 25)]}")
+
+
+if __name__ == "__main__":
+    demo_world_map()
@@ -0,0 +1,431 @@
+"""
+Library Management System - Benchmarks
+=======================================
+
+Rough timings for the performance-sensitive parts of the library
+project. Numbers depend on the machine; compare runs on the same box.
+
+Run: python projects/library_management/benchmarks.py
+"""
+
+import io
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import redirect_stdout
+from itertools import islice
+
+from circulation import CirculationDesk
+from downloads import DownloadServer
+from federation import LibraryFederation
+from ingest import ingest, read_records
+from loan_history import BORROW, LoanEventStore
+from recommendations import CoBorrowIndex
+from main import Book, DigitalBook, Library, Member
+from search_index import FuzzyIndex
+from storage import SQLiteStorage
+
+
+def _timed(label: str, func, *args):
+    """Run func quietly and print how long it took."""
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<45} {elapsed:8.3f}s")
+    return result, elapsed
+
+
+def _make_books(count: int):
+    return [Book(f"Title {i}", f"Author {i % 500}", f"ISBN-{i:07d}", f"Category {i % 20}")
+            for i in range(count)]
+
+
+def _make_members(count: int):
+    return [Member(f"Member {i}", f"member{i}@email.com", ("Regular", "Premium", "Student")[i % 3])
+            for i in range(count)]
+
+
+def benchmark_storage(book_count: int = 100_000, member_count: int = 5_000, borrows: int = 5_000):
+    """Cold start and borrow/return throughput with the SQLite backend."""
+    print(f"\nSQLite storage ({book_count:,} books, {member_count:,} members)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "library.db")
+
+        storage = SQLiteStorage(path)
+        library = Library("Bench", storage=storage)
+        members = _make_members(member_count)
+        _timed("bulk load (one transaction per batch)", library.add_books, _make_books(book_count))
+        _timed("register members", library.add_members, members)
+        storage.close()
+
+        storage = SQLiteStorage(path)
+        restarted, elapsed = _timed("cold start (open + seed statistics)", Library, "Bench", storage)
+
+        def borrow_all():
+            for i in range(borrows):
+                restarted.borrow_book(members[i % member_count].member_id, f"ISBN-{i:07d}")
+
+        def return_all():
+            for i in range(borrows):
+                restarted.return_book(members[i % member_count].member_id, f"ISBN-{i:07d}")
+
+        _, elapsed = _timed(f"{borrows:,} borrows (lazy loads included)", borrow_all)
+        print(f"  {'borrow throughput':<45} {borrows / elapsed:8.0f}/s")
+        _, elapsed = _timed(f"{borrows:,} returns", return_all)
+        print(f"  {'return throughput':<45} {borrows / elapsed:8.0f}/s")
+        storage.close()
+
+
+def benchmark_circulation(terminals: int = 8, operations: int = 20_000, titles: int = 200):
+    """Stress the circulation desk from many threads and check for double loans."""
+    print(f"\nCirculation desk ({terminals} terminals, {operations:,} ops each, {titles} titles)")
+
+    with redirect_stdout(io.StringIO()):
+        library = Library("Bench")
+        library.add_books(_make_books(titles))
+        members = _make_members(terminals * 20)
+        for member in members:
+            library.add_member(member)
+    desk = CirculationDesk(library)
+    successes = [0] * terminals
+
+    def terminal(index: int):
+        rng = random.Random(index)
+        for _ in range(operations):
+            member = rng.choice(members)  # any member may show up at any terminal
+            borrowed = list(member.borrowed_books)  # snapshot; other terminals mutate it
+            if borrowed and rng.random() < 0.5:
+                ok = desk.return_book(member.member_id, rng.choice(borrowed).isbn)
+            else:
+                ok = desk.borrow(member.member_id, f"ISBN-{rng.randrange(titles):07d}")
+            successes[index] += ok
+
+    threads = [threading.Thread(target=terminal, args=(i,)) for i in range(terminals)]
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches to provoke races
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    sys.setswitchinterval(switch_interval)
+
+    holders = {}
+    for member in members:
+        for book in member.borrowed_books:
+            assert book.isbn not in holders, f"{book.isbn} lent twice"
+            assert book.borrowed_by is member and not book.is_available
+            holders[book.isbn] = member
+    on_loan = sum(1 for book in library.books if not book.is_available)
+    assert on_loan == len(holders) == library.stats.borrowed_books
+
+    total_ops = terminals * operations
+    print(f"  {'operations':<45} {total_ops:8,}")
+    print(f"  {'successful borrows/returns':<45} {sum(successes):8,}")
+    print(f"  {'version conflicts (retried)':<45} {desk.conflicts:8,}")
+    print(f"  {'copies on loan (no double loans)':<45} {on_loan:8,}")
+    print(f"  {'throughput':<45} {total_ops / elapsed:8.0f}/s")
+
+
+_SYLLABLES = "ka ri mo ne su ta lo vi an el or is um ba de fi go hu ja ke li ma no pe ra se ti vo wy".split()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    """Drop, double or swap one character."""
+    i = rng.randrange(1, len(text) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text[:i] + text[i] + text[i:]
+    return text[:i - 1] + text[i] + text[i - 1] + text[i + 1:]
+
+
+def benchmark_fuzzy_search(titles: int = 1_000_000, queries: int = 500):
+    """Index build time, memory and p99 latency of typo-tolerant search."""
+    print(f"\nFuzzy search ({titles:,} titles, {queries} misspelled queries)")
+
+    rng = random.Random(42)
+    words = [_word(rng) for _ in range(20_000)]
+    names = [_word(rng).capitalize() for _ in range(2_000)]
+    catalogue = [(" ".join(rng.choice(words) for _ in range(rng.randint(2, 5))),
+                  f"{rng.choice(names)} {rng.choice(names)}")
+                 for _ in range(titles)]
+
+    index = FuzzyIndex()
+
+    def build():
+        for i, (title, author) in enumerate(catalogue):
+            index.add(i, title)
+            index.add(i, author)
+
+    _timed("index build", build)
+    print(f"  {'postings size':<45} {index.memory_bytes() / 2**20:8.1f} MB")
+
+    latencies = []
+    for _ in range(queries):
+        title, author = catalogue[rng.randrange(titles)]
+        query = _typo(rng, rng.choice((title, author)))
+        start = time.perf_counter()
+        index.search(query, k=10)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(f"  {'p50 query latency':<45} {latencies[len(latencies) // 2] * 1000:8.2f} ms")
+    print(f"  {'p99 query latency':<45} {latencies[int(len(latencies) * 0.99)] * 1000:8.2f} ms")
+    print(f"  {'max query latency':<45} {latencies[-1] * 1000:8.2f} ms")
+
+
+def benchmark_ingest(records: int = 1_000_000, batch_size: int = 10_000):
+    """Stream a large CSV dump into a library backed by SQLite."""
+    print(f"\nBulk ingestion ({records:,} CSV records, batches of {batch_size:,})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dump.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("isbn,title,author,category\n")
+            for i in range(records):
+                # every 50th record repeats an earlier ISBN
+                isbn = i - 1 if i % 50 == 49 else i
+                f.write(f"ISBN-{isbn:07d},Title {i},Author {i % 5000},Category {i % 20}\n")
+        print(f"  {'dump size':<45} {os.path.getsize(path) / 2**20:8.1f} MB")
+
+        storage = SQLiteStorage(os.path.join(tmp, "library.db"))
+        library = Library("Bench", storage=storage)
+        report, elapsed = _timed("ingest", ingest, library, read_records(path), batch_size)
+        storage.close()
+
+    print(f"  {'records/s':<45} {records / elapsed:8.0f}")
+    print(f"  {'result':<45} {report}")
+
+
+def benchmark_loan_history(loans: int = 500_000, titles: int = 50_000, members: int = 20_000):
+    """Append throughput and rollup queries vs. scanning the event log."""
+    print(f"\nLoan history ({loans:,} loans over a year, {titles:,} titles, {members:,} members)")
+
+    rng = random.Random(7)
+    start_day = datetime(2024, 1, 1)
+    history = LoanEventStore()
+
+    def record():
+        for i in range(loans):
+            when = start_day + timedelta(minutes=i)
+            member_id, isbn = f"M{rng.randrange(members):05d}", f"ISBN-{rng.randrange(titles):07d}"
+            category = f"Category {hash(isbn) % 20}"
+            history.record_borrow(member_id, isbn, category, when)
+            history.record_return(member_id, isbn, category, rng.choice((0.0, 0.0, 1.5)),
+                                  when + timedelta(days=rng.randint(1, 30)))
+
+    _, elapsed = _timed("append borrow+return events", record)
+    print(f"  {'events/s':<45} {len(history) / elapsed:8.0f}")
+
+    def scan_most_borrowed():
+        month_start = datetime(2024, 3, 1).timestamp()
+        month_end = datetime(2024, 4, 1).timestamp()
+        counts = Counter(book for kind, when, book in
+                         zip(history.kinds, history.timestamps, history.book_codes)
+                         if kind == BORROW and month_start <= when < month_end)
+        return counts.most_common(10)
+
+    _timed("most borrowed in 2024-03 (full scan)", scan_most_borrowed)
+    _timed("most borrowed in 2024-03 (rollup)", history.most_borrowed, "2024-03")
+    _timed("member history (per-member index)", history.member_history, "M00042")
+    _timed("average loan length per category (rollup)", history.average_loan_days, "Category 3")
+
+
+def benchmark_recommendations(titles: int = 1_000_000, members: int = 100_000, borrows_each: int = 10):
+    """Incremental co-borrow updates, top-k lookups and single vs multi-process rebuild."""
+    print(f"\nCo-borrow recommendations ({titles:,} titles, {members:,} members x {borrows_each} borrows)")
+
+    rng = random.Random(11)
+    recommender = CoBorrowIndex()
+    # Every title gets a code up front so the cache arrays cover the whole catalogue
+    for i in range(titles):
+        recommender._code(f"ISBN-{i:07d}")
+
+    def record():
+        for m in range(members):
+            member_id = f"M{m:06d}"
+            # members cluster around a "home" region of the catalogue
+            home = rng.randrange(titles)
+            for _ in range(borrows_each):
+                recommender.record_borrow(member_id, f"ISBN-{(home + rng.randrange(200)) % titles:07d}")
+
+    _, elapsed = _timed("incremental updates", record)
+    print(f"  {'borrows/s':<45} {members * borrows_each / elapsed:8.0f}")
+
+    probes = [f"ISBN-{rng.randrange(titles):07d}" for _ in range(10_000)]
+    _timed("10,000 lookups (cold cache)", lambda: [recommender.also_borrowed(p) for p in probes])
+    _timed("10,000 lookups (warm cache)", lambda: [recommender.also_borrowed(p) for p in probes])
+
+    for processes in (1, max(2, os.cpu_count() or 1)):
+        _timed(f"rebuild with {processes} process(es)", recommender.rebuild, processes)
+    print(f"  {'CSR + top-k cache size':<45} {recommender.memory_bytes() / 2**20:8.1f} MB")
+
+
+def benchmark_downloads(files: int = 40, file_mb: int = 2, readers: int = 16,
+                        reads_each: int = 2_000, range_kb: int = 64):
+    """Concurrent range reads: memory-mapped LRU vs. open/seek/read per request."""
+    print(f"\nEbook downloads ({files} x {file_mb} MB files, {readers} readers, {range_kb} KB ranges)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = DownloadServer(cache_budget_bytes=files * file_mb * 2**20 // 2)
+        books = []
+        for i in range(files):
+            book = DigitalBook(f"Ebook {i}", "Author", f"ISBN-E{i:04d}", "EPUB", file_mb)
+            path = os.path.join(tmp, f"{book.isbn}.epub")
+            with open(path, "wb") as f:
+                f.write(os.urandom(file_mb * 2**20))
+            server.register(book, path)
+            books.append((book.isbn, path))
+
+        file_size, span = file_mb * 2**20, range_kb * 1024
+
+        def workload(read):
+            def reader(seed: int):
+                rng = random.Random(seed)
+                for _ in range(reads_each):
+                    # 80% of requests go to the hottest 20% of titles
+                    pool = books[:files // 5] if rng.random() < 0.8 else books
+                    isbn, path = rng.choice(pool)
+                    start = rng.randrange(0, file_size - span)
+                    read(isbn, path, start, start + span)
+
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        def copy_read(isbn, path, start, end):
+            with open(path, "rb") as f:
+                f.seek(start)
+                return f.read(end - start)
+
+        total_mb = readers * reads_each * span / 2**20
+        _, elapsed = _timed("open/seek/read (copies)", workload, copy_read)
+        print(f"  {'throughput':<45} {total_mb / elapsed:8.0f} MB/s")
+        _, elapsed = _timed("mmap + memoryview (zero-copy)", workload,
+                            lambda isbn, path, start, end: server.read_range(isbn, start, end))
+        print(f"  {'throughput':<45} {total_mb / elapsed:8.0f} MB/s")
+        hit_rate = server.cache_hits / max(1, server.cache_hits + server.cache_misses)
+        print(f"  {'cache hit rate':<45} {hit_rate:8.1%}")
+        print(f"  {'bytes served (per-thread counters)':<45} {server.bytes_served() / 2**20:8.0f} MB")
+
+
+def benchmark_pagination(sizes=(10_000, 100_000, 1_000_000), page_size: int = 20):
+    """First page of available books / members stays flat as the catalogue grows."""
+    print(f"\nPaginated listings (first page of {page_size})")
+
+    for size in sizes:
+        members = _make_members(size // 10)
+        with redirect_stdout(io.StringIO()):
+            library = Library("Bench")
+            library.add_books(_make_books(size))
+            start = time.perf_counter()
+            library.add_members(members)
+            members_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = [book for book in library.books if book.is_available]
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        library.available_books_page("Category 7", page_size=page_size)
+        library.members_page(page_size=page_size)
+        page_time = time.perf_counter() - start
+
+        # Lend out the oldest half of the catalogue: the first available books now sit behind it
+        oldest = iter(library.books[:size // 2])
+        with redirect_stdout(io.StringIO()):
+            for member in members:
+                for book in islice(oldest, member.max_books):
+                    library.borrow_book(member.member_id, book.isbn)
+
+        start = time.perf_counter()
+        library.available_books_page("Category 7", page_size=page_size)
+        on_loan_time = time.perf_counter() - start
+
+        print(f"  {size:>9,} books: build full list {full_time * 1000:8.2f} ms | "
+              f"first pages {page_time * 1000:6.3f} ms ({len(full):,} rows avoided) | "
+              f"half on loan {on_loan_time * 1000:6.3f} ms | "
+              f"{len(members):,} members added {members_time * 1000:7.1f} ms")
+
+
+def benchmark_federation(branches: int = 50, books_per_branch: int = 20_000, queries: int = 50):
+    """Serial per-branch search vs. federated fan-out, in-memory and SQLite-backed."""
+    print(f"\nFederation ({branches} branches x {books_per_branch:,} books, {queries} queries)")
+
+    rng = random.Random(5)
+    words = [_word(rng) for _ in range(5_000)]
+
+    def make_branch(index: int, storage=None) -> Library:
+        with redirect_stdout(io.StringIO()):
+            branch = Library(f"Branch {index:02d}", storage=storage)
+            branch.add_books([Book(" ".join(rng.choice(words) for _ in range(3)), _word(rng).capitalize(),
+                                   f"ISBN-{index:02d}-{i:06d}") for i in range(books_per_branch)])
+        return branch
+
+    federation = LibraryFederation("Bench")
+    for index in range(branches):
+        federation.add_branch(make_branch(index))
+    probes = [_typo(rng, rng.choice(words)) for _ in range(queries)]
+    for branch in federation.branches.values():
+        branch.fuzzy_search("warm up")  # build every fuzzy index before timing
+
+    def serial():
+        for query in probes:
+            for branch in federation.branches.values():
+                branch.fuzzy_search(query)
+
+    def fanned_out():
+        for query in probes:
+            federation.search(query, fuzzy=True)
+
+    _, serial_time = _timed("fuzzy search, branch by branch", serial)
+    _, fan_time = _timed("fuzzy search, federated fan-out (threads)", fanned_out)
+    print(f"  {'per query (serial / federated)':<45} {serial_time / queries * 1000:6.1f} / "
+          f"{fan_time / queries * 1000:.1f} ms")
+
+    isbns = [f"ISBN-{rng.randrange(branches):02d}-{rng.randrange(books_per_branch):06d}" for _ in range(queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        stored = LibraryFederation("Bench (SQLite)")
+        for index in range(branches):
+            branch = make_branch(index, SQLiteStorage(os.path.join(tmp, f"branch{index}.db")))
+            stored.add_branch(Library(branch.name, storage=branch.storage))  # cold: nothing loaded
+
+        def serial_lookup():
+            for isbn in isbns:
+                for branch in stored.branches.values():
+                    branch.find_book_by_isbn(isbn)
+
+        _timed("availability, branch by branch (SQLite)", serial_lookup)
+        _timed("availability, federated fan-out (SQLite)", lambda: [stored.availability(i) for i in isbns])
+        for branch in stored.branches.values():
+            branch.storage.close()
+        stored.close()
+    federation.close()
+
+
+if __name__ == "__main__":
+    benchmark_storage()
+    benchmark_circulation()
+    benchmark_fuzzy_search()
+    benchmark_ingest()
+    benchmark_loan_history()
+    benchmark_recommendations()
+    benchmark_downloads()
+    benchmark_pagination()
+    benchmark_federation()
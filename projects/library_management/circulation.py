@@ -0,0 +1,186 @@
+"""
+Concurrent Circulation Desk
+===========================
+
+Lets several checkout terminals (threads) share one Library without
+double-lending a copy and without a global lock.
+
+Every Book and Member carries a ``version`` that is bumped on each
+state change. A terminal:
+
+1. reads the versions and validates the request on that snapshot,
+2. takes only the two striped locks covering that title and member,
+3. commits if neither version moved, otherwise retries from step 1.
+
+Different titles hash to different stripes, so terminals working on
+different books never wait for each other. Only the shared statistics
+counters, availability listings and library listeners are updated under
+their own short lock.
+
+Run: python projects/library_management/circulation.py
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+from main import Book, DigitalBook, Library, Member
+
+
+class CirculationDesk:
+    """Thread-safe borrow, return and hold operations for a Library."""
+
+    def __init__(self, library: Library, stripes: int = 256, max_retries: int = 100):
+        if library.storage is not None:
+            raise ValueError("CirculationDesk works on in-memory libraries only")
+
+        self.library = library
+        self.max_retries = max_retries
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stats_lock = threading.Lock()
+        self._holds: Dict[str, Deque[str]] = {}
+        self.conflicts = 0  # approximate; incremented without a lock
+
+    @contextmanager
+    def _commit(self, *keys: str):
+        """Hold the stripe locks for the given keys, acquired in a fixed order."""
+        indexes = sorted({hash(key) % len(self._locks) for key in keys})
+        for index in indexes:
+            self._locks[index].acquire()
+        try:
+            yield
+        finally:
+            for index in reversed(indexes):
+                self._locks[index].release()
+
+    def _lookup(self, member_id: str, isbn: str):
+        return self.library.find_member_by_id(member_id), self.library.find_book_by_isbn(isbn)
+
+    def _reserved_for_someone_else(self, book: Book, member_id: str) -> bool:
+        holds = self._holds.get(book.isbn)
+        return bool(holds) and book.is_available and holds[0] != member_id
+
+    def borrow(self, member_id: str, isbn: str) -> bool:
+        """Borrow a copy; False if unavailable, reserved, or over the member's limit."""
+        member, book = self._lookup(member_id, isbn)
+        if member is None or book is None:
+            return False
+
+        is_digital = isinstance(book, DigitalBook)
+        for _ in range(self.max_retries):
+            book_version, member_version = book.version, member.version
+            was_available = book.is_available
+
+            if not is_digital and (not was_available or self._reserved_for_someone_else(book, member_id)):
+                return False
+            if not member.can_borrow_more():
+                return False
+
+            with self._commit(isbn, member_id):
+                if book.version != book_version or member.version != member_version:
+                    self.conflicts += 1
+                    continue
+
+                member.borrow_book(book)
+                holds = self._holds.get(isbn)
+                if holds and holds[0] == member_id:
+                    holds.popleft()
+                with self._stats_lock:
+                    self.library.stats.record_borrow(member, book, was_available)
+                    self.library.refresh_availability(book)
+                    for listener in self.library.listeners:
+                        listener.on_borrow(member, book)
+            return True
+
+        return False
+
+    def return_book(self, member_id: str, isbn: str) -> bool:
+        """Return a copy the member currently holds."""
+        member, book = self._lookup(member_id, isbn)
+        if member is None or book is None:
+            return False
+
+        for _ in range(self.max_retries):
+            book_version, member_version = book.version, member.version
+            was_available = book.is_available
+
+            if book not in member.borrowed_books:
+                return False
+
+            with self._commit(isbn, member_id):
+                if book.version != book_version or member.version != member_version:
+                    self.conflicts += 1
+                    continue
+
+                late_fee = member.return_book(book)
+                with self._stats_lock:
+                    self.library.stats.record_return(member, book, was_available, late_fee)
+                    self.library.refresh_availability(book)
+                    for listener in self.library.listeners:
+                        listener.on_return(member, book, late_fee)
+            return True
+
+        return False
+
+    def place_hold(self, member_id: str, isbn: str) -> bool:
+        """Queue the member for a borrowed physical copy."""
+        member, book = self._lookup(member_id, isbn)
+        if member is None or book is None or isinstance(book, DigitalBook):
+            return False
+
+        with self._commit(isbn):
+            if book.is_available and not self._holds.get(isbn):
+                return False
+
+            holds = self._holds.setdefault(isbn, deque())
+            if member_id in holds:
+                return False
+
+            holds.append(member_id)
+            book.version += 1
+        return True
+
+    def holds_for(self, isbn: str) -> list:
+        """Member IDs waiting for a title, first in line first."""
+        return list(self._holds.get(isbn, ()))
+
+
+def demo_circulation():
+    """Two terminals race for the same copy; only one wins."""
+    print("="*70)
+    print("CONCURRENT CIRCULATION DESK DEMO")
+    print("="*70)
+
+    library = Library("City Central Library")
+    library.add_book(Book("Python Programming", "John Doe", "ISBN-001", "Technology"))
+    alice = Member("Alice Williams", "alice@email.com", "Premium")
+    bob = Member("Bob Johnson", "bob@email.com", "Regular")
+    library.add_member(alice)
+    library.add_member(bob)
+
+    desk = CirculationDesk(library)
+    results = {}
+
+    def terminal(member: Member):
+        results[member.name] = desk.borrow(member.member_id, "ISBN-001")
+
+    threads = [threading.Thread(target=terminal, args=(m,)) for m in (alice, bob)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, ok in results.items():
+        print(f"  {name}: {'borrowed' if ok else 'refused'}")
+
+    loser = bob if results[alice.name] else alice
+    winner = alice if loser is bob else bob
+    print(f"\n{loser.name} places a hold: {desk.place_hold(loser.member_id, 'ISBN-001')}")
+    desk.return_book(winner.member_id, "ISBN-001")
+    print(f"{winner.name} returns; {winner.name} tries again: {desk.borrow(winner.member_id, 'ISBN-001')}")
+    print(f"{loser.name} collects the hold: {desk.borrow(loser.member_id, 'ISBN-001')}")
+
+
+if __name__ == "__main__":
+    demo_circulation()
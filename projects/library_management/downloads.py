@@ -0,0 +1,173 @@
+"""
+DigitalBook Download Serving
+============================
+
+Serves ebook files for DigitalBook titles:
+
+- Files are memory-mapped and ranges are returned as memoryview slices,
+  so serving a range copies nothing
+- An LRU cache keeps the hottest files mapped, within a byte budget
+- Byte and download counters are kept per thread and summed on demand,
+  so neither range reads nor downloads wait on a shared counter lock
+- download_count() adds the served downloads to the checkouts the
+  DigitalBook counts itself; the server never writes the book's counter
+
+Run: python projects/library_management/downloads.py
+"""
+
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List
+
+from main import DigitalBook, Library, Member
+
+
+class _Counters:
+    """Counters owned by a single thread."""
+
+    def __init__(self):
+        self.bytes_served = 0
+        self.downloads: Dict[str, int] = {}
+
+
+class _ThreadCounters(threading.local):
+    """Gives each thread its own _Counters and records it in a shared registry."""
+
+    def __init__(self, registry: List[_Counters]):
+        self.counters = _Counters()
+        registry.append(self.counters)  # list.append is atomic
+
+
+class DownloadServer:
+    """Range reads of registered ebook files through an LRU of memory maps."""
+
+    def __init__(self, cache_budget_bytes: int = 256 * 2**20):
+        self.cache_budget_bytes = cache_budget_bytes
+        self._books: Dict[str, DigitalBook] = {}
+        self._paths: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+        self._cache: "OrderedDict[str, mmap.mmap]" = OrderedDict()
+        self._cached_bytes = 0
+        self._cache_lock = threading.Lock()  # guards the LRU bookkeeping only, never a read
+        self._registry: List[_Counters] = []
+        self._local = _ThreadCounters(self._registry)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def register(self, book: DigitalBook, path: str):
+        """Associate an ebook with the file that holds its content."""
+        self._books[book.isbn] = book
+        self._paths[book.isbn] = path
+        self._sizes[book.isbn] = os.path.getsize(path)
+
+    # --- Cache --------------------------------------------------------
+
+    def _mapping(self, isbn: str) -> mmap.mmap:
+        with self._cache_lock:
+            mapped = self._cache.get(isbn)
+            if mapped is not None:
+                self._cache.move_to_end(isbn)
+                self.cache_hits += 1
+                return mapped
+
+        with open(self._paths[isbn], "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with self._cache_lock:
+            self.cache_misses += 1
+            existing = self._cache.get(isbn)
+            if existing is not None:  # another thread mapped it first
+                return existing
+            self._cache[isbn] = mapped
+            self._cached_bytes += len(mapped)
+            while self._cached_bytes > self.cache_budget_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+                # Not closed explicitly: readers may still hold views into it.
+                # The map is released once the last view is gone.
+        return mapped
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+
+    # --- Serving ------------------------------------------------------
+
+    def size(self, isbn: str) -> int:
+        """Size of an ebook file in bytes."""
+        return self._sizes[isbn]
+
+    def read_range(self, isbn: str, start: int = 0, end: int = -1) -> memoryview:
+        """Bytes [start, end) of an ebook as a zero-copy view (end=-1 means to EOF)."""
+        if self._sizes[isbn] == 0:  # empty files cannot be mapped
+            return memoryview(b"")
+
+        view = memoryview(self._mapping(isbn))
+        end = len(view) if end < 0 else min(end, len(view))
+        chunk = view[start:end]
+        self._local.counters.bytes_served += len(chunk)
+        return chunk
+
+    def download(self, isbn: str, chunk_size: int = 256 * 1024) -> Iterator[memoryview]:
+        """Count a download and yield the whole file in chunks."""
+        downloads = self._local.counters.downloads
+        downloads[isbn] = downloads.get(isbn, 0) + 1
+
+        total = self.size(isbn)
+        for start in range(0, total, chunk_size):
+            yield self.read_range(isbn, start, start + chunk_size)
+
+    # --- Accounting ---------------------------------------------------
+
+    def download_count(self, isbn: str) -> int:
+        """Downloads served for a title, summed over all threads, plus its checkouts."""
+        served = sum(counters.downloads.get(isbn, 0) for counters in list(self._registry))
+        return self._books[isbn].download_count + served
+
+    def bytes_served(self) -> int:
+        """Total bytes served, summed over all threads."""
+        return sum(counters.bytes_served for counters in list(self._registry))
+
+
+def demo_downloads():
+    """Serve an ebook in ranges to several threads."""
+    print("="*70)
+    print("DIGITAL BOOK DOWNLOAD DEMO")
+    print("="*70)
+
+    library = Library("City Central Library")
+    ebook = DigitalBook("Python for Beginners", "Alice Johnson", "ISBN-005", "PDF", 0.1)
+    library.add_book(ebook)
+    member = Member("Alice Williams", "alice@email.com", "Premium")
+    library.add_member(member)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ISBN-005.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.7 " + bytes(100_000))
+
+        server = DownloadServer()
+        server.register(ebook, path)
+
+        print(f"First bytes: {bytes(server.read_range(ebook.isbn, 0, 8))!r}")
+
+        def reader():
+            for chunk in server.download(ebook.isbn, chunk_size=16_384):
+                pass
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        library.borrow_book(member.member_id, ebook.isbn)
+        print(f"Downloads (with checkouts): {server.download_count(ebook.isbn)}, bytes: {server.bytes_served():,}")
+        print(ebook)
+
+
+if __name__ == "__main__":
+    demo_downloads()
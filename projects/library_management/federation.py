@@ -0,0 +1,149 @@
+"""
+Multi-Branch Library Federation
+===============================
+
+Many branches, each its own Library, behind one search desk:
+
+- Search and availability queries fan out to every branch on a thread
+  pool and the per-branch results are merged by rank
+- Inter-branch transfer requests are queued and then processed, moving
+  an available copy from one branch's catalogue to another's
+
+Threads suit branches whose lookups wait on I/O (e.g. SQLite-backed
+branches, where sqlite3 releases the GIL); each branch is only ever
+queried by one worker at a time.
+
+Run: python projects/library_management/federation.py
+"""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from main import Book, DigitalBook, Library
+
+
+class TransferRequest:
+    """A request to move a copy between branches."""
+
+    def __init__(self, isbn: str, from_branch: str, to_branch: str):
+        self.isbn = isbn
+        self.from_branch = from_branch
+        self.to_branch = to_branch
+        self.status = "Pending"  # Pending, Completed, Failed
+
+    def __str__(self):
+        return f"{self.isbn}: {self.from_branch} → {self.to_branch} [{self.status}]"
+
+
+class LibraryFederation:
+    """A group of branch libraries searched as one."""
+
+    def __init__(self, name: str, max_workers: int = 16):
+        self.name = name
+        self.branches: Dict[str, Library] = {}
+        self.transfers: List[TransferRequest] = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def add_branch(self, library: Library):
+        """Join a branch to the federation (keyed by its name)."""
+        self.branches[library.name] = library
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._pool.shutdown()
+
+    def _fan_out(self, query, *args) -> List[Tuple[str, object]]:
+        """Run query(branch, *args) on every branch in parallel."""
+        names = list(self.branches)
+        futures = [self._pool.submit(query, self.branches[name], *args) for name in names]
+        return [(name, future.result()) for name, future in zip(names, futures)]
+
+    # --- Queries ------------------------------------------------------
+
+    def search(self, query: str, fuzzy: bool = False, limit: int = 10) -> List[Tuple[str, Book, float]]:
+        """
+        Search every branch and merge the results as (branch, book, score).
+
+        Fuzzy results are ranked by similarity score; exact substring
+        matches all score 1.0 and keep branch order.
+        """
+        if fuzzy:
+            results = self._fan_out(Library.fuzzy_search, query, limit)
+        else:
+            results = self._fan_out(
+                lambda branch: [(book, 1.0) for book in branch.search_books(query)[:limit]])
+
+        ranked = ([(name, book, score) for book, score in matches] for name, matches in results)
+        return list(heapq.merge(*ranked, key=lambda row: -row[2]))[:limit]
+
+    def availability(self, isbn: str) -> Dict[str, bool]:
+        """Which branches hold the title, and whether their copy is on the shelf."""
+        def check(branch: Library) -> Optional[bool]:
+            book = branch.find_book_by_isbn(isbn)
+            if book is None:
+                return None
+            return book.is_available or isinstance(book, DigitalBook)
+
+        return {name: available for name, available in self._fan_out(check) if available is not None}
+
+    # --- Transfers ----------------------------------------------------
+
+    def request_transfer(self, isbn: str, from_branch: str, to_branch: str) -> TransferRequest:
+        """Queue a transfer; it happens on the next process_transfers()."""
+        request = TransferRequest(isbn, from_branch, to_branch)
+        self.transfers.append(request)
+        return request
+
+    def process_transfers(self) -> int:
+        """Carry out pending transfers whose copy is available; returns how many completed."""
+        completed = 0
+        for request in self.transfers:
+            if request.status != "Pending":
+                continue
+
+            source = self.branches.get(request.from_branch)
+            destination = self.branches.get(request.to_branch)
+            if (source is None or destination is None or source.find_book_by_isbn(request.isbn) is None
+                    or destination.find_book_by_isbn(request.isbn)):
+                request.status = "Failed"
+                continue
+
+            book = source.remove_book(request.isbn)
+            if book is None:
+                continue  # on loan; stays pending
+            destination.add_book(book)
+            request.status = "Completed"
+            completed += 1
+        return completed
+
+
+def demo_federation():
+    """Search three branches and move a book between them."""
+    print("="*70)
+    print("LIBRARY FEDERATION DEMO")
+    print("="*70)
+
+    federation = LibraryFederation("City Libraries")
+    central, north, south = Library("Central"), Library("North"), Library("South")
+    central.add_book(Book("Python Programming", "John Doe", "ISBN-001", "Technology"))
+    north.add_book(Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"))
+    south.add_book(Book("Tender Is the Night", "F. Scott Fitzgerald", "ISBN-006", "Fiction"))
+    for branch in (central, north, south):
+        federation.add_branch(branch)
+
+    print("\nFuzzy search for 'fitzgerld':")
+    for branch, book, score in federation.search("fitzgerld", fuzzy=True):
+        print(f"  [{branch}] {book.title} ({score:.2f})")
+
+    print(f"\nAvailability of ISBN-003: {federation.availability('ISBN-003')}")
+    federation.request_transfer("ISBN-003", "North", "Central")
+    federation.process_transfers()
+    for request in federation.transfers:
+        print(f"  {request}")
+    print(f"Availability of ISBN-003: {federation.availability('ISBN-003')}")
+    federation.close()
+
+
+if __name__ == "__main__":
+    demo_federation()
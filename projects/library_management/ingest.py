@@ -0,0 +1,170 @@
+"""
+Bulk Catalogue Ingestion
+========================
+
+Loads nightly catalogue dumps (CSV or JSON lines) into a Library
+without reading the whole file into memory:
+
+- Records are streamed lazily, one line at a time
+- Books are built and added in batches (indexes/storage updated once per batch)
+- Duplicate ISBNs (within the dump or already catalogued) are skipped
+- Bad records (malformed JSON, missing or non-text fields) are counted
+  as rejected and the run carries on
+- Progress is reported after every batch
+
+Expected fields: isbn, title, author, category (optional), and for
+ebooks file_format and file_size_mb.
+
+Run: python projects/library_management/ingest.py
+"""
+
+import csv
+import json
+import os
+import tempfile
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from main import Book, DigitalBook, Library
+
+
+class IngestReport:
+    """Running totals for one ingestion run."""
+
+    def __init__(self):
+        self.records = 0
+        self.added = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    def __str__(self):
+        return (f"{self.records:,} records: {self.added:,} added, "
+                f"{self.duplicates:,} duplicates, {self.rejected:,} rejected")
+
+
+def read_csv_records(path: str) -> Iterator[Dict[str, str]]:
+    """Yield one dict per CSV row (header row gives the field names)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def read_jsonl_records(path: str) -> Iterator[Optional[dict]]:
+    """Yield the value of each non-blank JSON line (None for a line that isn't valid JSON)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield None  # rejected by build_book
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Pick the reader from the file extension."""
+    if path.endswith((".jsonl", ".ndjson")):
+        return read_jsonl_records(path)
+    return read_csv_records(path)
+
+
+def _text(record: dict, field: str) -> Optional[str]:
+    """A field's stripped text, "" if missing, or None if it isn't a string."""
+    value = record.get(field)
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else None
+
+
+def build_book(record) -> Optional[Book]:
+    """Turn a record into a Book/DigitalBook, or None if it is incomplete or malformed."""
+    if not isinstance(record, dict):
+        return None
+    isbn, title, author = _text(record, "isbn"), _text(record, "title"), _text(record, "author")
+    category, file_format = _text(record, "category"), _text(record, "file_format")
+    if not (isbn and title and author) or category is None or file_format is None:
+        return None
+
+    if file_format:
+        try:
+            size = float(record.get("file_size_mb") or 0)
+        except (TypeError, ValueError):
+            return None
+        return DigitalBook(title, author, isbn, file_format, size)
+
+    return Book(title, author, isbn, category or "General")
+
+
+def print_progress(report: IngestReport):
+    """Default progress callback."""
+    print(f"  ... {report}")
+
+
+def ingest(library: Library, records: Iterable[dict], batch_size: int = 10_000,
+           progress: Optional[Callable[[IngestReport], None]] = print_progress) -> IngestReport:
+    """Stream records into the library in batches and return the totals."""
+    report = IngestReport()
+    records = iter(records)
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+
+        books: List[Book] = []
+        seen = set()
+        for record in batch:
+            book = build_book(record)
+            if book is None:
+                report.rejected += 1
+            elif book.isbn in seen:
+                report.duplicates += 1
+            else:
+                seen.add(book.isbn)
+                books.append(book)
+
+        known = library.known_isbns(list(seen))
+        if known:
+            report.duplicates += len(known)
+            books = [book for book in books if book.isbn not in known]
+
+        if books:
+            library.add_books(books)
+        report.records += len(batch)
+        report.added += len(books)
+        if progress is not None:
+            progress(report)
+
+    return report
+
+
+def demo_ingest():
+    """Ingest a small CSV dump with a duplicate and a bad row."""
+    print("="*70)
+    print("BULK CATALOGUE INGESTION DEMO")
+    print("="*70)
+
+    rows = [
+        {"isbn": "ISBN-001", "title": "Python Programming", "author": "John Doe", "category": "Technology"},
+        {"isbn": "ISBN-002", "title": "The Great Gatsby", "author": "F. Scott Fitzgerald", "category": "Fiction"},
+        {"isbn": "ISBN-001", "title": "Python Programming", "author": "John Doe", "category": "Technology"},
+        {"isbn": "", "title": "Missing ISBN", "author": "Nobody", "category": "General"},
+        {"isbn": "ISBN-003", "title": "Learn OOP", "author": "Jane Smith", "file_format": "PDF",
+         "file_size_mb": "5.5"},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalogue.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["isbn", "title", "author", "category",
+                                                   "file_format", "file_size_mb"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+        library = Library("City Central Library")
+        report = ingest(library, read_records(path), batch_size=2)
+
+    print(f"\nDone: {report}")
+    library.display_available_books()
+
+
+if __name__ == "__main__":
+    demo_ingest()
@@ -0,0 +1,196 @@
+"""
+Loan History Event Store
+========================
+
+Keeps every borrow, return and late fee the library processes, so
+history is not lost when ``Book.return_book`` clears ``borrowed_by``.
+
+- Append-only: events are never modified or deleted
+- Columnar: each field lives in its own compact array, and repeated
+  strings (ISBNs, member IDs, categories) are stored once as integer codes
+- Rollups are updated as events arrive, so the common questions are
+  answered without scanning the log:
+    * most-borrowed titles in a month
+    * a member's loan history
+    * average loan length per category
+
+Attach it to a library with ``library.add_listener(LoanEventStore())``.
+
+Run: python projects/library_management/loan_history.py
+"""
+
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from main import Book, Library, Member
+
+BORROW, RETURN, FEE = 0, 1, 2
+EVENT_NAMES = ("borrow", "return", "fee")
+
+
+class Interner:
+    """Maps strings to small integer codes and back."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class LoanEventStore:
+    """Append-only, columnar log of circulation events with precomputed rollups."""
+
+    def __init__(self):
+        # Columns, one entry per event
+        self.timestamps = array("d")
+        self.kinds = array("B")
+        self.book_codes = array("I")
+        self.member_codes = array("I")
+        self.amounts = array("d")  # late fee for FEE events, loan days for RETURN events
+
+        self._isbns = Interner()
+        self._members = Interner()
+        self._categories = Interner()
+        self._book_category = array("I")  # book code -> category code
+
+        # Rollups
+        self._monthly_borrows: Dict[str, Counter] = {}
+        self._member_events: Dict[int, array] = {}
+        self._loan_days_total: Dict[int, float] = {}
+        self._loan_count: Dict[int, int] = {}
+        self._open_loans: Dict[Tuple[int, int], float] = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # --- Library listener interface -----------------------------------
+
+    def on_borrow(self, member: Member, book: Book):
+        self.record_borrow(member.member_id, book.isbn, book.category)
+
+    def on_return(self, member: Member, book: Book, late_fee: float):
+        self.record_return(member.member_id, book.isbn, book.category, late_fee)
+
+    # --- Appending ----------------------------------------------------
+
+    def _book_code(self, isbn: str, category: str) -> int:
+        code = self._isbns.code(isbn)
+        if code == len(self._book_category):
+            self._book_category.append(self._categories.code(category))
+        return code
+
+    def _append(self, kind: int, when: datetime, book: int, member: int, amount: float = 0.0):
+        position = len(self.kinds)
+        self.timestamps.append(when.timestamp())
+        self.kinds.append(kind)
+        self.book_codes.append(book)
+        self.member_codes.append(member)
+        self.amounts.append(amount)
+
+        events = self._member_events.get(member)
+        if events is None:
+            events = self._member_events[member] = array("I")
+        events.append(position)
+
+    def record_borrow(self, member_id: str, isbn: str, category: str, when: Optional[datetime] = None):
+        """Append a borrow event."""
+        when = when or datetime.now()
+        book, member = self._book_code(isbn, category), self._members.code(member_id)
+        self._append(BORROW, when, book, member)
+
+        month = when.strftime("%Y-%m")
+        counts = self._monthly_borrows.get(month)
+        if counts is None:
+            counts = self._monthly_borrows[month] = Counter()
+        counts[book] += 1
+        self._open_loans[(book, member)] = when.timestamp()
+
+    def record_return(self, member_id: str, isbn: str, category: str, late_fee: float = 0.0,
+                      when: Optional[datetime] = None):
+        """Append a return event, plus a fee event when a late fee was charged."""
+        when = when or datetime.now()
+        book, member = self._book_code(isbn, category), self._members.code(member_id)
+
+        borrowed_at = self._open_loans.pop((book, member), None)
+        days = (when.timestamp() - borrowed_at) / 86400 if borrowed_at is not None else 0.0
+        self._append(RETURN, when, book, member, days)
+
+        if borrowed_at is not None:
+            category_code = self._book_category[book]
+            self._loan_days_total[category_code] = self._loan_days_total.get(category_code, 0.0) + days
+            self._loan_count[category_code] = self._loan_count.get(category_code, 0) + 1
+
+        if late_fee > 0:
+            self._append(FEE, when, book, member, late_fee)
+
+    # --- Queries ------------------------------------------------------
+
+    def most_borrowed(self, month: Optional[str] = None, k: int = 10) -> List[Tuple[str, int]]:
+        """Top-k (isbn, borrows) for a month like '2024-05' (default: current month)."""
+        month = month or datetime.now().strftime("%Y-%m")
+        counts = self._monthly_borrows.get(month, Counter())
+        return [(self._isbns.values[book], n) for book, n in counts.most_common(k)]
+
+    def member_history(self, member_id: str) -> List[dict]:
+        """All events for one member, oldest first."""
+        member = self._members.codes.get(member_id)
+        if member is None:
+            return []
+
+        return [{
+            "event": EVENT_NAMES[self.kinds[i]],
+            "when": datetime.fromtimestamp(self.timestamps[i]),
+            "isbn": self._isbns.values[self.book_codes[i]],
+            "amount": self.amounts[i],
+        } for i in self._member_events[member]]
+
+    def average_loan_days(self, category: str) -> float:
+        """Mean loan length in days for returned books of a category."""
+        code = self._categories.codes.get(category)
+        count = self._loan_count.get(code, 0)
+        return self._loan_days_total[code] / count if count else 0.0
+
+    def total_fees(self) -> float:
+        """Sum of all late fees (a scan of one column)."""
+        return sum(amount for kind, amount in zip(self.kinds, self.amounts) if kind == FEE)
+
+
+def demo_loan_history():
+    """Record some circulation and query the rollups."""
+    print("="*70)
+    print("LOAN HISTORY EVENT STORE DEMO")
+    print("="*70)
+
+    library = Library("City Central Library")
+    history = LoanEventStore()
+    library.add_listener(history)
+
+    library.add_book(Book("Python Programming", "John Doe", "ISBN-001", "Technology"))
+    library.add_book(Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"))
+    alice = Member("Alice Williams", "alice@email.com", "Premium")
+    bob = Member("Bob Johnson", "bob@email.com", "Regular")
+    library.add_member(alice)
+    library.add_member(bob)
+
+    library.borrow_book(alice.member_id, "ISBN-001")
+    library.return_book(alice.member_id, "ISBN-001")
+    library.borrow_book(bob.member_id, "ISBN-001")
+    library.borrow_book(alice.member_id, "ISBN-003")
+
+    print(f"\nMost borrowed this month: {history.most_borrowed(k=2)}")
+    print(f"\nHistory for {alice.name}:")
+    for event in history.member_history(alice.member_id):
+        print(f"  {event['when']:%Y-%m-%d %H:%M} {event['event']:<7} {event['isbn']}")
+    print(f"\nAverage Technology loan: {history.average_loan_days('Technology'):.4f} days")
+
+
+if __name__ == "__main__":
+    demo_loan_history()
@@ -12,7 +12,11 @@ Run: python projects/library_management/main.py
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from search_index import FuzzyIndex
+from sorted_index import SortedIndex
 
 
 class Book:
@@ -26,6 +30,7 @@ class Book:
         self.is_available = True
         self.borrowed_date: Optional[datetime] = None
         self.borrowed_by: Optional['Member'] = None
+        self.version = 0  # bumped on every state change (see circulation.py)
 
     def borrow(self, member: 'Member') -> bool:
         """Mark book as borrowed."""
@@ -35,6 +40,7 @@ class Book:
         self.is_available = False
         self.borrowed_date = datetime.now()
         self.borrowed_by = member
+        self.version += 1
         return True
 
     def return_book(self) -> int:
@@ -46,6 +52,7 @@ class Book:
         self.is_available = True
         self.borrowed_date = None
         self.borrowed_by = None
+        self.version += 1
         return days_borrowed
 
     def calculate_late_fee(self, borrow_period: int = 14, fee_per_day: float = 0.50) -> float:
@@ -77,6 +84,7 @@ class DigitalBook(Book):
     def borrow(self, member: 'Member') -> bool:
         """Digital books are always available (unlimited copies)."""
         self.download_count += 1
+        self.version += 1
         return True
 
     def return_book(self) -> int:
@@ -96,15 +104,19 @@ class Member:
 
     member_id_counter = 1000
 
-    def __init__(self, name: str, email: str, member_type: str = "Regular"):
-        self.member_id = f"M{Member.member_id_counter:04d}"
-        Member.member_id_counter += 1
+    def __init__(self, name: str, email: str, member_type: str = "Regular",
+                 member_id: Optional[str] = None):
+        if member_id is None:
+            member_id = f"M{Member.member_id_counter:04d}"
+            Member.member_id_counter += 1
+        self.member_id = member_id
         self.name = name
         self.email = email
         self.member_type = member_type  # Regular, Premium, Student
         self.borrowed_books: List[Book] = []
         self.total_books_borrowed = 0
         self.total_late_fees = 0.0
+        self.version = 0  # bumped on every borrow/return (see circulation.py)
 
     @property
     def max_books(self) -> int:
@@ -139,6 +151,7 @@ class Member:
         if book.borrow(self):
             self.borrowed_books.append(book)
             self.total_books_borrowed += 1
+            self.version += 1
             return True
 
         return False
@@ -154,6 +167,7 @@ class Member:
 
         self.borrowed_books.remove(book)
         self.total_late_fees += late_fee
+        self.version += 1
 
         return late_fee
 
@@ -161,41 +175,348 @@ class Member:
         return f"{self.name} ({self.member_id}) - {self.member_type} | Books: {len(self.borrowed_books)}/{self.max_books}"
 
 
-class Library:
-    """Represents the library management system."""
+class LibraryStatistics:
+    """Running counters kept up to date on every add/borrow/return."""
+
+    def __init__(self):
+        self.total_books = 0
+        self.available_books = 0
+        self.total_members = 0
+        self.total_borrows = 0
+        self.fees_collected = 0.0
+        self.category_totals: Dict[str, int] = {}
+        self.category_available: Dict[str, int] = {}
+        self.active_loans_by_member_type: Dict[str, int] = {}
+
+    @property
+    def borrowed_books(self) -> int:
+        """Copies currently out on loan."""
+        return self.total_books - self.available_books
+
+    def record_book_added(self, book: Book):
+        """Count a newly catalogued book."""
+        self.total_books += 1
+        self.category_totals[book.category] = self.category_totals.get(book.category, 0) + 1
+        # Both maps get the category, so a book added while on loan is still listed
+        self.category_available.setdefault(book.category, 0)
+        if book.is_available:
+            self.available_books += 1
+            self.category_available[book.category] += 1
+
+    def record_book_removed(self, book: Book):
+        """Stop counting a book that left the catalogue (it must be available)."""
+        self.total_books -= 1
+        self.available_books -= 1
+        self.category_totals[book.category] -= 1
+        self.category_available[book.category] -= 1
+
+    def record_member_added(self, member: 'Member'):
+        """Count a newly registered member."""
+        self.total_members += 1
+
+    def record_borrow(self, member: 'Member', book: Book, was_available: bool):
+        """Update counters after a successful borrow."""
+        self.total_borrows += 1
+        self.active_loans_by_member_type[member.member_type] = \
+            self.active_loans_by_member_type.get(member.member_type, 0) + 1
+        if was_available and not book.is_available:
+            self.available_books -= 1
+            self.category_available[book.category] -= 1
+
+    def record_return(self, member: 'Member', book: Book, was_available: bool, late_fee: float):
+        """Update counters after a successful return."""
+        self.fees_collected += late_fee
+        self.active_loans_by_member_type[member.member_type] -= 1
+        if not was_available and book.is_available:
+            self.available_books += 1
+            self.category_available[book.category] += 1
+
+    def as_dict(self) -> dict:
+        """Snapshot of the current counters."""
+        return {
+            "total_books": self.total_books,
+            "available_books": self.available_books,
+            "borrowed_books": self.borrowed_books,
+            "total_members": self.total_members,
+            "total_borrows": self.total_borrows,
+            "fees_collected": self.fees_collected,
+            "category_available": dict(self.category_available),
+            "active_loans_by_member_type": dict(self.active_loans_by_member_type),
+        }
+
 
-    def __init__(self, name: str):
+class Library:
+    """
+    Represents the library management system.
+
+    Pass a storage backend (see storage.py) to persist the catalogue,
+    members and loans. With a backend, books and members are loaded
+    lazily the first time they are looked up, so ``books`` and
+    ``members`` only hold the objects touched since start-up. The
+    first search or availability listing loads the whole catalogue,
+    and the first member listing loads every member, since they have
+    to look at all of them.
+    """
+
+    def __init__(self, name: str, storage=None):
         self.name = name
         self.books: List[Book] = []
         self.members: List[Member] = []
-        self.total_borrows = 0
+        self._books_by_isbn: Dict[str, Book] = {}
+        self._members_by_id: Dict[str, Member] = {}
+        self._catalogue: Dict[int, Book] = {}  # catalogue position -> book
+        self._positions: Dict[str, int] = {}   # isbn -> catalogue position
+        self._next_position = 0
+        self._available = SortedIndex()        # positions of available books
+        self._available_by_category: Dict[str, SortedIndex] = {}
+        self._member_names = SortedIndex()     # (name, member_id)
+        self._fuzzy_index: Optional[FuzzyIndex] = None  # built on first fuzzy search
+        self._fuzzy_indexed: Set[int] = set()           # id() of books in _fuzzy_index
+        self.storage = storage
+        self._catalogue_loaded = storage is None
+        self._members_loaded = storage is None
+        self.listeners: list = []
+
+        if storage is not None:
+            self.stats = storage.load_statistics()
+            Member.member_id_counter = max(Member.member_id_counter, storage.next_member_number())
+        else:
+            self.stats = LibraryStatistics()
+
+    @property
+    def total_borrows(self) -> int:
+        """Total borrows processed (all time)."""
+        return self.stats.total_borrows
+
+    def add_listener(self, listener):
+        """
+        Subscribe to circulation events.
+
+        The listener needs ``on_borrow(member, book)`` and
+        ``on_return(member, book, late_fee)`` methods; they are called
+        after each successful borrow/return.
+        """
+        self.listeners.append(listener)
+
+    def _index_book(self, book: Book) -> bool:
+        """Make a book visible to lookups; False if it already is."""
+        if self._books_by_isbn.get(book.isbn) is book:
+            return False
 
-    def add_book(self, book: Book):
-        """Add a book to the library."""
         self.books.append(book)
+        self._books_by_isbn[book.isbn] = book
+        self._positions[book.isbn] = self._next_position
+        self._catalogue[self._next_position] = book
+        self._next_position += 1
+        self.refresh_availability(book)
+        if self._fuzzy_index is not None:
+            self._add_to_fuzzy_index(book)
+        return True
+
+    def _unindex_book(self, book: Book):
+        """Undo _index_book (the fuzzy index keeps its entries; results are filtered)."""
+        position = self._positions.pop(book.isbn)
+        del self._catalogue[position]
+        self._available.discard(position)
+        self._available_by_category[book.category].discard(position)
+        del self._books_by_isbn[book.isbn]
+        self.books.remove(book)
+
+    def _add_to_fuzzy_index(self, book: Book):
+        if id(book) in self._fuzzy_indexed:
+            return  # removed and re-added: its entries are still there
+        self._fuzzy_indexed.add(id(book))
+        self._fuzzy_index.add(book, book.title)
+        self._fuzzy_index.add(book, book.author)
+
+    def _index_member(self, member: Member):
+        """Make a member visible to lookups."""
+        self.members.append(member)
+        self._members_by_id[member.member_id] = member
+        self._member_names.add((member.name, member.member_id))
+
+    def refresh_availability(self, book: Book):
+        """Update the availability listings after a book was borrowed or returned."""
+        if not self._is_catalogued(book):
+            return
+        position = self._positions[book.isbn]
+        in_category = self._available_by_category.setdefault(book.category, SortedIndex())
+        if book.is_available or isinstance(book, DigitalBook):
+            self._available.add(position)
+            in_category.add(position)
+        else:
+            self._available.discard(position)
+            in_category.discard(position)
+
+    def add_book(self, book: Book) -> bool:
+        """
+        Add a book to the library.
+
+        A book with the ISBN of a catalogued one replaces that record,
+        unless the catalogued copy is on loan (then nothing changes and
+        False is returned).
+        """
+        self._load_stored([book.isbn])
+        if not self._accept_book(book):
+            return False
+        if self.storage is not None:
+            self.storage.save_books([book])
         print(f"✓ Added book: {book.title}")
+        return True
+
+    def add_books(self, books: List[Book]) -> int:
+        """Add many books at once, written to storage in one transaction; returns how many were added."""
+        self._load_stored([book.isbn for book in books])
+        added = [book for book in books if self._accept_book(book)]
+        if self.storage is not None:
+            self.storage.save_books(added)
+        print(f"✓ Added {len(added)} books")
+        return len(added)
+
+    def _load_stored(self, isbns: List[str]):
+        """Bring stored books with these ISBNs into memory, so adding them again replaces them."""
+        if self._catalogue_loaded:
+            return
+        for isbn in self.storage.existing_isbns([isbn for isbn in isbns if isbn not in self._books_by_isbn]):
+            self._load_book(isbn)
+
+    def _accept_book(self, book: Book) -> bool:
+        """Catalogue and count a book being added, replacing an available record with its ISBN."""
+        existing = self._books_by_isbn.get(book.isbn)
+        if existing is book:
+            return True  # already catalogued; nothing to count again
+        if existing is not None:
+            if self._on_loan(existing):
+                print(f"Error: '{existing.title}' ({book.isbn}) is on loan; "
+                      f"its record can't be replaced until it is returned")
+                return False
+            self._unindex_book(existing)
+            self.stats.record_book_removed(existing)
+        self._index_book(book)
+        self.stats.record_book_added(book)
+        return True
+
+    def _on_loan(self, book: Book) -> bool:
+        if isinstance(book, DigitalBook):
+            # Downloads leave no mark on the book; look for it among members' loans
+            return any(book in member.borrowed_books for member in self.members)
+        return not book.is_available
 
     def add_member(self, member: Member):
         """Add a member to the library."""
-        self.members.append(member)
+        self._index_member(member)
+        self.stats.record_member_added(member)
+        if self.storage is not None:
+            self.storage.save_members([member])
         print(f"✓ Registered member: {member.name} ({member.member_id})")
 
+    def add_members(self, members: List[Member]):
+        """Register many members at once, written to storage in one transaction."""
+        for member in members:
+            self._index_member(member)
+            self.stats.record_member_added(member)
+        if self.storage is not None:
+            self.storage.save_members(members)
+        print(f"✓ Registered {len(members)} members")
+
+    def remove_book(self, isbn: str) -> Optional[Book]:
+        """
+        Remove an available book from the catalogue (e.g. to transfer it).
+
+        Returns the removed book, or None if it is unknown or on loan.
+        """
+        book = self.find_book_by_isbn(isbn)
+        if book is None or self._on_loan(book):
+            return None
+
+        self._unindex_book(book)
+        self.stats.record_book_removed(book)
+        if self.storage is not None:
+            self.storage.delete_book(isbn)
+        return book
+
+    def _is_catalogued(self, book: Book) -> bool:
+        return self._books_by_isbn.get(book.isbn) is book
+
+    def known_isbns(self, isbns: List[str]) -> set:
+        """Which of these ISBNs are already catalogued (one storage query)."""
+        known = {isbn for isbn in isbns if isbn in self._books_by_isbn}
+        if self.storage is not None:
+            known |= self.storage.existing_isbns([isbn for isbn in isbns if isbn not in known])
+        return known
+
     def find_book_by_isbn(self, isbn: str) -> Optional[Book]:
         """Find a book by ISBN."""
-        for book in self.books:
-            if book.isbn == isbn:
-                return book
-        return None
+        book = self._books_by_isbn.get(isbn)
+        if book is None and self.storage is not None:
+            book = self._load_book(isbn)
+        return book
 
     def find_member_by_id(self, member_id: str) -> Optional[Member]:
         """Find a member by ID."""
-        for member in self.members:
-            if member.member_id == member_id:
-                return member
-        return None
-
-    def search_books(self, query: str) -> List[Book]:
-        """Search books by title or author."""
+        member = self._members_by_id.get(member_id)
+        if member is None and self.storage is not None:
+            member = self._load_member(member_id)
+        return member
+
+    def _load_book(self, isbn: str) -> Optional[Book]:
+        """Load a book from storage and link it to its borrower."""
+        loaded = self.storage.load_book(isbn)
+        if loaded is None:
+            return None
+
+        book, borrower_id = loaded
+        self._index_book(book)
+        if borrower_id is not None:
+            book.borrowed_by = self.find_member_by_id(borrower_id)
+        return book
+
+    def _load_catalogue(self):
+        """Load every stored book not yet in memory (once per Library)."""
+        if self._catalogue_loaded:
+            return
+        self._catalogue_loaded = True
+        for book, borrower_id in self.storage.load_books():
+            if book.isbn in self._books_by_isbn:
+                continue  # already looked up since start-up
+            self._index_book(book)
+            if borrower_id is not None:
+                book.borrowed_by = self.find_member_by_id(borrower_id)
+
+    def _load_members(self):
+        """Load every stored member not yet in memory (once per Library)."""
+        if self._members_loaded:
+            return
+        self._members_loaded = True
+        for member, borrowed_isbns in self.storage.load_members():
+            if member.member_id in self._members_by_id:
+                continue  # already looked up since start-up
+            self._index_member(member)
+            member.borrowed_books = [self.find_book_by_isbn(isbn) for isbn in borrowed_isbns]
+
+    def _load_member(self, member_id: str) -> Optional[Member]:
+        """Load a member from storage along with their current loans."""
+        loaded = self.storage.load_member(member_id)
+        if loaded is None:
+            return None
+
+        member, borrowed_isbns = loaded
+        self._index_member(member)
+        member.borrowed_books = [self.find_book_by_isbn(isbn) for isbn in borrowed_isbns]
+        return member
+
+    def search_books(self, query: str, fuzzy: bool = False, limit: int = 10) -> List[Book]:
+        """
+        Search books by title or author.
+
+        With fuzzy=True, returns up to ``limit`` closest matches (best
+        first) from a typo-tolerant trigram index instead of exact
+        substring matches.
+        """
+        if fuzzy:
+            return [book for book, _ in self.fuzzy_search(query, limit)]
+
+        self._load_catalogue()
         query = query.lower()
         results = []
         for book in self.books:
@@ -203,6 +524,24 @@ class Library:
                 results.append(book)
         return results
 
+    def fuzzy_search(self, query: str, limit: int = 10) -> List[Tuple[Book, float]]:
+        """Closest (book, score) matches for a possibly misspelled query, best first."""
+        self._load_catalogue()
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            for book in self.books:
+                self._add_to_fuzzy_index(book)
+
+        # Removed books still have index entries; drop them before cutting to
+        # limit, asking for more matches until enough catalogued ones remain.
+        k = limit
+        while True:
+            matches = self._fuzzy_index.search(query, k=k)
+            results = [(book, score) for book, score in matches if self._is_catalogued(book)]
+            if len(results) >= limit or len(matches) < k:
+                return results[:limit]
+            k *= 2
+
     def borrow_book(self, member_id: str, isbn: str) -> bool:
         """Process a book borrow request."""
         member = self.find_member_by_id(member_id)
@@ -219,8 +558,14 @@ class Library:
             print(f"Error: '{book.title}' is currently borrowed")
             return False
 
+        was_available = book.is_available
         if member.borrow_book(book):
-            self.total_borrows += 1
+            self.stats.record_borrow(member, book, was_available)
+            self.refresh_availability(book)
+            if self.storage is not None:
+                self.storage.record_borrow(member, book)
+            for listener in self.listeners:
+                listener.on_borrow(member, book)
             print(f"✓ {member.name} borrowed '{book.title}'")
             return True
 
@@ -238,7 +583,18 @@ class Library:
             print(f"Error: Book with ISBN {isbn} not found")
             return False
 
+        if book not in member.borrowed_books:
+            print(f"Error: {member.name} hasn't borrowed this book")
+            return False
+
+        was_available = book.is_available
         late_fee = member.return_book(book)
+        self.stats.record_return(member, book, was_available, late_fee)
+        self.refresh_availability(book)
+        if self.storage is not None:
+            self.storage.record_return(member, book, late_fee)
+        for listener in self.listeners:
+            listener.on_return(member, book, late_fee)
         if late_fee > 0:
             print(f"✓ {member.name} returned '{book.title}' - Late fee: ${late_fee:.2f}")
         else:
@@ -246,23 +602,76 @@ class Library:
 
         return True
 
-    def display_available_books(self):
-        """Display all available books."""
+    def iter_available_books(self, category: Optional[str] = None, cursor: int = 0) -> Iterator[Tuple[int, Book]]:
+        """
+        Lazily yield (cursor, book) for available books in catalogue order.
+
+        Cursors are catalogue positions, which never change or get
+        reused, so they stay valid while books are added, borrowed or
+        returned. Resume a listing with ``cursor=last_cursor + 1``.
+        Only available books are visited: the listing reads an ordered
+        index of available positions instead of scanning the catalogue.
+        """
+        self._load_catalogue()
+        available = self._available if category is None else self._available_by_category.get(category)
+        if available is None:
+            return
+        for position in available.irange(cursor):
+            yield position, self._catalogue[position]
+
+    def available_books_page(self, category: Optional[str] = None, cursor: int = 0,
+                             page_size: int = 20) -> Tuple[List[Book], Optional[int]]:
+        """One page of available books and the cursor for the next page (None at the end)."""
+        rows = list(islice(self.iter_available_books(category, cursor), page_size + 1))
+        next_cursor = rows[page_size - 1][0] + 1 if len(rows) > page_size else None
+        return [book for _, book in rows[:page_size]], next_cursor
+
+    def iter_members_by_name(self, after: Optional[Tuple[str, str]] = None) -> Iterator[Member]:
+        """Lazily yield members sorted by name, starting after the (name, member_id) cursor."""
+        self._load_members()
+        for _, member_id in self._member_names.irange(after, inclusive=False):
+            yield self._members_by_id[member_id]
+
+    def members_page(self, after: Optional[Tuple[str, str]] = None,
+                     page_size: int = 20) -> Tuple[List[Member], Optional[Tuple[str, str]]]:
+        """One page of members by name and the cursor for the next page (None at the end)."""
+        rows = list(islice(self.iter_members_by_name(after), page_size + 1))
+        if len(rows) <= page_size:
+            return rows, None
+        last = rows[page_size - 1]
+        return rows[:page_size], (last.name, last.member_id)
+
+    def display_available_books(self, category: Optional[str] = None, cursor: int = 0,
+                                page_size: Optional[int] = None) -> Optional[int]:
+        """
+        Display available books, streaming rows as they are found.
+
+        With page_size, shows one page and returns the cursor for the
+        next one (None when there are no more).
+        """
         print(f"\n{'='*70}")
-        print(f"{self.name} - Available Books")
+        print(f"{self.name} - Available Books" + (f" ({category})" if category else ""))
         print(f"{'='*70}")
 
-        available = [book for book in self.books if book.is_available or isinstance(book, DigitalBook)]
+        next_cursor = None
+        if page_size is None:
+            books = (book for _, book in self.iter_available_books(category, cursor))
+        else:
+            books, next_cursor = self.available_books_page(category, cursor, page_size)
 
-        if not available:
+        shown = 0
+        for book in books:
+            print(f"  {book}")
+            shown += 1
+        if not shown:
             print("No books currently available")
-        else:
-            for book in available:
-                print(f"  {book}")
+        if next_cursor is not None:
+            print(f"  ... more (cursor={next_cursor})")
 
         print(f"{'='*70}\n")
+        return next_cursor
 
-    def display_member_books(self, member_id: str):
+    def display_member_books(self, member_id: str, page: int = 0, page_size: Optional[int] = None):
         """Display books borrowed by a member."""
         member = self.find_member_by_id(member_id)
         if not member:
@@ -276,7 +685,9 @@ class Library:
         if not member.borrowed_books:
             print("No books currently borrowed")
         else:
-            for book in member.borrowed_books:
+            start = page * page_size if page_size else 0
+            end = start + page_size if page_size else None
+            for book in islice(member.borrowed_books, start, end):
                 late_fee = book.calculate_late_fee(member.borrow_period_days)
                 late_info = f" - Late fee: ${late_fee:.2f}" if late_fee > 0 else ""
                 print(f"  {book.title} by {book.author}{late_info}")
@@ -289,31 +700,41 @@ class Library:
         print(f"{self.name} - Statistics")
         print(f"{'='*70}")
 
-        total_books = len(self.books)
-        available_books = sum(1 for book in self.books if book.is_available)
-        borrowed_books = total_books - available_books
+        stats = self.stats
+        print(f"Total Books: {stats.total_books}")
+        print(f"  Available: {stats.available_books}")
+        print(f"  Borrowed: {stats.borrowed_books}")
+        for category, total in stats.category_totals.items():
+            print(f"    {category}: {stats.category_available[category]}/{total} available")
+        print(f"\nTotal Members: {stats.total_members}")
+        print(f"Total Borrows (all time): {stats.total_borrows}")
+        for member_type, loans in stats.active_loans_by_member_type.items():
+            print(f"  Active loans ({member_type}): {loans}")
 
-        print(f"Total Books: {total_books}")
-        print(f"  Available: {available_books}")
-        print(f"  Borrowed: {borrowed_books}")
-        print(f"\nTotal Members: {len(self.members)}")
-        print(f"Total Borrows (all time): {self.total_borrows}")
-
-        total_fees = sum(member.total_late_fees for member in self.members)
-        print(f"Total Late Fees Collected: ${total_fees:.2f}")
+        print(f"Total Late Fees Collected: ${stats.fees_collected:.2f}")
 
         print(f"{'='*70}\n")
 
-    def display_all_members(self):
-        """Display all library members."""
+    def display_all_members(self, after: Optional[Tuple[str, str]] = None,
+                            page_size: Optional[int] = None) -> Optional[Tuple[str, str]]:
+        """Display library members by name, optionally one page at a time."""
         print(f"\n{'='*70}")
         print(f"{self.name} - All Members")
         print(f"{'='*70}")
 
-        for member in self.members:
+        next_cursor = None
+        if page_size is None:
+            members = self.iter_members_by_name(after)
+        else:
+            members, next_cursor = self.members_page(after, page_size)
+
+        for member in members:
             print(f"  {member}")
+        if next_cursor is not None:
+            print(f"  ... more (cursor={next_cursor})")
 
         print(f"{'='*70}\n")
+        return next_cursor
 
 
 def demo_library_system():
@@ -360,6 +781,11 @@ def demo_library_system():
     for book in results:
         print(f"  {book}")
 
+    results = library.search_books("fitzgerld", fuzzy=True, limit=1)
+    print(f"Fuzzy search results for 'fitzgerld':")
+    for book in results:
+        print(f"  {book}")
+
     # Return books
     print("\n--- Returning Books ---")
     library.return_book("M1001", "ISBN-002")  # Bob returns book
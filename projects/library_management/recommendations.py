@@ -0,0 +1,238 @@
+"""
+Co-Borrowing Recommendations
+============================
+
+"Patrons who borrowed this also borrowed..." built from the library's
+borrow events.
+
+- Item-to-item co-occurrence counts: two titles co-occur when the same
+  member has borrowed both
+- Incremental: attach as a listener and every borrow updates the counts
+- Sparse storage: rebuilt rows are packed into CSR arrays (row offsets,
+  neighbour codes, counts); only titles that were actually co-borrowed
+  take space. Updates since the last rebuild sit in a small overlay.
+- Top-k neighbours are cached per title in fixed-width arrays and
+  recomputed only for titles whose counts changed
+- Batch rebuild from all member histories can use several processes,
+  each building the rows for its own share of titles
+
+Attach it with ``library.add_listener(CoBorrowIndex())``.
+
+Run: python projects/library_management/recommendations.py
+"""
+
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from loan_history import Interner
+from main import Book, Library, Member
+
+_worker_baskets: List[array] = []
+
+
+def _init_worker(baskets: List[array]):
+    global _worker_baskets
+    _worker_baskets = baskets
+
+
+def _build_rows(share: int, shares: int, top_k: int, baskets: Optional[List[array]] = None):
+    """Count co-occurrences for titles where code % shares == share."""
+    rows: Dict[int, Dict[int, int]] = {}
+    for basket in baskets if baskets is not None else _worker_baskets:
+        for title in basket:
+            if title % shares != share:
+                continue
+            row = rows.get(title)
+            if row is None:
+                row = rows[title] = {}
+            for other in basket:
+                if other != title:
+                    row[other] = row.get(other, 0) + 1
+
+    packed = []
+    for title, row in rows.items():
+        best = heapq.nlargest(top_k, row.items(), key=lambda item: item[1])
+        packed.append((title, array("I", row.keys()), array("I", row.values()),
+                       array("i", (t for t, _ in best)), array("I", (n for _, n in best))))
+    return packed
+
+
+class CoBorrowIndex:
+    """Incrementally maintained item-to-item co-occurrence index."""
+
+    def __init__(self, top_k: int = 10, max_history: int = 50):
+        self.top_k = top_k
+        self.max_history = max_history  # co-count only against a member's recent titles
+        self._titles = Interner()
+        self._histories: Dict[str, array] = {}
+        self._borrowed: Dict[str, Set[int]] = {}  # same titles as _histories, for membership tests
+
+        # CSR matrix from the last rebuild
+        self._indptr = array("Q", [0])
+        self._indices = array("I")
+        self._counts = array("I")
+        # Changes since the last rebuild
+        self._overlay: Dict[int, Dict[int, int]] = {}
+
+        # Fixed-width top-k cache: top_k slots per title, -1 marks an empty slot
+        self._top_titles = array("i")
+        self._top_counts = array("I")
+        self._stale = bytearray()
+
+    # --- Library listener interface -----------------------------------
+
+    def on_borrow(self, member: Member, book: Book):
+        self.record_borrow(member.member_id, book.isbn)
+
+    def on_return(self, member: Member, book: Book, late_fee: float):
+        pass
+
+    # --- Updates ------------------------------------------------------
+
+    def _code(self, isbn: str) -> int:
+        code = self._titles.code(isbn)
+        while len(self._stale) <= code:
+            self._stale.append(1)
+            self._top_titles.extend([-1] * self.top_k)
+            self._top_counts.extend([0] * self.top_k)
+        return code
+
+    def _bump(self, title: int, other: int):
+        row = self._overlay.get(title)
+        if row is None:
+            row = self._overlay[title] = {}
+        row[other] = row.get(other, 0) + 1
+        self._stale[title] = 1
+
+    def record_borrow(self, member_id: str, isbn: str):
+        """Count the new title against the member's earlier titles."""
+        title = self._code(isbn)
+        history = self._histories.get(member_id)
+        if history is None:
+            history = self._histories[member_id] = array("I")
+            self._borrowed[member_id] = set()
+        borrowed = self._borrowed[member_id]
+        if title in borrowed:
+            return
+
+        for other in history[-self.max_history:]:
+            self._bump(title, other)
+            self._bump(other, title)
+        history.append(title)
+        borrowed.add(title)
+
+    # --- Queries ------------------------------------------------------
+
+    def _row(self, title: int) -> Dict[int, int]:
+        row = {}
+        if title + 1 < len(self._indptr):
+            start, end = self._indptr[title], self._indptr[title + 1]
+            row = dict(zip(self._indices[start:end], self._counts[start:end]))
+        for other, count in self._overlay.get(title, {}).items():
+            row[other] = row.get(other, 0) + count
+        return row
+
+    def _refresh(self, title: int):
+        best = heapq.nlargest(self.top_k, self._row(title).items(), key=lambda item: item[1])
+        base = title * self.top_k
+        for slot in range(self.top_k):
+            other, count = best[slot] if slot < len(best) else (-1, 0)
+            self._top_titles[base + slot] = other
+            self._top_counts[base + slot] = count
+        self._stale[title] = 0
+
+    def also_borrowed(self, isbn: str, k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Up to k (isbn, co-borrow count) pairs, most co-borrowed first."""
+        title = self._titles.codes.get(isbn)
+        if title is None:
+            return []
+        if self._stale[title]:
+            self._refresh(title)
+
+        base = title * self.top_k
+        results = []
+        for slot in range(min(k or self.top_k, self.top_k)):
+            other = self._top_titles[base + slot]
+            if other < 0:
+                break
+            results.append((self._titles.values[other], self._top_counts[base + slot]))
+        return results
+
+    # --- Batch rebuild ------------------------------------------------
+
+    def rebuild(self, processes: int = 1):
+        """
+        Recount everything from the member histories and repack as CSR.
+
+        Pairs are counted within each member's ``max_history`` most
+        recent titles, so members with long histories drop their
+        oldest pairs.
+        """
+        baskets = [history[-self.max_history:] for history in self._histories.values()]
+        if processes > 1:
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(baskets,)) as pool:
+                parts = list(pool.map(_build_rows, range(processes), [processes] * processes,
+                                      [self.top_k] * processes))
+        else:
+            parts = [_build_rows(0, 1, self.top_k, baskets)]
+
+        titles = len(self._titles.values)
+        rows: List[Optional[tuple]] = [None] * titles
+        for part in parts:
+            for packed in part:
+                rows[packed[0]] = packed
+
+        indptr, indices, counts = array("Q", [0]), array("I"), array("I")
+        self._top_titles = array("i", [-1]) * (titles * self.top_k)
+        self._top_counts = array("I", [0]) * (titles * self.top_k)
+        for title, packed in enumerate(rows):
+            if packed is not None:
+                _, neighbours, neighbour_counts, top_titles, top_counts = packed
+                indices.extend(neighbours)
+                counts.extend(neighbour_counts)
+                base = title * self.top_k
+                self._top_titles[base:base + len(top_titles)] = top_titles
+                self._top_counts[base:base + len(top_counts)] = top_counts
+            indptr.append(len(indices))
+
+        self._indptr, self._indices, self._counts = indptr, indices, counts
+        self._overlay = {}
+        self._stale = bytearray(titles)
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the CSR and cache arrays."""
+        arrays = (self._indptr, self._indices, self._counts, self._top_titles, self._top_counts)
+        return sum(a.buffer_info()[1] * a.itemsize for a in arrays) + len(self._stale)
+
+
+def demo_recommendations():
+    """Recommend titles from a handful of borrows."""
+    print("="*70)
+    print("CO-BORROWING RECOMMENDATIONS DEMO")
+    print("="*70)
+
+    library = Library("City Central Library")
+    recommender = CoBorrowIndex(top_k=3)
+    library.add_listener(recommender)
+
+    library.add_book(Book("Python Programming", "John Doe", "ISBN-001", "Technology"))
+    library.add_book(Book("Data Science Handbook", "Jane Smith", "ISBN-002", "Technology"))
+    library.add_book(Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"))
+    members = [Member(name, f"{name.lower()}@email.com", "Premium") for name in ("Alice", "Bob", "Charlie")]
+    for member in members:
+        library.add_member(member)
+
+    for member, isbns in zip(members, (["ISBN-001", "ISBN-002"], ["ISBN-001", "ISBN-002"], ["ISBN-001", "ISBN-003"])):
+        for isbn in isbns:
+            library.borrow_book(member.member_id, isbn)
+            library.return_book(member.member_id, isbn)
+
+    print(f"\nPatrons who borrowed ISBN-001 also borrowed: {recommender.also_borrowed('ISBN-001')}")
+    recommender.rebuild()
+    print(f"After rebuild: {recommender.also_borrowed('ISBN-001')}")
+
+
+if __name__ == "__main__":
+    demo_recommendations()
@@ -0,0 +1,129 @@
+"""
+Sorted Key Index
+================
+
+An ordered set of keys for the library's listings (member names,
+available catalogue positions):
+
+- Keys live in a list of sorted chunks, each at most 2 * chunk_size
+  long, so add() and discard() shift one chunk instead of the whole
+  list (insort into one flat list is O(n) per insert)
+- irange() walks the keys from any starting key in order; it finds its
+  place again by key after each chunk, so keys added or removed while
+  a listing is read never make it repeat or skip a key that stayed
+
+Run: python projects/library_management/sorted_index.py
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Any, Iterator, List, Optional
+
+
+class SortedIndex:
+    """Ordered set of mutually comparable keys."""
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+        self._chunks: List[list] = []
+        self._maxes: List[Any] = []  # last key of each chunk
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def _locate(self, key) -> int:
+        """Index of the chunk that holds (or would hold) key."""
+        return min(bisect_left(self._maxes, key), len(self._chunks) - 1)
+
+    def __contains__(self, key) -> bool:
+        if not self._chunks:
+            return False
+        chunk = self._chunks[self._locate(key)]
+        position = bisect_left(chunk, key)
+        return position < len(chunk) and chunk[position] == key
+
+    def add(self, key):
+        """Insert key (no-op if present)."""
+        if not self._chunks:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        i = self._locate(key)
+        chunk = self._chunks[i]
+        position = bisect_left(chunk, key)
+        if position < len(chunk) and chunk[position] == key:
+            return
+        chunk.insert(position, key)
+        self._len += 1
+        self._maxes[i] = chunk[-1]
+
+        if len(chunk) > 2 * self.chunk_size:
+            half = chunk[self.chunk_size:]
+            del chunk[self.chunk_size:]
+            self._chunks.insert(i + 1, half)
+            self._maxes[i] = chunk[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    def discard(self, key) -> bool:
+        """Remove key; False if it wasn't there."""
+        if not self._chunks:
+            return False
+        i = self._locate(key)
+        chunk = self._chunks[i]
+        position = bisect_left(chunk, key)
+        if position == len(chunk) or chunk[position] != key:
+            return False
+
+        del chunk[position]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+        return True
+
+    def irange(self, start: Optional[Any] = None, inclusive: bool = True) -> Iterator:
+        """Keys from start onwards (all keys if start is None), in order."""
+        if start is None:
+            if not self._chunks:
+                return
+            start, inclusive = self._chunks[0][0], True
+
+        while self._chunks:
+            find = bisect_left if inclusive else bisect_right
+            i = find(self._maxes, start)
+            if i == len(self._chunks):
+                return
+            chunk = self._chunks[i]
+            rest = chunk[find(chunk, start):]  # copy: the chunk may change while we yield
+            if not rest:
+                return
+            yield from rest
+            start, inclusive = rest[-1], False
+
+    def __iter__(self) -> Iterator:
+        return self.irange()
+
+
+def demo_sorted_index():
+    """Members by name, resumed from a cursor while new members arrive."""
+    print("="*70)
+    print("SORTED KEY INDEX DEMO")
+    print("="*70)
+
+    names = SortedIndex(chunk_size=2)
+    for name in ["Mia", "Ana", "Zoe", "Ben", "Liu", "Omar"]:
+        names.add(name)
+    print(f"All: {list(names)}")
+
+    names.add("Nia")
+    names.discard("Zoe")
+    print(f"Nia joins, Zoe leaves; the 3 after 'Ben': {list(islice(names.irange('Ben', inclusive=False), 3))}")
+
+
+if __name__ == "__main__":
+    demo_sorted_index()
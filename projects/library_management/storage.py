@@ -0,0 +1,317 @@
+"""
+SQLite Storage Backend for the Library System
+==============================================
+
+Persists books, members and loans with the standard library sqlite3
+module so a Library survives restarts:
+
+- Indexes on ISBN, member ID and loan due date
+- Batched writes inside a single transaction
+- Fixed SQL strings for the borrow/return path, so sqlite3 reuses
+  its compiled (prepared) statements on every call
+- Lazy loading: Book/Member objects are built only when looked up, or
+  all at once when a catalogue-wide search or a listing needs them
+
+Run: python projects/library_management/storage.py
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from main import Book, DigitalBook, Library, LibraryStatistics, Member
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    isbn            TEXT PRIMARY KEY,
+    title           TEXT NOT NULL,
+    author          TEXT NOT NULL,
+    category        TEXT NOT NULL,
+    is_available    INTEGER NOT NULL DEFAULT 1,
+    borrowed_date   TEXT,
+    borrowed_by     TEXT,
+    file_format     TEXT,
+    file_size_mb    REAL,
+    download_count  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS members (
+    member_id             TEXT PRIMARY KEY,
+    name                  TEXT NOT NULL,
+    email                 TEXT NOT NULL,
+    member_type           TEXT NOT NULL,
+    total_books_borrowed  INTEGER NOT NULL DEFAULT 0,
+    total_late_fees       REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS loans (
+    loan_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    isbn           TEXT NOT NULL,
+    member_id      TEXT NOT NULL,
+    borrowed_date  TEXT NOT NULL,
+    due_date       TEXT NOT NULL,
+    returned_date  TEXT,
+    late_fee       REAL NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_loans_isbn ON loans (isbn);
+CREATE INDEX IF NOT EXISTS idx_loans_member_id ON loans (member_id);
+CREATE INDEX IF NOT EXISTS idx_loans_due_date ON loans (due_date);
+"""
+
+# Borrow/return statements. Keeping them as constants means sqlite3
+# finds them in its per-connection statement cache instead of
+# re-parsing the SQL each time.
+INSERT_BOOK = """
+    INSERT OR REPLACE INTO books
+        (isbn, title, author, category, is_available, borrowed_date, borrowed_by,
+         file_format, file_size_mb, download_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_MEMBER = """
+    INSERT OR REPLACE INTO members
+        (member_id, name, email, member_type, total_books_borrowed, total_late_fees)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SELECT_BOOK = "SELECT * FROM books WHERE isbn = ?"
+SELECT_BOOKS = "SELECT * FROM books ORDER BY rowid"
+SELECT_MEMBER = "SELECT * FROM members WHERE member_id = ?"
+SELECT_MEMBERS = "SELECT * FROM members ORDER BY rowid"
+SELECT_ACTIVE_LOAN_ISBNS = "SELECT isbn FROM loans WHERE member_id = ? AND returned_date IS NULL"
+SELECT_ACTIVE_LOANS = "SELECT member_id, isbn FROM loans WHERE returned_date IS NULL ORDER BY loan_id"
+UPDATE_BOOK_BORROWED = """
+    UPDATE books SET is_available = ?, borrowed_date = ?, borrowed_by = ?, download_count = ?
+    WHERE isbn = ?
+"""
+UPDATE_MEMBER_TOTALS = """
+    UPDATE members SET total_books_borrowed = ?, total_late_fees = ? WHERE member_id = ?
+"""
+INSERT_LOAN = "INSERT INTO loans (isbn, member_id, borrowed_date, due_date) VALUES (?, ?, ?, ?)"
+CLOSE_LOAN = """
+    UPDATE loans SET returned_date = ?, late_fee = ?
+    WHERE loan_id = (
+        SELECT loan_id FROM loans
+        WHERE isbn = ? AND member_id = ? AND returned_date IS NULL
+        ORDER BY loan_id LIMIT 1
+    )
+"""
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _from_text(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class SQLiteStorage:
+    """Library storage backend on top of a single sqlite3 connection."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        # Any thread may use the backend (e.g. a federation worker); _lock lets
+        # one statement or transaction at a time onto the shared connection.
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(path, cached_statements=256, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Commit everything in the block at once, or roll it all back."""
+        with self._lock, self.connection:
+            yield self.connection
+
+    def _fetch(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        """Run a query and read all its rows while holding the connection."""
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self.connection.close()
+
+    # --- Writes -------------------------------------------------------
+
+    @staticmethod
+    def _book_row(book: Book) -> tuple:
+        borrowed_by = book.borrowed_by.member_id if book.borrowed_by else None
+        if isinstance(book, DigitalBook):
+            return (book.isbn, book.title, book.author, book.category, 1, None, None,
+                    book.file_format, book.file_size_mb, book.download_count)
+        return (book.isbn, book.title, book.author, book.category, int(book.is_available),
+                _to_text(book.borrowed_date), borrowed_by, None, None, 0)
+
+    @staticmethod
+    def _member_row(member: Member) -> tuple:
+        return (member.member_id, member.name, member.email, member.member_type,
+                member.total_books_borrowed, member.total_late_fees)
+
+    def save_books(self, books: Iterable[Book]):
+        """Insert or update books in one transaction."""
+        with self.transaction() as conn:
+            conn.executemany(INSERT_BOOK, (self._book_row(book) for book in books))
+
+    def save_members(self, members: Iterable[Member]):
+        """Insert or update members in one transaction."""
+        with self.transaction() as conn:
+            conn.executemany(INSERT_MEMBER, (self._member_row(member) for member in members))
+
+    def delete_book(self, isbn: str):
+        """Remove a book that left the catalogue; its loan history is kept."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
+
+    def record_borrow(self, member: Member, book: Book):
+        """Persist a successful borrow: book state, member totals and a loan row."""
+        borrowed_date = book.borrowed_date or datetime.now()
+        due_date = borrowed_date + timedelta(days=member.borrow_period_days)
+        book_row = self._book_row(book)
+
+        with self.transaction() as conn:
+            conn.execute(UPDATE_BOOK_BORROWED, (book_row[4], book_row[5], book_row[6], book_row[9], book.isbn))
+            conn.execute(UPDATE_MEMBER_TOTALS,
+                         (member.total_books_borrowed, member.total_late_fees, member.member_id))
+            conn.execute(INSERT_LOAN, (book.isbn, member.member_id,
+                                       _to_text(borrowed_date), _to_text(due_date)))
+
+    def record_return(self, member: Member, book: Book, late_fee: float):
+        """Persist a return: close the loan and update book and member."""
+        book_row = self._book_row(book)
+
+        with self.transaction() as conn:
+            conn.execute(CLOSE_LOAN, (_to_text(datetime.now()), late_fee, book.isbn, member.member_id))
+            conn.execute(UPDATE_BOOK_BORROWED, (book_row[4], book_row[5], book_row[6], book_row[9], book.isbn))
+            conn.execute(UPDATE_MEMBER_TOTALS,
+                         (member.total_books_borrowed, member.total_late_fees, member.member_id))
+
+    # --- Lazy loading -------------------------------------------------
+
+    def load_book(self, isbn: str) -> Optional[Tuple[Book, Optional[str]]]:
+        """Build a Book from its row; returns (book, borrower member_id)."""
+        rows = self._fetch(SELECT_BOOK, (isbn,))
+        return self._book_from_row(rows[0]) if rows else None
+
+    def load_books(self) -> Iterator[Tuple[Book, Optional[str]]]:
+        """Every stored book in the order it was saved, as (book, borrower member_id)."""
+        for row in self._fetch(SELECT_BOOKS):
+            yield self._book_from_row(row)
+
+    @staticmethod
+    def _book_from_row(row: sqlite3.Row) -> Tuple[Book, Optional[str]]:
+        if row["file_format"] is not None:
+            book = DigitalBook(row["title"], row["author"], row["isbn"],
+                               row["file_format"], row["file_size_mb"])
+            book.download_count = row["download_count"]
+            return book, None
+
+        book = Book(row["title"], row["author"], row["isbn"], row["category"])
+        book.is_available = bool(row["is_available"])
+        book.borrowed_date = _from_text(row["borrowed_date"])
+        return book, row["borrowed_by"]
+
+    def load_member(self, member_id: str) -> Optional[Tuple[Member, List[str]]]:
+        """Build a Member from its row; returns (member, ISBNs currently on loan)."""
+        rows = self._fetch(SELECT_MEMBER, (member_id,))
+        if not rows:
+            return None
+
+        isbns = [loan["isbn"] for loan in self._fetch(SELECT_ACTIVE_LOAN_ISBNS, (member_id,))]
+        return self._member_from_row(rows[0]), isbns
+
+    def load_members(self) -> Iterator[Tuple[Member, List[str]]]:
+        """Every stored member in the order they were saved, as (member, ISBNs currently on loan)."""
+        loans: Dict[str, List[str]] = {}
+        for loan in self._fetch(SELECT_ACTIVE_LOANS):
+            loans.setdefault(loan["member_id"], []).append(loan["isbn"])
+        for row in self._fetch(SELECT_MEMBERS):
+            yield self._member_from_row(row), loans.get(row["member_id"], [])
+
+    @staticmethod
+    def _member_from_row(row: sqlite3.Row) -> Member:
+        member = Member(row["name"], row["email"], row["member_type"], member_id=row["member_id"])
+        member.total_books_borrowed = row["total_books_borrowed"]
+        member.total_late_fees = row["total_late_fees"]
+        return member
+
+    def existing_isbns(self, isbns: List[str]) -> set:
+        """Subset of isbns already stored, checked in chunks via the primary key."""
+        found = set()
+        for start in range(0, len(isbns), 500):
+            chunk = isbns[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(row[0] for row in self._fetch(
+                f"SELECT isbn FROM books WHERE isbn IN ({placeholders})", chunk))
+        return found
+
+    def load_statistics(self) -> LibraryStatistics:
+        """Seed the running counters from the stored data (once, at start-up)."""
+        stats = LibraryStatistics()
+
+        for row in self._fetch("SELECT category, COUNT(*), SUM(is_available) FROM books GROUP BY category"):
+            category, total, available = row
+            stats.category_totals[category] = total
+            stats.category_available[category] = available
+            stats.total_books += total
+            stats.available_books += available
+
+        stats.total_members = self._fetch("SELECT COUNT(*) FROM members")[0][0]
+        stats.total_borrows, stats.fees_collected = self._fetch(
+            "SELECT COUNT(*), COALESCE(SUM(late_fee), 0) FROM loans")[0]
+
+        for member_type, loans in self._fetch("""
+                SELECT m.member_type, COUNT(*) FROM loans l
+                JOIN members m ON m.member_id = l.member_id
+                WHERE l.returned_date IS NULL GROUP BY m.member_type"""):
+            stats.active_loans_by_member_type[member_type] = loans
+
+        return stats
+
+    def next_member_number(self) -> int:
+        """Smallest member number not yet used by a stored member."""
+        row = self._fetch("SELECT MAX(CAST(SUBSTR(member_id, 2) AS INTEGER)) FROM members")[0]
+        return (row[0] or 0) + 1
+
+    def overdue_loans(self, now: Optional[datetime] = None) -> List[sqlite3.Row]:
+        """Open loans past their due date (uses the due_date index)."""
+        now = now or datetime.now()
+        return self._fetch(
+            "SELECT * FROM loans WHERE due_date < ? AND returned_date IS NULL ORDER BY due_date",
+            (_to_text(now),))
+
+
+def demo_storage():
+    """Show a library surviving a restart."""
+    print("="*70)
+    print("SQLITE STORAGE DEMO")
+    print("="*70)
+
+    storage = SQLiteStorage()
+    library = Library("City Central Library", storage=storage)
+    library.add_books([
+        Book("Python Programming", "John Doe", "ISBN-001", "Technology"),
+        Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"),
+        DigitalBook("Python for Beginners", "Alice Johnson", "ISBN-005", "PDF", 5.2),
+    ])
+    alice = Member("Alice Williams", "alice@email.com", "Premium")
+    library.add_member(alice)
+    library.borrow_book(alice.member_id, "ISBN-001")
+
+    print("\n--- Restarting (same database, fresh Library) ---")
+    restarted = Library("City Central Library", storage=storage)
+    print(f"Books in memory before lookup: {len(restarted.books)}")
+    restarted.display_member_books(alice.member_id)
+    restarted.display_statistics()
+
+    storage.close()
+
+
+if __name__ == "__main__":
+    demo_storage()
@@ -0,0 +1,72 @@
+"""
+Catalogue tests for the in-memory Library.
+
+Run: cd projects/library_management && python -m unittest test_library
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from federation import LibraryFederation
+from main import Book, Library, Member
+
+
+class ReplaceRecordTest(unittest.TestCase):
+    """Adding a book whose ISBN is already catalogued replaces the old record."""
+
+    def setUp(self):
+        self.library = Library("Central")
+        self.alice = Member("Alice Williams", "alice@email.com", "Premium")
+        with redirect_stdout(io.StringIO()):
+            self.library.add_book(Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"))
+            self.library.add_member(self.alice)
+
+    def add(self, book):
+        with redirect_stdout(io.StringIO()):
+            return self.library.add_book(book)
+
+    def test_available_copy_is_replaced(self):
+        replacement = Book("The Great Gatsby (2nd ed.)", "F. Scott Fitzgerald", "ISBN-003", "Fiction")
+        self.assertTrue(self.add(replacement))
+        self.assertIs(self.library.find_book_by_isbn("ISBN-003"), replacement)
+        self.assertEqual(self.library.stats.total_books, 1)
+        self.assertEqual(len(self.library.books), 1)
+
+    def test_copy_on_loan_is_not_replaced(self):
+        with redirect_stdout(io.StringIO()):
+            self.library.borrow_book(self.alice.member_id, "ISBN-003")
+        self.assertFalse(self.add(Book("The Great Gatsby (2nd ed.)", "F. Scott Fitzgerald", "ISBN-003", "Fiction")))
+        self.assertEqual(self.library.stats.total_books, 1)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.library.return_book(self.alice.member_id, "ISBN-003"))
+        self.assertEqual(self.alice.borrowed_books, [])
+
+
+class TransferTest(unittest.TestCase):
+    """Transfers between branches of a federation."""
+
+    def setUp(self):
+        self.federation = LibraryFederation("City", max_workers=2)
+        self.addCleanup(self.federation.close)
+        self.north, self.south = Library("North"), Library("South")
+        with redirect_stdout(io.StringIO()):
+            self.north.add_book(Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"))
+        self.federation.add_branch(self.north)
+        self.federation.add_branch(self.south)
+
+    def test_available_copy_moves(self):
+        request = self.federation.request_transfer("ISBN-003", "North", "South")
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(self.federation.process_transfers(), 1)
+        self.assertEqual(request.status, "Completed")
+        self.assertIsNotNone(self.south.find_book_by_isbn("ISBN-003"))
+
+    def test_title_the_source_does_not_hold_fails(self):
+        request = self.federation.request_transfer("NOPE", "North", "South")
+        self.assertEqual(self.federation.process_transfers(), 0)
+        self.assertEqual(request.status, "Failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
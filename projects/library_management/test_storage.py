@@ -0,0 +1,72 @@
+"""
+Restart tests for the SQLite storage backend.
+
+Run: cd projects/library_management && python -m unittest test_storage
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from main import Book, Library, Member
+from storage import SQLiteStorage
+
+
+class RestartTest(unittest.TestCase):
+    """A fresh Library on an existing database sees the whole catalogue."""
+
+    def setUp(self):
+        self.storage = SQLiteStorage()
+        self.addCleanup(self.storage.close)
+        with redirect_stdout(io.StringIO()):
+            library = Library("Central", storage=self.storage)
+            library.add_books([
+                Book("Python Programming", "John Doe", "ISBN-001", "Technology"),
+                Book("The Great Gatsby", "F. Scott Fitzgerald", "ISBN-003", "Fiction"),
+            ])
+            alice = Member("Alice Williams", "alice@email.com", "Premium")
+            library.add_member(alice)
+            library.borrow_book(alice.member_id, "ISBN-003")
+        self.alice_id = alice.member_id
+        self.restarted = Library("Central", storage=self.storage)
+
+    def test_statistics_survive(self):
+        self.assertEqual(self.restarted.stats.total_books, 2)
+
+    def test_search_books(self):
+        self.assertEqual([book.isbn for book in self.restarted.search_books("python")], ["ISBN-001"])
+
+    def test_fuzzy_search(self):
+        matches = self.restarted.fuzzy_search("fitzgerld", limit=1)
+        self.assertEqual([book.isbn for book, _ in matches], ["ISBN-003"])
+
+    def test_available_books_page(self):
+        books, next_cursor = self.restarted.available_books_page()
+        self.assertEqual([book.isbn for book in books], ["ISBN-001"])
+        self.assertIsNone(next_cursor)
+
+    def test_members_page(self):
+        members, next_cursor = self.restarted.members_page()
+        self.assertEqual([member.member_id for member in members], [self.alice_id])
+        self.assertIsNone(next_cursor)
+        self.assertEqual(len(members), self.restarted.stats.total_members)
+
+    def test_listed_members_hold_their_loans(self):
+        alice = next(self.restarted.iter_members_by_name())
+        self.assertEqual([book.isbn for book in alice.borrowed_books], ["ISBN-003"])
+
+    def test_re_adding_a_stored_book_is_not_counted_twice(self):
+        with redirect_stdout(io.StringIO()):
+            self.restarted.add_book(Book("Python Programming", "John Doe", "ISBN-001", "Technology"))
+        self.assertEqual(self.restarted.stats.total_books, 2)
+        self.assertEqual(self.storage.load_statistics().total_books, 2)
+
+    def test_loaded_loans_are_linked(self):
+        self.restarted.search_books("gatsby")
+        book = self.restarted.find_book_by_isbn("ISBN-003")
+        self.assertEqual(book.borrowed_by.member_id, self.alice_id)
+        self.assertIn(book, self.restarted.find_member_by_id(self.alice_id).borrowed_books)
+
+
+if __name__ == "__main__":
+    unittest.main()